@@ -0,0 +1,57 @@
+from app.utils.aws_clients import get_table
+
+POSTS_TABLE = "hb-posts-table"
+LIKES_TABLE = "hb-likes-table"
+
+def count_likes(post_id):
+    """Count a post's likes from the likes table"""
+    table = get_table(LIKES_TABLE)
+    query_kwargs = {
+        "KeyConditionExpression": "post_id = :post_id",
+        "ExpressionAttributeValues": {":post_id": post_id},
+        "Select": "COUNT"
+    }
+    count = 0
+    while True:
+        response = table.query(**query_kwargs)
+        count += response.get("Count", 0)
+        if "LastEvaluatedKey" not in response:
+            return count
+        query_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+def backfill_post(post):
+    """Set like_count on a post that predates the counter, returning True if it was updated"""
+    if "like_count" in post:
+        return False
+    try:
+        # Never overwrite a counter the like transactions have started keeping
+        get_table(POSTS_TABLE).update_item(
+            Key={"user_id": post["user_id"], "post_id": post["post_id"]},
+            UpdateExpression="SET like_count = :count",
+            ConditionExpression="attribute_exists(post_id) AND attribute_not_exists(like_count)",
+            ExpressionAttributeValues={":count": count_likes(post["post_id"])}
+        )
+        return True
+    except get_table(POSTS_TABLE).meta.client.exceptions.ConditionalCheckFailedException:
+        return False
+
+def lambda_handler(event, context):
+    """One-off backfill of like_count for posts created before likes were counted on the post"""
+    table = get_table(POSTS_TABLE)
+    scan_kwargs = {"ProjectionExpression": "user_id, post_id, like_count"}
+    scanned = updated = 0
+
+    while True:
+        response = table.scan(**scan_kwargs)
+        for post in response.get("Items", []):
+            scanned += 1
+            updated += backfill_post(post)
+        if "LastEvaluatedKey" not in response:
+            break
+        scan_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+    print(f"✅ Backfilled like_count on {updated} of {scanned} posts")
+    return {"statusCode": 200, "body": {"scanned": scanned, "updated": updated}}
+
+if __name__ == "__main__":
+    lambda_handler({}, None)
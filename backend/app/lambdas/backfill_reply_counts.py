@@ -0,0 +1,57 @@
+from app.utils.aws_clients import get_table
+
+COMMENTS_TABLE = "hb-comments-table"
+COMMENT_PREFIX = "COMMENT#"
+
+def count_replies(post_id, comment_id):
+    """Count a comment's replies from the comments table"""
+    table = get_table(COMMENTS_TABLE)
+    query_kwargs = {
+        "KeyConditionExpression": "post_id = :pid AND begins_with(sort_key, :prefix)",
+        "ExpressionAttributeValues": {":pid": post_id, ":prefix": f"REPLY#{comment_id}#"},
+        "Select": "COUNT"
+    }
+    count = 0
+    while True:
+        response = table.query(**query_kwargs)
+        count += response.get("Count", 0)
+        if "LastEvaluatedKey" not in response:
+            return count
+        query_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+def backfill_comment(comment):
+    """Set reply_count on a top-level comment that predates the counter, returning True if it was updated"""
+    if not comment["sort_key"].startswith(COMMENT_PREFIX) or "reply_count" in comment:
+        return False
+    try:
+        # Never overwrite a counter that new replies have started keeping
+        get_table(COMMENTS_TABLE).update_item(
+            Key={"post_id": comment["post_id"], "sort_key": comment["sort_key"]},
+            UpdateExpression="SET reply_count = :count",
+            ConditionExpression="attribute_exists(sort_key) AND attribute_not_exists(reply_count)",
+            ExpressionAttributeValues={":count": count_replies(comment["post_id"], comment["comment_id"])}
+        )
+        return True
+    except get_table(COMMENTS_TABLE).meta.client.exceptions.ConditionalCheckFailedException:
+        return False
+
+def lambda_handler(event, context):
+    """One-off backfill of reply_count for comments created before replies were counted on the parent"""
+    table = get_table(COMMENTS_TABLE)
+    scan_kwargs = {"ProjectionExpression": "post_id, sort_key, comment_id, reply_count"}
+    scanned = updated = 0
+
+    while True:
+        response = table.scan(**scan_kwargs)
+        for comment in response.get("Items", []):
+            scanned += 1
+            updated += backfill_comment(comment)
+        if "LastEvaluatedKey" not in response:
+            break
+        scan_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+    print(f"✅ Backfilled reply_count on {updated} of {scanned} comments")
+    return {"statusCode": 200, "body": {"scanned": scanned, "updated": updated}}
+
+if __name__ == "__main__":
+    lambda_handler({}, None)
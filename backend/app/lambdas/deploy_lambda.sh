@@ -14,6 +14,9 @@ cp weekly_reset.py "$TEMP_DIR/"
 # Create a directory structure that matches the Python package
 mkdir -p "$TEMP_DIR/app/utils"
 cp ../utils/streak_manager.py "$TEMP_DIR/app/utils/"
+cp ../utils/aws_clients.py "$TEMP_DIR/app/utils/"
+cp ../utils/cache.py "$TEMP_DIR/app/utils/"
+cp ../utils/rollups.py "$TEMP_DIR/app/utils/"
 
 # Create an empty __init__.py file
 touch "$TEMP_DIR/app/__init__.py"
@@ -1,11 +1,133 @@
-import boto3
+import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from app.utils.streak_manager import get_week_start_date, get_weekly_post_count
+from app.utils.aws_clients import get_table
+from app.utils.streak_manager import (
+    HABIT_TABLE,
+    get_week_start_date,
+    get_week_key,
+    get_weekly_post_count,
+    get_weekly_post_counts,
+    get_counted_weekly_posts
+)
+from app.utils.rollups import ROLLUP_TABLE, make_weekly_rollup
+from app.utils.cache import get_cache, habits_key
 
-# Initialize DynamoDB
-dynamodb = boto3.resource("dynamodb", region_name="us-east-1")
-habit_table = dynamodb.Table("hb-habits-table")
-posts_table = dynamodb.Table("hb-posts-table")
+# Parallelism for the segmented scan and the per-habit updates
+SCAN_SEGMENTS = int(os.environ.get("RESET_SCAN_SEGMENTS", "4"))
+MAX_WORKERS = int(os.environ.get("RESET_MAX_WORKERS", "16"))
+
+def scan_segment(segment=None, total_segments=None):
+    """Scan one segment of the habits table, following LastEvaluatedKey to the end"""
+    table = get_table(HABIT_TABLE)
+    scan_kwargs = {}
+    if total_segments:
+        scan_kwargs["Segment"] = segment
+        scan_kwargs["TotalSegments"] = total_segments
+
+    habits = []
+    while True:
+        response = table.scan(**scan_kwargs)
+        habits.extend(response.get("Items", []))
+        if "LastEvaluatedKey" not in response:
+            return habits
+        scan_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+def scan_all_habits(total_segments=SCAN_SEGMENTS):
+    """Scan the whole habits table using parallel segments"""
+    if total_segments <= 1:
+        return scan_segment()
+
+    with ThreadPoolExecutor(max_workers=total_segments) as executor:
+        segments = executor.map(
+            lambda segment: scan_segment(segment, total_segments),
+            range(total_segments)
+        )
+        return [habit for segment_habits in segments for habit in segment_habits]
+
+def habit_weekly_posts(habit, weekly_post_counts=None):
+    """This week's posts for a habit: its counter, the user's batched counts, or a query for legacy habits"""
+    week_start = get_week_start_date()
+    weekly_posts = get_counted_weekly_posts(habit, week_start)
+    if weekly_posts is None and weekly_post_counts is not None:
+        weekly_posts = weekly_post_counts.get(habit["habit_id"], 0)
+    if weekly_posts is None:
+        weekly_posts = get_weekly_post_count(habit["user_id"], habit["habit_id"], week_start)
+    return weekly_posts
+
+def process_habit(habit, weekly_post_counts=None, rollups=None):
+    """Evaluate a single habit, returning True if it was updated.
+
+    When a `rollups` list is passed, the habit's weekly rollup is appended to it.
+    """
+    print(f"\nProcessing habit {habit['habit_id']}:")
+
+    # Habits being deleted are skipped so an update can't bring them back
+    if habit.get("deleting"):
+        return False
+
+    in_grace_period = habit.get("is_in_grace_period", True)
+    # Grace-period habits only need their posts counted for the rollup
+    weekly_posts = None
+    if not in_grace_period or rollups is not None:
+        weekly_posts = habit_weekly_posts(habit, weekly_post_counts)
+
+    # If habit is in grace period, check if it should end
+    if in_grace_period:
+        updated = update_grace_period(habit)
+        streak_after = habit.get("streak", 0)
+    # If habit is not in grace period, check if streak should be reset
+    else:
+        updated = reset_habit_streak(habit, weekly_posts)
+        streak_after = 0 if updated else habit.get("streak", 0)
+
+    if rollups is not None:
+        rollups.append(make_weekly_rollup(
+            habit, get_week_key(), weekly_posts, streak_after, datetime.utcnow().isoformat()
+        ))
+    return updated
+
+def needs_post_query(habit):
+    """Check if a habit's weekly posts have to be counted from the posts table"""
+    if habit.get("deleting"):
+        return False
+    # Grace-period habits are counted too, for their rollup
+    return get_counted_weekly_posts(habit, get_week_start_date()) is None
+
+def process_user_habits(habits):
+    """Evaluate all habits belonging to one user with at most one posts query"""
+    weekly_post_counts = None
+    # Habits with a weekly counter are read in O(1); only legacy habits need the query
+    if any(needs_post_query(habit) for habit in habits):
+        try:
+            weekly_post_counts = get_weekly_post_counts(habits[0]["user_id"], get_week_start_date())
+        except Exception as e:
+            # Fall back to per-habit counts rather than skipping the user
+            print(f"Error counting posts for user {habits[0]['user_id']}: {str(e)}")
+
+    rollups = []
+    results = [process_habit(habit, weekly_post_counts, rollups) for habit in habits]
+    write_rollups(rollups)
+    return results
+
+def write_rollups(rollups):
+    """Store a user's weekly rollups in batches; a failure here never blocks the reset"""
+    if not rollups:
+        return
+    try:
+        # Keyed by habit and week, so re-running the reset overwrites rather than duplicates
+        with get_table(ROLLUP_TABLE).batch_writer() as batch:
+            for rollup in rollups:
+                batch.put_item(Item=rollup)
+    except Exception as e:
+        print(f"Error writing weekly rollups for user {rollups[0]['user_id']}: {str(e)}")
+
+def group_habits_by_user(habits):
+    """Group scanned habits into lists keyed by user_id"""
+    habits_by_user = {}
+    for habit in habits:
+        habits_by_user.setdefault(habit["user_id"], []).append(habit)
+    return habits_by_user
 
 def update_grace_period(habit):
     """Update the grace period status for a habit that is in grace period"""
@@ -18,7 +140,7 @@ def update_grace_period(habit):
         
         # If current time is past grace period end, update status
         if datetime.utcnow() > grace_period_end:
-            habit_table.update_item(
+            get_table(HABIT_TABLE).update_item(
                 Key={
                     "user_id": user_id,
                     "habit_id": habit_id
@@ -28,6 +150,8 @@ def update_grace_period(habit):
                     ":grace": False
                 }
             )
+            # Drop the API's cached habit list (shared tier) so the flag isn't served stale
+            get_cache().invalidate(habits_key(user_id))
             print(f"  - Action: Grace period ended for habit {habit_id}")
             return True
         else:
@@ -38,7 +162,7 @@ def update_grace_period(habit):
         print(f"Error updating grace period for habit {habit_id}: {str(e)}")
         return False
 
-def reset_habit_streak(habit):
+def reset_habit_streak(habit, weekly_posts=None):
     """Reset the streak for a habit if weekly posts don't meet cadence"""
     try:
         user_id = habit["user_id"]
@@ -46,7 +170,8 @@ def reset_habit_streak(habit):
         
         # Get the current week's start date
         current_week_start = get_week_start_date()
-        weekly_posts = get_weekly_post_count(user_id, habit_id, current_week_start)
+        if weekly_posts is None:
+            weekly_posts = get_weekly_post_count(user_id, habit_id, current_week_start)
         cadence = habit.get("cadence", 0)
         
         print(f"Checking habit {habit_id}:")
@@ -57,7 +182,7 @@ def reset_habit_streak(habit):
         # Only reset if posts don't meet cadence
         if weekly_posts < cadence:
             # Update the habit
-            habit_table.update_item(
+            get_table(HABIT_TABLE).update_item(
                 Key={
                     "user_id": user_id,
                     "habit_id": habit_id
@@ -69,6 +194,7 @@ def reset_habit_streak(habit):
                     ":updated": datetime.utcnow().isoformat()
                 }
             )
+            get_cache().invalidate(habits_key(user_id))
             print(f"  - Action: Reset streak to 0")
             return True
         else:
@@ -82,21 +208,25 @@ def reset_habit_streak(habit):
 def lambda_handler(event, context):
     """Lambda function to handle weekly habit resets"""
     try:
-        # Scan all habits
-        response = habit_table.scan()
-        habits = response.get("Items", [])
-        
-        # Process each habit
-        for habit in habits:
-            print(f"\nProcessing habit {habit['habit_id']}:")
-            
-            # If habit is in grace period, check if it should end
-            if habit.get("is_in_grace_period", True):
-                update_grace_period(habit)
-            # If habit is not in grace period, check if streak should be reset
-            else:
-                reset_habit_streak(habit)
-            
+        # Parallel mode is the default; pass {"parallel": false} to run sequentially
+        parallel = (event or {}).get("parallel", True)
+
+        # Scan all habits, following pagination to the end
+        habits = scan_all_habits(SCAN_SEGMENTS if parallel else 1)
+        print(f"Scanned {len(habits)} habits")
+
+        # Process habits user by user so each user's posts are read once,
+        # with bounded concurrency in parallel mode
+        user_groups = list(group_habits_by_user(habits).values())
+        if parallel:
+            with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+                user_results = list(executor.map(process_user_habits, user_groups))
+        else:
+            user_results = [process_user_habits(group) for group in user_groups]
+        results = [updated for group_results in user_results for updated in group_results]
+
+        print(f"Updated {sum(1 for updated in results if updated)} of {len(habits)} habits")
+
         return {
             "statusCode": 200,
             "body": "Weekly reset completed successfully"
@@ -0,0 +1,16 @@
+# Repositories package
+# Async data-access layer for the DynamoDB tables and S3 buckets, built on aioboto3
+
+from app.repositories import users, habits, posts, likes, comments, storage, follows, timeline, rollups
+
+__all__ = [
+    'users',
+    'habits',
+    'posts',
+    'likes',
+    'comments',
+    'storage',
+    'follows',
+    'timeline',
+    'rollups'
+]
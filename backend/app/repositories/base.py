@@ -0,0 +1,150 @@
+import asyncio
+import contextlib
+from functools import lru_cache
+from app.utils.aws_clients import client_config_kwargs, KEEPALIVE_TIMEOUT
+
+# Resources and clients are opened lazily, once per event loop: {loop: {name: (stack, opened)}}
+_opened = {}
+
+@lru_cache(maxsize=None)
+def _get_session():
+    """Get the process-wide aioboto3 session"""
+    # Imported here so that importing the app doesn't pay for aioboto3 on cold start
+    import aioboto3
+    return aioboto3.Session()
+
+@lru_cache(maxsize=None)
+def _get_config():
+    """Same pooling, retry and timeout tuning as the sync clients, plus aiohttp keep-alive"""
+    from aiobotocore.config import AioConfig
+    return AioConfig(
+        connector_args={"keepalive_timeout": KEEPALIVE_TIMEOUT},
+        **client_config_kwargs()
+    )
+
+@lru_cache(maxsize=None)
+def _get_s3_config():
+    """S3 config: SigV4 is required for presigned uploads in newer regions"""
+    from aiobotocore.config import AioConfig
+    return _get_config().merge(AioConfig(signature_version="s3v4"))
+
+def _evict_closed_loops():
+    """Drop clients opened on loops that have since closed.
+
+    Their connections can only be closed from their own loop, so once it is gone the
+    references are released and the sockets are closed when they are collected.
+    """
+    for loop in [loop for loop in _opened if loop.is_closed()]:
+        del _opened[loop]
+
+async def _open(name, factory):
+    """Open an aioboto3 resource/client once per event loop and keep it for reuse"""
+    loop = asyncio.get_running_loop()
+    entry = _opened.get(loop, {}).get(name)
+    if entry is not None:
+        return entry[1]
+
+    _evict_closed_loops()
+    stack = contextlib.AsyncExitStack()
+    opened = await stack.enter_async_context(factory())
+
+    # Another request may have opened one while we were awaiting
+    entry = _opened.get(loop, {}).get(name)
+    if entry is not None:
+        await stack.aclose()
+        return entry[1]
+
+    _opened.setdefault(loop, {})[name] = (stack, opened)
+    return opened
+
+async def get_dynamodb():
+    """Get the async DynamoDB service resource (for multi-table calls like batch_get_item)"""
+    return await _open(
+        "dynamodb",
+        lambda: _get_session().resource("dynamodb", config=_get_config())
+    )
+
+async def get_table(table_name):
+    """Get an async DynamoDB Table handle"""
+    dynamodb = await get_dynamodb()
+    return await dynamodb.Table(table_name)
+
+def serialize_item(item):
+    """Convert a plain item into the typed form the low-level client expects"""
+    from boto3.dynamodb.types import TypeSerializer
+    serializer = TypeSerializer()
+    return {key: serializer.serialize(value) for key, value in item.items()}
+
+def cancellation_codes(error):
+    """Per-item failure codes of a cancelled transaction, in request order"""
+    return [reason.get("Code") for reason in error.response.get("CancellationReasons", [])]
+
+# BatchGetItem accepts at most 100 keys per request
+BATCH_GET_SIZE = 100
+BATCH_GET_ATTEMPTS = 5
+
+async def batch_get_items(table_name, keys, **request_kwargs):
+    """Fetch many items from one table with BatchGetItem, retrying unprocessed keys with backoff.
+
+    request_kwargs (ProjectionExpression, ExpressionAttributeNames) are passed through.
+    """
+    dynamodb = await get_dynamodb()
+    keys = list(keys)
+    items = []
+
+    for start in range(0, len(keys), BATCH_GET_SIZE):
+        request = {table_name: {"Keys": keys[start:start + BATCH_GET_SIZE], **request_kwargs}}
+        # Throttled keys come back as UnprocessedKeys and are retried with backoff
+        for attempt in range(BATCH_GET_ATTEMPTS):
+            response = await dynamodb.batch_get_item(RequestItems=request)
+            items.extend(response.get("Responses", {}).get(table_name, []))
+            request = response.get("UnprocessedKeys")
+            if not request:
+                break
+            await asyncio.sleep(0.05 * 2 ** attempt)
+        else:
+            raise RuntimeError(f"Could not read all of {table_name}: batch_get_item kept returning unprocessed keys")
+
+    return items
+
+async def transact_write(transact_items):
+    """Run a TransactWriteItems call (items in low-level form, see serialize_item)"""
+    dynamodb = await get_dynamodb()
+    await dynamodb.meta.client.transact_write_items(TransactItems=transact_items)
+
+async def get_s3_client():
+    """Get an async S3 client"""
+    return await _open(
+        "s3",
+        lambda: _get_session().client("s3", config=_get_s3_config())
+    )
+
+async def get_lambda_client():
+    """Get an async Lambda client (for async invokes of the task worker)"""
+    return await _open(
+        "lambda",
+        lambda: _get_session().client("lambda", config=_get_config())
+    )
+
+async def delete_partition(table_name, partition_key, value, sort_key):
+    """Delete every item in one partition, a page of keys at a time, returning how many were removed"""
+    table = await get_table(table_name)
+    query_kwargs = {
+        "KeyConditionExpression": "#pk = :value",
+        "ProjectionExpression": "#pk, #sk",
+        "ExpressionAttributeNames": {"#pk": partition_key, "#sk": sort_key},
+        "ExpressionAttributeValues": {":value": value}
+    }
+
+    deleted = 0
+    while True:
+        response = await table.query(**query_kwargs)
+        items = response.get("Items", [])
+        # batch_writer groups the deletes into 25-item BatchWriteItem calls and retries unprocessed ones
+        async with table.batch_writer() as batch:
+            for item in items:
+                await batch.delete_item(Key=item)
+        deleted += len(items)
+        if "LastEvaluatedKey" not in response:
+            return deleted
+        query_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
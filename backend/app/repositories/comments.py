@@ -0,0 +1,85 @@
+from botocore.exceptions import ClientError
+from app.repositories.base import cancellation_codes, delete_partition, get_table, serialize_item, transact_write
+
+COMMENTS_TABLE = "hb-comments-table"
+
+async def put_comment(item):
+    """Create a comment or reply item"""
+    table = await get_table(COMMENTS_TABLE)
+    await table.put_item(Item=item)
+
+# Top-level comments sort as COMMENT#<timestamp>, replies as REPLY#<parent_id>#<timestamp>
+COMMENT_PREFIX = "COMMENT#"
+REPLY_PREFIX = "REPLY#"
+
+def reply_prefix(parent_id):
+    """Sort key prefix shared by every reply to a comment"""
+    return f"{REPLY_PREFIX}{parent_id}#"
+
+async def _query_prefix(post_id, prefix, limit, exclusive_start_key=None, newest_first=False):
+    """Fetch one page of a post's items under a sort key prefix, in key order"""
+    table = await get_table(COMMENTS_TABLE)
+    query_kwargs = {
+        "KeyConditionExpression": "post_id = :pid AND begins_with(sort_key, :prefix)",
+        "ExpressionAttributeValues": {
+            ":pid": post_id,
+            ":prefix": prefix
+        },
+        "ScanIndexForward": not newest_first,
+        "Limit": limit
+    }
+    if exclusive_start_key:
+        query_kwargs["ExclusiveStartKey"] = exclusive_start_key
+
+    response = await table.query(**query_kwargs)
+    return response.get("Items", []), response.get("LastEvaluatedKey")
+
+async def query_comments(post_id, limit, exclusive_start_key=None):
+    """Fetch a page of a post's top-level comments, newest first.
+
+    Returns (comments, last_evaluated_key).
+    """
+    return await _query_prefix(post_id, COMMENT_PREFIX, limit, exclusive_start_key, newest_first=True)
+
+async def query_replies(post_id, parent_id, limit, exclusive_start_key=None):
+    """Fetch a page of replies to a comment, oldest first.
+
+    Returns (replies, last_evaluated_key).
+    """
+    return await _query_prefix(post_id, reply_prefix(parent_id), limit, exclusive_start_key)
+
+async def put_reply(item, parent_sort_key):
+    """Create a reply and increment its parent's reply_count in one transaction.
+
+    Raises LookupError if there is no comment item["parent_id"] at parent_sort_key.
+    """
+    try:
+        await transact_write([
+            {
+                "Put": {
+                    "TableName": COMMENTS_TABLE,
+                    "Item": serialize_item(item)
+                }
+            },
+            {
+                "Update": {
+                    "TableName": COMMENTS_TABLE,
+                    "Key": serialize_item({"post_id": item["post_id"], "sort_key": parent_sort_key}),
+                    "UpdateExpression": "ADD reply_count :one",
+                    # The client supplies the parent's key, so check it is really that comment
+                    "ConditionExpression": "attribute_exists(sort_key) AND comment_id = :parent_id",
+                    "ExpressionAttributeValues": serialize_item({":one": 1, ":parent_id": item["parent_id"]})
+                }
+            }
+        ])
+    except ClientError as e:
+        if e.response["Error"]["Code"] != "TransactionCanceledException":
+            raise
+        codes = cancellation_codes(e)
+        if len(codes) > 1 and codes[1] == "ConditionalCheckFailed":
+            raise LookupError(f"Comment {item['parent_id']} not found")
+        raise
+
+async def delete_post_comments(post_id):
+    """Delete every comment and reply on a post, returning how many were removed"""
+    return await delete_partition(COMMENTS_TABLE, "post_id", post_id, "sort_key")
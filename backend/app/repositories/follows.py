@@ -0,0 +1,61 @@
+from app.repositories.base import get_table
+
+FOLLOWS_TABLE = "hb-follows-table"
+
+# Each follow is stored twice in the user's partition, like comments/replies:
+#   {user_id: follower, sort_key: FOLLOWING#<followee>}
+#   {user_id: followee, sort_key: FOLLOWER#<follower>}
+FOLLOWING_PREFIX = "FOLLOWING#"
+FOLLOWER_PREFIX = "FOLLOWER#"
+
+async def follow(follower_id, followee_id, timestamp):
+    """Record that follower_id follows followee_id"""
+    table = await get_table(FOLLOWS_TABLE)
+    async with table.batch_writer() as batch:
+        await batch.put_item(Item={
+            "user_id": follower_id,
+            "sort_key": f"{FOLLOWING_PREFIX}{followee_id}",
+            "other_user_id": followee_id,
+            "timestamp": timestamp
+        })
+        await batch.put_item(Item={
+            "user_id": followee_id,
+            "sort_key": f"{FOLLOWER_PREFIX}{follower_id}",
+            "other_user_id": follower_id,
+            "timestamp": timestamp
+        })
+
+async def unfollow(follower_id, followee_id):
+    """Remove a follow in both directions"""
+    table = await get_table(FOLLOWS_TABLE)
+    async with table.batch_writer() as batch:
+        await batch.delete_item(Key={"user_id": follower_id, "sort_key": f"{FOLLOWING_PREFIX}{followee_id}"})
+        await batch.delete_item(Key={"user_id": followee_id, "sort_key": f"{FOLLOWER_PREFIX}{follower_id}"})
+
+async def _query_prefix(user_id, prefix):
+    """Fetch every user_id stored under a sort key prefix, following pagination"""
+    table = await get_table(FOLLOWS_TABLE)
+    query_kwargs = {
+        "KeyConditionExpression": "user_id = :uid AND begins_with(sort_key, :prefix)",
+        "ProjectionExpression": "other_user_id",
+        "ExpressionAttributeValues": {
+            ":uid": user_id,
+            ":prefix": prefix
+        }
+    }
+
+    user_ids = []
+    while True:
+        response = await table.query(**query_kwargs)
+        user_ids.extend(item["other_user_id"] for item in response.get("Items", []))
+        if "LastEvaluatedKey" not in response:
+            return user_ids
+        query_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+async def query_followers(user_id):
+    """Fetch the ids of everyone following a user"""
+    return await _query_prefix(user_id, FOLLOWER_PREFIX)
+
+async def query_following(user_id):
+    """Fetch the ids of everyone a user follows"""
+    return await _query_prefix(user_id, FOLLOWING_PREFIX)
@@ -0,0 +1,205 @@
+import asyncio
+from botocore.exceptions import ClientError
+from app.repositories.base import cancellation_codes, get_table, serialize_item, transact_write
+from app.repositories.users import habit_membership_update, migrate_habit_list
+from app.utils.cache import get_cache, habits_key, user_key
+from app.utils.projection import projection_kwargs
+
+HABIT_TABLE = "hb-habits-table"
+
+async def get_habit(user_id, habit_id):
+    """Fetch a single habit, or None if it does not exist"""
+    table = await get_table(HABIT_TABLE)
+    response = await table.get_item(
+        Key={
+            "user_id": user_id,
+            "habit_id": habit_id
+        }
+    )
+    return response.get("Item")
+
+async def query_user_habits(user_id, attributes=None):
+    """Fetch all habits for a user; full items come through the read-through cache.
+
+    With `attributes`, only those are read (a ProjectionExpression) and the cache is bypassed.
+    """
+    if attributes:
+        return await read_user_habits(user_id, attributes)
+    return await get_cache().get_or_load(habits_key(user_id), lambda: read_user_habits(user_id))
+
+async def read_user_habits(user_id, attributes=None):
+    """Fetch all habits for a user straight from DynamoDB"""
+    table = await get_table(HABIT_TABLE)
+    response = await table.query(
+        KeyConditionExpression="user_id = :uid",
+        ExpressionAttributeValues={
+            ":uid": user_id
+        },
+        **projection_kwargs(attributes)
+    )
+    return response.get("Items", [])
+
+async def scan_habits():
+    """Scan the first page of the habits table (admin use)"""
+    table = await get_table(HABIT_TABLE)
+    response = await table.scan()
+    return response.get("Items", [])
+
+async def _scan_segment_pages(table, segment=None, total_segments=None):
+    """Yield each page of one scan segment, following LastEvaluatedKey to the end"""
+    scan_kwargs = {}
+    if total_segments:
+        scan_kwargs["Segment"] = segment
+        scan_kwargs["TotalSegments"] = total_segments
+
+    while True:
+        response = await table.scan(**scan_kwargs)
+        yield response.get("Items", [])
+        if "LastEvaluatedKey" not in response:
+            return
+        scan_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+async def scan_habit_pages(total_segments=1):
+    """Yield pages of the whole habits table as they arrive, scanning segments in parallel.
+
+    At most two pages per segment are buffered, so memory stays flat however big the table is.
+    """
+    table = await get_table(HABIT_TABLE)
+    if total_segments <= 1:
+        async for page in _scan_segment_pages(table):
+            yield page
+        return
+
+    queue = asyncio.Queue(maxsize=total_segments * 2)
+    done = object()
+
+    async def scan_into_queue(segment):
+        try:
+            async for page in _scan_segment_pages(table, segment, total_segments):
+                await queue.put(page)
+            await queue.put(done)
+        except Exception as e:
+            await queue.put(e)
+
+    workers = [asyncio.create_task(scan_into_queue(segment)) for segment in range(total_segments)]
+    try:
+        finished = 0
+        while finished < total_segments:
+            page = await queue.get()
+            if page is done:
+                finished += 1
+            elif isinstance(page, Exception):
+                raise page
+            else:
+                yield page
+    finally:
+        # Stops the other segments if the consumer goes away or one of them failed
+        for worker in workers:
+            worker.cancel()
+
+# A legacy user is migrated at most once, but another device may race us to it
+MEMBERSHIP_ATTEMPTS = 3
+
+async def _write_with_membership(user_id, habit_write, habit_id, action):
+    """Write a habit item and ADD/DELETE it in the user's habit set in one transaction.
+
+    Raises LookupError if the user does not exist.
+    """
+    for _ in range(MEMBERSHIP_ATTEMPTS):
+        try:
+            await transact_write([habit_write, habit_membership_update(user_id, habit_id, action)])
+            get_cache().invalidate(user_key(user_id), habits_key(user_id))
+            return
+        except ClientError as e:
+            if e.response["Error"]["Code"] != "TransactionCanceledException":
+                raise
+            codes = cancellation_codes(e)
+            if len(codes) < 2 or codes[1] != "ConditionalCheckFailed":
+                raise
+        # The user check failed: either there is no user or they still have the legacy list
+        if not await migrate_habit_list(user_id):
+            raise LookupError(f"User {user_id} not found")
+    raise RuntimeError(f"Could not update habits of user {user_id}")
+
+async def create_habit(item):
+    """Create a habit item and add it to the user's habit set atomically"""
+    await _write_with_membership(
+        item["user_id"],
+        {
+            "Put": {
+                "TableName": HABIT_TABLE,
+                "Item": serialize_item(item),
+                "ConditionExpression": "attribute_not_exists(habit_id)"
+            }
+        },
+        item["habit_id"],
+        "ADD"
+    )
+
+async def update_habit(user_id, habit_id, habit_name, cadence, color, updated_at):
+    """Update the editable fields of a habit"""
+    table = await get_table(HABIT_TABLE)
+    response = await table.update_item(
+        Key={
+            "user_id": user_id,
+            "habit_id": habit_id
+        },
+        UpdateExpression="set habit_name = :name, cadence = :cadence, color = :color, updated_at = :updated_at",
+        ExpressionAttributeValues={
+            ":name": habit_name,
+            ":cadence": cadence,
+            ":color": color,
+            ":updated_at": updated_at
+        },
+        ReturnValues="UPDATED_NEW"
+    )
+    get_cache().invalidate(habits_key(user_id))
+    return response.get("Attributes", {})
+
+async def mark_habit_deleting(user_id, habit_id, started_at):
+    """Flag a habit as being deleted and remove it from the user's habit set atomically.
+
+    Raises LookupError if the user does not exist.
+    """
+    await _write_with_membership(
+        user_id,
+        {
+            "Update": {
+                "TableName": HABIT_TABLE,
+                "Key": serialize_item({"user_id": user_id, "habit_id": habit_id}),
+                "UpdateExpression": "SET deleting = :true, deletion_started_at = if_not_exists(deletion_started_at, :started_at)",
+                "ConditionExpression": "attribute_exists(habit_id)",
+                "ExpressionAttributeValues": serialize_item({":true": True, ":started_at": started_at})
+            }
+        },
+        habit_id,
+        "DELETE"
+    )
+
+async def add_deletion_progress(user_id, habit_id, posts_deleted, objects_deleted):
+    """Add to the running totals of a habit deletion"""
+    table = await get_table(HABIT_TABLE)
+    await table.update_item(
+        Key={
+            "user_id": user_id,
+            "habit_id": habit_id
+        },
+        UpdateExpression="ADD posts_deleted :posts, objects_deleted :objects",
+        ConditionExpression="attribute_exists(habit_id)",
+        ExpressionAttributeValues={
+            ":posts": posts_deleted,
+            ":objects": objects_deleted
+        }
+    )
+    get_cache().invalidate(habits_key(user_id))
+
+async def delete_habit(user_id, habit_id):
+    """Delete a habit item"""
+    table = await get_table(HABIT_TABLE)
+    await table.delete_item(
+        Key={
+            "user_id": user_id,
+            "habit_id": habit_id
+        }
+    )
+    get_cache().invalidate(habits_key(user_id))
@@ -0,0 +1,130 @@
+from botocore.exceptions import ClientError
+from app.repositories.base import batch_get_items, cancellation_codes, delete_partition, get_table, serialize_item, transact_write
+from app.repositories.posts import POSTS_TABLE
+
+LIKES_TABLE = "hb-likes-table"
+
+async def get_like(post_id, user_id):
+    """Fetch a user's like on a post, or None if they have not liked it"""
+    table = await get_table(LIKES_TABLE)
+    response = await table.get_item(
+        Key={
+            "post_id": post_id,
+            "user_id": user_id
+        }
+    )
+    return response.get("Item")
+
+async def _toggle_like(like_write, author_id, post_id, delta):
+    """Write/remove a like and move the post's like_count by delta in one transaction.
+
+    Returns False if the like was already in the requested state; raises LookupError if the post is gone.
+    """
+    # The like and its counter always change together, so like_count can't drift
+    writes = [
+        like_write,
+        {
+            "Update": {
+                "TableName": POSTS_TABLE,
+                "Key": serialize_item({"user_id": author_id, "post_id": post_id}),
+                "UpdateExpression": "ADD like_count :delta",
+                "ConditionExpression": "attribute_exists(post_id)",
+                "ExpressionAttributeValues": serialize_item({":delta": delta})
+            }
+        }
+    ]
+    try:
+        await transact_write(writes)
+        return True
+    except ClientError as e:
+        if e.response["Error"]["Code"] != "TransactionCanceledException":
+            raise
+        codes = cancellation_codes(e)
+        if len(codes) > 1 and codes[1] == "ConditionalCheckFailed":
+            raise LookupError(f"Post {post_id} not found")
+        if codes and codes[0] == "ConditionalCheckFailed":
+            return False
+        raise
+
+async def add_like(item, author_id):
+    """Record a like and increment the post's like_count atomically.
+
+    Returns False if the user had already liked the post; raises LookupError if the post is gone.
+    """
+    return await _toggle_like(
+        {
+            "Put": {
+                "TableName": LIKES_TABLE,
+                "Item": serialize_item(item),
+                "ConditionExpression": "attribute_not_exists(post_id)"
+            }
+        },
+        author_id, item["post_id"], 1
+    )
+
+async def remove_like(post_id, user_id, author_id):
+    """Remove a like and decrement the post's like_count atomically.
+
+    Returns False if the user had not liked the post; raises LookupError if the post is gone.
+    """
+    return await _toggle_like(
+        {
+            "Delete": {
+                "TableName": LIKES_TABLE,
+                "Key": serialize_item({"post_id": post_id, "user_id": user_id}),
+                "ConditionExpression": "attribute_exists(post_id)"
+            }
+        },
+        author_id, post_id, -1
+    )
+
+async def query_post_likes(post_id, limit, exclusive_start_key=None):
+    """Fetch a page of likes for a post.
+
+    Returns (likes, last_evaluated_key).
+    """
+    table = await get_table(LIKES_TABLE)
+    query_kwargs = {
+        "KeyConditionExpression": "post_id = :post_id",
+        "ExpressionAttributeValues": {
+            ":post_id": post_id
+        },
+        "Limit": limit
+    }
+    if exclusive_start_key:
+        query_kwargs["ExclusiveStartKey"] = exclusive_start_key
+
+    response = await table.query(**query_kwargs)
+    return response.get("Items", []), response.get("LastEvaluatedKey")
+
+async def batch_get_likes(post_ids, user_id):
+    """Fetch a user's likes on several posts at once, returning the set of liked post_ids"""
+    items = await batch_get_items(
+        LIKES_TABLE,
+        ({"post_id": post_id, "user_id": user_id} for post_id in post_ids),
+        ProjectionExpression="post_id"
+    )
+    return {item["post_id"] for item in items}
+
+async def count_post_likes(post_id):
+    """Count the likes on a post without reading the like items"""
+    table = await get_table(LIKES_TABLE)
+    query_kwargs = {
+        "KeyConditionExpression": "post_id = :post_id",
+        "ExpressionAttributeValues": {
+            ":post_id": post_id
+        },
+        "Select": "COUNT"
+    }
+
+    count = 0
+    while True:
+        response = await table.query(**query_kwargs)
+        count += response.get("Count", 0)
+        if "LastEvaluatedKey" not in response:
+            return count
+        query_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+async def delete_post_likes(post_id):
+    """Delete every like on a post, returning how many were removed"""
+    return await delete_partition(LIKES_TABLE, "post_id", post_id, "user_id")
@@ -0,0 +1,171 @@
+from botocore.exceptions import ClientError
+from app.repositories.base import batch_get_items, get_table
+from app.utils.projection import projection_kwargs
+from app.utils.post_keys import post_id_prefix
+
+POSTS_TABLE = "hb-posts-table"
+
+async def query_user_posts(user_id, limit, exclusive_start_key=None, habit_id=None, attributes=None):
+    """Fetch up to `limit` of a user's posts, newest first, optionally only some `attributes`.
+
+    Returns (posts, last_evaluated_key); the key is None once the partition is exhausted.
+    """
+    table = await get_table(POSTS_TABLE)
+    query_kwargs = {
+        "KeyConditionExpression": "user_id = :uid",
+        "ExpressionAttributeValues": {
+            ":uid": user_id
+        },
+        "ScanIndexForward": False,  # Sort by most recent first based on post_id (sort key)
+        **projection_kwargs(attributes)
+    }
+
+    # If habit_id is provided, filter server-side on the habitId field
+    if habit_id:
+        query_kwargs["FilterExpression"] = "habitId = :hid"
+        query_kwargs["ExpressionAttributeValues"][":hid"] = habit_id
+
+    # Limit is applied before the filter, so keep reading until the page is
+    # full or the partition is exhausted. Asking only for the remaining slots
+    # keeps LastEvaluatedKey aligned with the last post we return.
+    posts = []
+    last_evaluated_key = exclusive_start_key
+    while True:
+        if last_evaluated_key:
+            query_kwargs["ExclusiveStartKey"] = last_evaluated_key
+        query_kwargs["Limit"] = limit - len(posts)
+
+        response = await table.query(**query_kwargs)
+        posts.extend(response.get("Items", []))
+        last_evaluated_key = response.get("LastEvaluatedKey")
+
+        if not last_evaluated_key or len(posts) >= limit:
+            return posts, last_evaluated_key
+
+async def query_habit_posts(user_id, habit_id, limit, exclusive_start_key=None):
+    """Fetch up to `limit` of one habit's posts by their post_id prefix, without reading the user's other posts.
+
+    Returns (posts, last_evaluated_key).
+    """
+    table = await get_table(POSTS_TABLE)
+    query_kwargs = {
+        "KeyConditionExpression": "user_id = :uid AND begins_with(post_id, :prefix)",
+        # The prefix also matches habits whose id extends this one (h1 / h1-x), so check habitId too
+        "FilterExpression": "habitId = :hid",
+        "ExpressionAttributeValues": {
+            ":uid": user_id,
+            ":prefix": post_id_prefix(habit_id),
+            ":hid": habit_id
+        },
+        "Limit": limit
+    }
+    if exclusive_start_key:
+        query_kwargs["ExclusiveStartKey"] = exclusive_start_key
+
+    response = await table.query(**query_kwargs)
+    return response.get("Items", []), response.get("LastEvaluatedKey")
+
+async def query_habit_post_ids(user_id, habit_id, lower_post_id, upper_post_id):
+    """Fetch the post_ids of one habit's posts between two sort keys (inclusive).
+
+    post_ids are post-{habit_id}-{time}, so a habit's posts in a time range are one key range.
+    """
+    table = await get_table(POSTS_TABLE)
+    query_kwargs = {
+        "KeyConditionExpression": "user_id = :uid AND post_id BETWEEN :lower AND :upper",
+        "ProjectionExpression": "post_id",
+        "ExpressionAttributeValues": {
+            ":uid": user_id,
+            ":lower": lower_post_id,
+            ":upper": upper_post_id
+        }
+    }
+
+    post_ids = []
+    while True:
+        response = await table.query(**query_kwargs)
+        post_ids.extend(item["post_id"] for item in response.get("Items", []))
+        if "LastEvaluatedKey" not in response:
+            return post_ids
+        query_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+async def batch_get_like_counts(keys):
+    """Read like_count for many posts with BatchGetItem.
+
+    keys are (author_id, post_id) pairs; returns {post_id: like_count} for the posts that have a counter.
+    """
+    items = await batch_get_items(
+        POSTS_TABLE,
+        ({"user_id": author_id, "post_id": post_id} for author_id, post_id in keys),
+        ProjectionExpression="post_id, like_count"
+    )
+    return {item["post_id"]: int(item["like_count"]) for item in items if "like_count" in item}
+
+async def get_post(user_id, post_id):
+    """Fetch a single post, or None if it does not exist"""
+    table = await get_table(POSTS_TABLE)
+    response = await table.get_item(
+        Key={
+            "user_id": user_id,
+            "post_id": post_id
+        }
+    )
+    return response.get("Item")
+
+async def put_post(item, only_if_new=False):
+    """Create or replace a post item.
+
+    With only_if_new, an existing post is left untouched and False is returned.
+    """
+    table = await get_table(POSTS_TABLE)
+    if not only_if_new:
+        await table.put_item(Item=item)
+        return True
+
+    try:
+        await table.put_item(
+            Item=item,
+            ConditionExpression="attribute_not_exists(post_id)"
+        )
+        return True
+    except ClientError as e:
+        if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
+            return False
+        raise
+
+async def set_post_variants(user_id, post_id, variants):
+    """Record the derived image keys on an existing post"""
+    table = await get_table(POSTS_TABLE)
+    try:
+        await table.update_item(
+            Key={
+                "user_id": user_id,
+                "post_id": post_id
+            },
+            UpdateExpression="SET variants = :variants",
+            ConditionExpression="attribute_exists(post_id)",
+            ExpressionAttributeValues={
+                ":variants": variants
+            }
+        )
+    except ClientError as e:
+        # The post was deleted while its variants were being made
+        if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+            raise
+
+async def delete_post(user_id, post_id):
+    """Delete a post item"""
+    table = await get_table(POSTS_TABLE)
+    await table.delete_item(
+        Key={
+            "user_id": user_id,
+            "post_id": post_id
+        }
+    )
+
+async def delete_posts(keys):
+    """Delete post items, given {user_id, post_id} keys, in batches"""
+    table = await get_table(POSTS_TABLE)
+    async with table.batch_writer() as batch:
+        for key in keys:
+            await batch.delete_item(Key=key)
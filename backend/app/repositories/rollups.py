@@ -0,0 +1,22 @@
+from app.repositories.base import get_table
+from app.utils.rollups import ROLLUP_TABLE, rollup_key
+
+async def query_habit_rollups(user_id, habit_id, from_week, to_week):
+    """Fetch a habit's weekly rollups from from_week to to_week (inclusive), oldest first"""
+    table = await get_table(ROLLUP_TABLE)
+    query_kwargs = {
+        "KeyConditionExpression": "user_id = :uid AND rollup_key BETWEEN :lower AND :upper",
+        "ExpressionAttributeValues": {
+            ":uid": user_id,
+            ":lower": rollup_key(habit_id, from_week),
+            ":upper": rollup_key(habit_id, to_week)
+        }
+    }
+
+    rollups = []
+    while True:
+        response = await table.query(**query_kwargs)
+        rollups.extend(response.get("Items", []))
+        if "LastEvaluatedKey" not in response:
+            return rollups
+        query_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
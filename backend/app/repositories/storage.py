@@ -0,0 +1,168 @@
+import os
+from functools import lru_cache
+from botocore.exceptions import ClientError
+from app.repositories.base import get_s3_client
+
+POSTS_BUCKET = "hb-user-posts"
+UPLOADS_BUCKET = "hb-uploads-bucket"
+EXPORTS_BUCKET = "hb-exports-bucket"
+
+# Uploads are streamed in parts of this size; smaller files go up in a single PUT
+MULTIPART_CHUNKSIZE = int(os.environ.get("S3_MULTIPART_CHUNKSIZE", str(8 * 1024 * 1024)))
+MULTIPART_CONCURRENCY = int(os.environ.get("S3_MULTIPART_CONCURRENCY", "4"))
+
+@lru_cache(maxsize=None)
+def _get_transfer_config():
+    """Transfer settings for streamed uploads"""
+    from boto3.s3.transfer import TransferConfig
+    return TransferConfig(
+        multipart_threshold=MULTIPART_CHUNKSIZE,
+        multipart_chunksize=MULTIPART_CHUNKSIZE,
+        max_concurrency=MULTIPART_CONCURRENCY
+    )
+
+async def object_exists(bucket, key):
+    """Check whether an object (or folder marker) exists"""
+    s3 = await get_s3_client()
+    try:
+        await s3.head_object(Bucket=bucket, Key=key)
+        return True
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey"):
+            return False
+        raise
+
+async def get_object_metadata(bucket, key):
+    """Fetch an object's metadata (size, content type), or None if it does not exist"""
+    s3 = await get_s3_client()
+    try:
+        return await s3.head_object(Bucket=bucket, Key=key)
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey"):
+            return None
+        raise
+
+async def create_presigned_post(bucket, key, content_type, max_bytes, expires_in):
+    """Create a presigned POST policy that only allows uploading this key, type and size"""
+    s3 = await get_s3_client()
+    return await s3.generate_presigned_post(
+        Bucket=bucket,
+        Key=key,
+        Fields={"Content-Type": content_type},
+        Conditions=[
+            {"Content-Type": content_type},
+            ["content-length-range", 1, max_bytes]
+        ],
+        ExpiresIn=expires_in
+    )
+
+async def create_presigned_put(bucket, key, content_type, expires_in):
+    """Create a presigned PUT URL for this key and content type"""
+    s3 = await get_s3_client()
+    return await s3.generate_presigned_url(
+        "put_object",
+        Params={"Bucket": bucket, "Key": key, "ContentType": content_type},
+        ExpiresIn=expires_in
+    )
+
+async def create_presigned_get(bucket, key, expires_in):
+    """Create a presigned GET URL for downloading this key"""
+    s3 = await get_s3_client()
+    return await s3.generate_presigned_url(
+        "get_object",
+        Params={"Bucket": bucket, "Key": key},
+        ExpiresIn=expires_in
+    )
+
+async def get_object_bytes(bucket, key):
+    """Read a whole object into memory"""
+    s3 = await get_s3_client()
+    response = await s3.get_object(Bucket=bucket, Key=key)
+    async with response["Body"] as body:
+        return await body.read()
+
+async def put_object(bucket, key, body=b"", content_type=None):
+    """Write an object from bytes"""
+    s3 = await get_s3_client()
+    kwargs = {"Bucket": bucket, "Key": key, "Body": body}
+    if content_type:
+        kwargs["ContentType"] = content_type
+    await s3.put_object(**kwargs)
+
+async def upload_fileobj(fileobj, bucket, key, content_type=None):
+    """Stream a sync or async file-like object to S3 in chunks, using multipart for large files"""
+    s3 = await get_s3_client()
+    extra_args = {"ContentType": content_type} if content_type else None
+    await s3.upload_fileobj(
+        fileobj,
+        bucket,
+        key,
+        ExtraArgs=extra_args,
+        Config=_get_transfer_config()
+    )
+
+async def upload_chunks(chunks, bucket, key, content_type=None):
+    """Write an async iterable of byte chunks to S3 as a multipart upload, holding one part in memory.
+
+    Returns the number of bytes written; the upload is aborted if the chunks raise.
+    """
+    s3 = await get_s3_client()
+    extra_args = {"ContentType": content_type} if content_type else {}
+    upload_id = (await s3.create_multipart_upload(Bucket=bucket, Key=key, **extra_args))["UploadId"]
+    parts = []
+    size = 0
+
+    async def send(body):
+        response = await s3.upload_part(
+            Bucket=bucket, Key=key, UploadId=upload_id, PartNumber=len(parts) + 1, Body=body
+        )
+        parts.append({"ETag": response["ETag"], "PartNumber": len(parts) + 1})
+
+    try:
+        buffer = bytearray()
+        async for chunk in chunks:
+            buffer.extend(chunk)
+            size += len(chunk)
+            # Every part but the last must be at least 5 MB
+            if len(buffer) >= MULTIPART_CHUNKSIZE:
+                await send(bytes(buffer))
+                buffer.clear()
+        if buffer or not parts:
+            await send(bytes(buffer))
+        await s3.complete_multipart_upload(
+            Bucket=bucket, Key=key, UploadId=upload_id, MultipartUpload={"Parts": parts}
+        )
+        return size
+    except BaseException:
+        await s3.abort_multipart_upload(Bucket=bucket, Key=key, UploadId=upload_id)
+        raise
+
+async def delete_object(bucket, key):
+    """Delete a single object"""
+    s3 = await get_s3_client()
+    await s3.delete_object(Bucket=bucket, Key=key)
+
+# DeleteObjects accepts at most 1000 keys per request
+DELETE_BATCH_SIZE = 1000
+
+async def delete_objects(bucket, keys):
+    """Delete many objects with multi-object deletes, returning the keys that could not be deleted"""
+    s3 = await get_s3_client()
+    keys = list(keys)
+    failed = []
+    for start in range(0, len(keys), DELETE_BATCH_SIZE):
+        response = await s3.delete_objects(
+            Bucket=bucket,
+            Delete={
+                "Objects": [{"Key": key} for key in keys[start:start + DELETE_BATCH_SIZE]],
+                "Quiet": True  # Only report failures
+            }
+        )
+        failed.extend(error["Key"] for error in response.get("Errors", []))
+    return failed
+
+async def list_object_keys(bucket, prefix, limit=DELETE_BATCH_SIZE):
+    """List up to `limit` (at most 1000) object keys under a prefix"""
+    s3 = await get_s3_client()
+    response = await s3.list_objects_v2(Bucket=bucket, Prefix=prefix, MaxKeys=limit)
+    return [obj["Key"] for obj in response.get("Contents", [])]
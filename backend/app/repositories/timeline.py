@@ -0,0 +1,58 @@
+from app.repositories.base import get_table
+
+TIMELINE_TABLE = "hb-timeline-table"
+
+async def put_entries(entries):
+    """Write timeline entries in batches"""
+    table = await get_table(TIMELINE_TABLE)
+    async with table.batch_writer() as batch:
+        for entry in entries:
+            await batch.put_item(Item=entry)
+
+async def delete_entries(keys):
+    """Delete timeline entries, given {user_id, entry_id} keys, in batches"""
+    table = await get_table(TIMELINE_TABLE)
+    async with table.batch_writer() as batch:
+        for key in keys:
+            await batch.delete_item(Key=key)
+
+async def query_timeline(user_id, limit, exclusive_start_key=None):
+    """Fetch a page of a user's home timeline, newest first.
+
+    Returns (entries, last_evaluated_key).
+    """
+    table = await get_table(TIMELINE_TABLE)
+    query_kwargs = {
+        "KeyConditionExpression": "user_id = :uid",
+        "ExpressionAttributeValues": {
+            ":uid": user_id
+        },
+        "ScanIndexForward": False,  # entry_id starts with the post timestamp
+        "Limit": limit
+    }
+    if exclusive_start_key:
+        query_kwargs["ExclusiveStartKey"] = exclusive_start_key
+
+    response = await table.query(**query_kwargs)
+    return response.get("Items", []), response.get("LastEvaluatedKey")
+
+async def query_entry_keys_by_author(user_id, author_id):
+    """Fetch the keys of every entry from one author in a user's timeline"""
+    table = await get_table(TIMELINE_TABLE)
+    query_kwargs = {
+        "KeyConditionExpression": "user_id = :uid",
+        "FilterExpression": "author_id = :author",
+        "ProjectionExpression": "user_id, entry_id",
+        "ExpressionAttributeValues": {
+            ":uid": user_id,
+            ":author": author_id
+        }
+    }
+
+    keys = []
+    while True:
+        response = await table.query(**query_kwargs)
+        keys.extend(response.get("Items", []))
+        if "LastEvaluatedKey" not in response:
+            return keys
+        query_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
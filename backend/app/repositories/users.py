@@ -0,0 +1,79 @@
+from botocore.exceptions import ClientError
+from app.repositories.base import get_table, serialize_item
+from app.utils.cache import get_cache, user_key
+
+USER_TABLE = "hb-user-table"
+
+async def read_user(user_id):
+    """Fetch a user item straight from DynamoDB, or None if it does not exist"""
+    table = await get_table(USER_TABLE)
+    response = await table.get_item(Key={"user_id": user_id})
+    return response.get("Item")
+
+async def get_user(user_id):
+    """Fetch a user item through the read-through cache, or None if it does not exist"""
+    return await get_cache().get_or_load(user_key(user_id), lambda: read_user(user_id))
+
+async def put_user(item):
+    """Create or replace a user item"""
+    table = await get_table(USER_TABLE)
+    await table.put_item(Item=item)
+    get_cache().invalidate(user_key(item["user_id"]))
+
+# Habit membership is a string set, changed with atomic ADD/DELETE. Users created before
+# that keep a `habits` list until their first habit change migrates it into the set.
+HABIT_SET = "habit_ids"
+LEGACY_HABIT_LIST = "habits"
+
+def get_habit_ids(user):
+    """The user's habit ids, from the set and any legacy list"""
+    return sorted(set(user.get(HABIT_SET, set())) | set(user.get(LEGACY_HABIT_LIST, [])))
+
+def habit_membership_update(user_id, habit_id, action):
+    """Transaction item that ADDs or DELETEs a habit_id in the user's habit set"""
+    return {
+        "Update": {
+            "TableName": USER_TABLE,
+            "Key": serialize_item({"user_id": user_id}),
+            "UpdateExpression": f"{action} #habits :habit_ids",
+            # Fails for missing users and for users still on the legacy list
+            "ConditionExpression": "attribute_exists(user_id) AND attribute_not_exists(#legacy)",
+            "ExpressionAttributeNames": {"#habits": HABIT_SET, "#legacy": LEGACY_HABIT_LIST},
+            "ExpressionAttributeValues": serialize_item({":habit_ids": {habit_id}})
+        }
+    }
+
+async def migrate_habit_list(user_id):
+    """Move a user's legacy habits list into the habit set.
+
+    Returns False if the user does not exist.
+    """
+    user = await read_user(user_id)
+    if user is None:
+        return False
+    if LEGACY_HABIT_LIST not in user:
+        return True
+
+    legacy_habits = user[LEGACY_HABIT_LIST]
+    table = await get_table(USER_TABLE)
+    update_kwargs = {
+        "Key": {"user_id": user_id},
+        "UpdateExpression": "REMOVE #legacy",
+        # Only if nobody changed the list since we read it
+        "ConditionExpression": "#legacy = :legacy",
+        "ExpressionAttributeNames": {"#legacy": LEGACY_HABIT_LIST},
+        "ExpressionAttributeValues": {":legacy": legacy_habits}
+    }
+    # Sets can't be empty, so an empty list is just removed
+    if legacy_habits:
+        update_kwargs["UpdateExpression"] = "ADD #habits :habit_ids REMOVE #legacy"
+        update_kwargs["ExpressionAttributeNames"]["#habits"] = HABIT_SET
+        update_kwargs["ExpressionAttributeValues"][":habit_ids"] = set(legacy_habits)
+
+    try:
+        await table.update_item(**update_kwargs)
+    except ClientError as e:
+        if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+            raise
+    get_cache().invalidate(user_key(user_id))
+    return True
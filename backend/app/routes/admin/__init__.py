@@ -0,0 +1,7 @@
+# Admin routes package
+
+from app.routes.admin.cache_stats import router as cache_stats_router
+
+__all__ = [
+    'cache_stats_router'
+]
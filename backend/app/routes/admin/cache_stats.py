@@ -0,0 +1,9 @@
+from fastapi import APIRouter
+from app.utils.cache import get_cache
+
+router = APIRouter()
+
+@router.get("/cache_stats")
+async def cache_stats():
+    """Hit/miss counters of this container's read-through cache (admin endpoint)."""
+    return get_cache().stats()
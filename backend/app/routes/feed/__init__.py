@@ -0,0 +1,9 @@
+# Feed routes package
+
+from app.routes.feed.follow import router as follow_router
+from app.routes.feed.get_feed import router as get_feed_router
+
+__all__ = [
+    'follow_router',
+    'get_feed_router'
+]
@@ -0,0 +1,67 @@
+from fastapi import APIRouter, BackgroundTasks, Query, HTTPException
+from datetime import datetime
+from app.repositories import follows as follows_repo
+from app.utils.async_tasks import dispatch
+
+router = APIRouter()
+
+@router.post("/follow")
+async def follow_user(
+    background_tasks: BackgroundTasks,
+    user_id: str = Query(..., description="ID of the user who is following"),
+    followee_id: str = Query(..., description="ID of the user to follow")
+):
+    """Follow another user and backfill their recent posts into the home feed"""
+    try:
+        if user_id == followee_id:
+            raise HTTPException(status_code=400, detail="Users cannot follow themselves")
+
+        await follows_repo.follow(user_id, followee_id, datetime.utcnow().isoformat())
+        await dispatch(background_tasks, "backfill_timeline", user_id, followee_id)
+
+        return {"message": "User followed successfully"}
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"❌ Error following user: {e}")
+        raise HTTPException(status_code=500, detail=f"Error following user: {str(e)}")
+
+@router.delete("/unfollow")
+async def unfollow_user(
+    background_tasks: BackgroundTasks,
+    user_id: str = Query(..., description="ID of the user who is unfollowing"),
+    followee_id: str = Query(..., description="ID of the user to unfollow")
+):
+    """Unfollow a user and remove their posts from the home feed"""
+    try:
+        await follows_repo.unfollow(user_id, followee_id)
+        await dispatch(background_tasks, "purge_author", user_id, followee_id)
+
+        return {"message": "User unfollowed successfully"}
+
+    except Exception as e:
+        print(f"❌ Error unfollowing user: {e}")
+        raise HTTPException(status_code=500, detail=f"Error unfollowing user: {str(e)}")
+
+@router.get("/get_following")
+async def get_following(
+    user_id: str = Query(..., description="User's unique ID")
+):
+    """Fetch the IDs of everyone a user follows"""
+    try:
+        return {"following": await follows_repo.query_following(user_id)}
+    except Exception as e:
+        print(f"❌ DynamoDB error: {e}")
+        raise HTTPException(status_code=500, detail=f"Error fetching following: {str(e)}")
+
+@router.get("/get_followers")
+async def get_followers(
+    user_id: str = Query(..., description="User's unique ID")
+):
+    """Fetch the IDs of everyone following a user"""
+    try:
+        return {"followers": await follows_repo.query_followers(user_id)}
+    except Exception as e:
+        print(f"❌ DynamoDB error: {e}")
+        raise HTTPException(status_code=500, detail=f"Error fetching followers: {str(e)}")
@@ -0,0 +1,44 @@
+from fastapi import APIRouter, Query, HTTPException
+from app.repositories import timeline as timeline_repo
+from app.utils.pagination import encode_cursor, decode_cursor
+
+router = APIRouter()
+
+def format_entry(entry):
+    """Present a timeline entry like a post, keyed by its author"""
+    return {
+        "user_id": entry["author_id"],
+        "post_id": entry["post_id"],
+        "habitId": entry.get("habitId"),
+        "caption": entry.get("caption", ""),
+        "timestamp": entry["timestamp"],
+        "s3Key": entry.get("s3Key"),
+        **({"variants": entry["variants"]} if "variants" in entry else {})
+    }
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+@router.get("/feed")
+async def get_feed(
+    user_id: str = Query(..., description="User's unique ID"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Maximum number of posts to return"),
+    cursor: str = Query(None, description="Opaque cursor returned as next_cursor by the previous page")
+):
+    """Fetch a page of the user's home feed (own and followed users' posts), newest first"""
+    try:
+        exclusive_start_key = decode_cursor(cursor, required_keys=("user_id", "entry_id"))
+        if exclusive_start_key and exclusive_start_key["user_id"] != user_id:
+            raise HTTPException(status_code=400, detail="Cursor does not belong to this user")
+
+        entries, last_evaluated_key = await timeline_repo.query_timeline(
+            user_id, limit, exclusive_start_key=exclusive_start_key
+        )
+
+        return {"posts": [format_entry(entry) for entry in entries], "next_cursor": encode_cursor(last_evaluated_key)}
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"❌ DynamoDB error: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error fetching feed: {str(e)}")
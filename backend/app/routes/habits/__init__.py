@@ -5,11 +5,15 @@ from app.routes.habits.add_habit import router as add_habit_router
 from app.routes.habits.get_habit import router as get_habit_router
 from app.routes.habits.delete_habit import router as delete_habit_router
 from app.routes.habits.update_habit import router as update_habit_router
+from app.routes.habits.habit_calendar import router as habit_calendar_router
+from app.routes.habits.habit_analytics import router as habit_analytics_router
 
 __all__ = [
     'habits_router',
     'add_habit_router',
     'get_habit_router',
     'delete_habit_router',
-    'update_habit_router'
+    'update_habit_router',
+    'habit_calendar_router',
+    'habit_analytics_router'
 ]
\ No newline at end of file
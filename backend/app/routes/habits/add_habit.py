@@ -1,18 +1,13 @@
 from fastapi import APIRouter, Query, HTTPException
-import boto3
-from boto3.dynamodb.conditions import Key
 from datetime import datetime
 import uuid
+from app.repositories import habits as habits_repo
+from app.utils.streak_manager import get_week_key
 
 router = APIRouter()
 
-# Initialize DynamoDB client
-dynamodb = boto3.resource("dynamodb", region_name="us-east-1")
-habit_table = dynamodb.Table("hb-habits-table")
-user_table = dynamodb.Table("hb-user-table")
-
 @router.post("/add_habit")
-def add_habit(
+async def add_habit(
     user_id: str = Query(..., description="User's unique ID"),
     habit_name: str = Query(..., description="Name of the habit"),
     cadence: int = Query(..., description="Frequency in days (1-7)", ge=1, le=7),
@@ -28,8 +23,8 @@ def add_habit(
         habit_id = str(uuid.uuid4())
         created_at = datetime.utcnow().isoformat()
         
-        # Add the habit to habit table in DynamoDB with new fields
-        habit_table.put_item(Item={
+        # Add the habit to habit table and to the user's habit set in one transaction
+        await habits_repo.create_habit({
             "user_id": user_id,
             "habit_id": habit_id,
             "habit_name": habit_name,
@@ -41,29 +36,12 @@ def add_habit(
             "created_at": created_at,
             "last_week_posts": 0,  # Track posts from last week
             "last_week_updated": created_at,  # When the last week was updated
+            "week_start": get_week_key(),  # Week the post counter belongs to
+            "week_posts": 0,  # Posts made in that week, bumped by create_post
             
             "is_in_grace_period": True  # New habits start in grace period
         })
         
-        # Update the user's habits list in the user table
-        try:
-            # Use update_item with list_append to add the habit_id to the user's habits list
-            print("Fetched user before update:")
-            user_table.update_item(
-                Key={"user_id": user_id},
-                UpdateExpression="SET habits = list_append(habits, :habit_id)",
-                ExpressionAttributeValues={
-                    ":habit_id": [habit_id]
-                },
-                ReturnValues="UPDATED_NEW"
-            )
-            print(f"✅ Added habit_id {habit_id} to user's habits list")
-        except Exception as e:
-            print(f"❌ Error updating user's habits list: {e}")
-            # If updating the user table fails, we should still return success for the habit creation
-            # but log the error for debugging
-            pass
-        
         return {
             "message": "Habit added successfully",
             "habit_id": habit_id,
@@ -73,6 +51,10 @@ def add_habit(
             "created_at": created_at
         }
         
+    except HTTPException:
+        raise
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
         print(f"❌ DynamoDB error: {e}")
         raise HTTPException(status_code=500, detail=f"Error adding habit: {str(e)}")
\ No newline at end of file
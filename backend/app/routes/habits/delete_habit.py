@@ -1,76 +1,46 @@
-from fastapi import APIRouter, Query, HTTPException
-import boto3
-from boto3.dynamodb.conditions import Key
+from fastapi import APIRouter, Query, HTTPException, Response
+from datetime import datetime
+from app.repositories import habits as habits_repo
+from app.utils.habit_cleanup import delete_habit_data
 
 router = APIRouter()
 
-# Initialize DynamoDB client
-dynamodb = boto3.resource("dynamodb", region_name="us-east-1")
-habit_table = dynamodb.Table("hb-habits-table")
-user_table = dynamodb.Table("hb-user-table")
-
 @router.delete("/delete_habit")
-def delete_habit(
+async def delete_habit(
+    response: Response,
     user_id: str = Query(..., description="User's unique ID"),
     habit_id: str = Query(..., description="Habit's unique ID")
 ):
-    """Delete a habit for a user from DynamoDB."""
+    """Delete a habit with its posts and images. Large habits answer 202 until a later call finishes."""
     try:
         # First, check if the habit exists
-        habit_response = habit_table.get_item(
-            Key={
-                "user_id": user_id,
-                "habit_id": habit_id
-            }
-        )
+        habit = await habits_repo.get_habit(user_id, habit_id)
         
-        if "Item" not in habit_response:
+        if habit is None:
             raise HTTPException(status_code=404, detail="Habit not found")
         
-        # Delete the habit from the habits table
-        habit_table.delete_item(
-            Key={
-                "user_id": user_id,
-                "habit_id": habit_id
-            }
-        )
-        
-        # Update the user's habits list in the user table
+        # Flag the habit so it drops out of listings, and take it out of the user's habit set, in one transaction
         try:
-            # Get the current user data
-            user_response = user_table.get_item(
-                Key={"user_id": user_id}
-            )
-            
-            if "Item" not in user_response:
-                print(f"⚠️ Warning: User {user_id} not found in user table")
-            else:
-                # Get the current habits list
-                user_habits = user_response["Item"].get("habits", [])
-                
-                # Remove the habit_id from the list
-                if habit_id in user_habits:
-                    user_habits.remove(habit_id)
-                    
-                    # Update the user's habits list
-                    user_table.update_item(
-                        Key={"user_id": user_id},
-                        UpdateExpression="SET habits = :habits",
-                        ExpressionAttributeValues={
-                            ":habits": user_habits
-                        }
-                    )
-                    print(f"✅ Removed habit_id {habit_id} from user's habits list")
-                else:
-                    print(f"⚠️ Warning: Habit ID {habit_id} not found in user's habits list")
-        except Exception as e:
-            print(f"❌ Error updating user's habits list: {e}")
-            # If updating the user table fails, we should still return success for the habit deletion
-            # but log the error for debugging
-            pass
+            await habits_repo.mark_habit_deleting(user_id, habit_id, datetime.utcnow().isoformat())
+        except LookupError as e:
+            # Still clean up the habit's data when the user item is gone
+            print(f"⚠️ Warning: {e}")
+        
+        # Delete posts, likes, comments and images; resumes where an earlier call stopped
+        progress = await delete_habit_data(user_id, habit_id)
+        totals = {
+            "posts_deleted": int(habit.get("posts_deleted", 0)) + progress["posts_deleted"],
+            "objects_deleted": int(habit.get("objects_deleted", 0)) + progress["objects_deleted"]
+        }
+        
+        if not progress["done"]:
+            response.status_code = 202
+            return {"message": "Habit deletion in progress, call again to continue", "status": "in_progress", **totals}
         
-        return {"message": "Habit deleted successfully"}
+        return {"message": "Habit deleted successfully", "status": "deleted", **totals}
         
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"❌ DynamoDB error: {e}")
         raise HTTPException(status_code=500, detail=f"Error deleting habit: {str(e)}")
\ No newline at end of file
@@ -1,31 +1,42 @@
-from fastapi import APIRouter, Query, HTTPException
-import boto3
-from boto3.dynamodb.conditions import Key
+from fastapi import APIRouter, Query, HTTPException, Request
+from app.repositories import habits as habits_repo
+from app.utils.responses import etag_response
+from app.utils.projection import parse_fields
 
 router = APIRouter()
 
-# Initialize DynamoDB client
-dynamodb = boto3.resource("dynamodb", region_name="us-east-1")
-habit_table = dynamodb.Table("hb-habits-table")
+# Attributes a client may ask for with fields=
+HABIT_FIELDS = {
+    "habit_id", "habit_name", "color", "cadence", "streak", "reminder", "created_at", "updated_at",
+    "week_start", "week_posts", "last_week_posts", "last_week_updated", "is_in_grace_period", "completed_dates"
+}
+# Keys, plus the flag visible_habits filters on (only set on habits being deleted)
+HABIT_KEY_FIELDS = ("user_id", "habit_id", "deleting")
+
+def visible_habits(habits):
+    """Drop habits that are still being deleted; they are gone as far as the user is concerned"""
+    return [habit for habit in habits if not habit.get("deleting")]
 
 @router.get("/get_habit")
-def get_user_habits(
-    user_id: str = Query(..., description="User's unique ID")
+async def get_user_habits(
+    request: Request,
+    user_id: str = Query(..., description="User's unique ID"),
+    fields: str = Query(None, description="Comma-separated attributes to return, e.g. habit_id,habit_name,streak")
 ):
     """Fetch all habits for a specific user from DynamoDB."""
     try:
+        attributes = parse_fields(fields, HABIT_FIELDS, always=HABIT_KEY_FIELDS)
         # Query the habits table for all habits with the given user_id
-        response = habit_table.query(
-            KeyConditionExpression=Key("user_id").eq(user_id)
-        )
-        
-        habits = response.get("Items", [])
+        habits = await habits_repo.query_user_habits(user_id, attributes)
+        habits = visible_habits(habits)
         
         if not habits:
-            return {"message": "No habits found for this user", "habits": []}
+            return etag_response(request, {"message": "No habits found for this user", "habits": []})
         
-        return {"habits": habits}
+        return etag_response(request, {"habits": habits})
         
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"❌ DynamoDB error: {e}")
         raise HTTPException(status_code=500, detail=f"Error fetching habits: {str(e)}")
\ No newline at end of file
@@ -0,0 +1,48 @@
+import asyncio
+from datetime import datetime
+from fastapi import APIRouter, Query, HTTPException, Request
+from app.repositories import habits as habits_repo, rollups as rollups_repo
+from app.routes.habits.get_habit import visible_habits
+from app.utils.rollups import completed_week_range, summarize_rollups
+from app.utils.responses import etag_response
+
+router = APIRouter()
+
+DEFAULT_WEEKS = 12
+MAX_WEEKS = 104
+
+@router.get("/habit_analytics")
+async def habit_analytics(
+    request: Request,
+    user_id: str = Query(..., description="User's unique ID"),
+    habit_id: str = Query(None, description="Only this habit; all of the user's habits when omitted"),
+    weeks: int = Query(DEFAULT_WEEKS, ge=1, le=MAX_WEEKS, description="Number of completed weeks to cover")
+):
+    """Weekly trends per habit (completion rate, average posts, best streak) from the precomputed rollups"""
+    try:
+        if habit_id:
+            habit_ids = [habit_id]
+        else:
+            habit_ids = [habit["habit_id"] for habit in visible_habits(await habits_repo.query_user_habits(user_id))]
+
+        # Rollups are keyed by the week's Monday, in UTC like the reset
+        from_week, to_week = completed_week_range(weeks, datetime.utcnow().date())
+
+        # One key-range query per habit, all at once
+        rollup_lists = await asyncio.gather(*(
+            rollups_repo.query_habit_rollups(user_id, hid, from_week, to_week)
+            for hid in habit_ids
+        ))
+
+        return etag_response(request, {
+            "from_week": from_week,
+            "to_week": to_week,
+            "weeks": weeks,
+            "habits": {hid: summarize_rollups(rollups) for hid, rollups in zip(habit_ids, rollup_lists)}
+        })
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"❌ DynamoDB error: {e}")
+        raise HTTPException(status_code=500, detail=f"Error building habit analytics: {str(e)}")
@@ -0,0 +1,58 @@
+import asyncio
+from datetime import date, datetime, timedelta, timezone
+from fastapi import APIRouter, Query, HTTPException, Request
+from app.repositories import habits as habits_repo, posts as posts_repo
+from app.routes.habits.get_habit import visible_habits
+from app.utils.heatmap import day_range_utc, post_id_range, bucket_post_ids, total_per_day
+from app.utils.responses import etag_response
+
+router = APIRouter()
+
+DEFAULT_DAYS = 365
+MAX_DAYS = 731
+
+@router.get("/habit_calendar")
+async def habit_calendar(
+    request: Request,
+    user_id: str = Query(..., description="User's unique ID"),
+    habit_id: str = Query(None, description="Only this habit; all of the user's habits when omitted"),
+    start: date = Query(None, description="First day (YYYY-MM-DD); defaults to a year before end"),
+    end: date = Query(None, description="Last day (YYYY-MM-DD); defaults to today"),
+    utc_offset: int = Query(0, ge=-14 * 60, le=14 * 60, description="Client's UTC offset in minutes, so days match local dates")
+):
+    """Per-day post counts for a habit heatmap, one array entry per day from start to end"""
+    try:
+        if end is None:
+            end = (datetime.now(timezone.utc) + timedelta(minutes=utc_offset)).date()
+        if start is None:
+            start = end - timedelta(days=DEFAULT_DAYS - 1)
+        days = (end - start).days + 1
+        if days < 1 or days > MAX_DAYS:
+            raise HTTPException(status_code=400, detail=f"start must be on or before end, at most {MAX_DAYS} days apart")
+
+        if habit_id:
+            habit_ids = [habit_id]
+        else:
+            habit_ids = [habit["habit_id"] for habit in visible_habits(await habits_repo.query_user_habits(user_id))]
+
+        # One key-range query per habit, all at once
+        range_start, range_end = day_range_utc(start, end, utc_offset)
+        post_id_lists = await asyncio.gather(*(
+            posts_repo.query_habit_post_ids(user_id, hid, *post_id_range(hid, range_start, range_end))
+            for hid in habit_ids
+        ))
+        counts = bucket_post_ids(dict(zip(habit_ids, post_id_lists)), range_start, days)
+
+        return etag_response(request, {
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            "days": days,
+            "habits": counts,
+            "total": total_per_day(counts, days)
+        })
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"❌ DynamoDB error: {e}")
+        raise HTTPException(status_code=500, detail=f"Error building habit calendar: {str(e)}")
@@ -1,27 +1,67 @@
-from fastapi import APIRouter, Query, HTTPException
-import boto3
-from boto3.dynamodb.conditions import Key
+from fastapi import APIRouter, BackgroundTasks, Query, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from datetime import datetime
+import os
+import uuid
+from app.repositories import habits as habits_repo, storage
+from app.utils.async_tasks import dispatch
+from app.utils.habits_export import NDJSON_MEDIA_TYPE, ndjson_pages
+from app.utils.responses import dumps, negotiated_response
 
 router = APIRouter()
 
-# Initialize DynamoDB client
-dynamodb = boto3.resource("dynamodb", region_name="us-east-1")
-habit_table = dynamodb.Table("hb-habits-table")
+MAX_SCAN_SEGMENTS = 16
+# Mangum buffers the whole response body and Lambda caps responses at 6 MB, so on Lambda the
+# ndjson export is written to S3 by an async task and the client downloads it from a presigned URL
+EXPORT_TO_S3 = os.environ.get(
+    "HABITS_EXPORT_TO_S3", "true" if os.environ.get("AWS_LAMBDA_FUNCTION_NAME") else "false"
+).lower() == "true"
+EXPORT_URL_EXPIRES_IN = int(os.environ.get("HABITS_EXPORT_URL_EXPIRES_IN", "3600"))
+
+async def stream_habits_ndjson(total_segments):
+    """Yield every habit as one JSON line, a scan page at a time (streamed under uvicorn)"""
+    try:
+        async for chunk in ndjson_pages(total_segments):
+            yield chunk
+    except Exception as e:
+        # Headers are already sent, so the failure is reported as the last line
+        print(f"❌ DynamoDB error during habits export: {e}")
+        yield dumps({"error": f"Error exporting habits: {str(e)}"}) + b"\n"
+
+async def start_s3_export(request, background_tasks, total_segments):
+    """Queue the export to S3 and answer 202 with the URL it will be downloadable from"""
+    key = f"habits/{datetime.utcnow().strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}.ndjson"
+    await dispatch(background_tasks, "export_habits", key, total_segments)
+    url = await storage.create_presigned_get(storage.EXPORTS_BUCKET, key, EXPORT_URL_EXPIRES_IN)
+    return negotiated_response(request, {
+        "message": "Export started; the URL returns 404 until it is complete",
+        "key": key,
+        "url": url,
+        "expires_in": EXPORT_URL_EXPIRES_IN
+    }, status_code=202)
 
 @router.get("/habits")
-def get_all_habits():
+async def get_all_habits(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    export_format: str = Query("json", alias="format", pattern="^(json|ndjson)$", description="'json' for the first scan page, 'ndjson' for the whole table (streamed, or a 202 with an S3 URL on Lambda)"),
+    segments: int = Query(1, ge=1, le=MAX_SCAN_SEGMENTS, description="Parallel scan segments for the ndjson export")
+):
     """Fetch all habits from DynamoDB (admin endpoint)."""
     try:
+        if export_format == "ndjson" or NDJSON_MEDIA_TYPE in request.headers.get("accept", ""):
+            if EXPORT_TO_S3:
+                return await start_s3_export(request, background_tasks, segments)
+            return StreamingResponse(stream_habits_ndjson(segments), media_type=NDJSON_MEDIA_TYPE)
+
         # Scan the habits table for all habits
-        response = habit_table.scan()
-        
-        habits = response.get("Items", [])
+        habits = await habits_repo.scan_habits()
         
         if not habits:
-            return {"message": "No habits found", "habits": []}
+            return negotiated_response(request, {"message": "No habits found", "habits": []})
         
-        return {"habits": habits}
+        return negotiated_response(request, {"habits": habits})
         
     except Exception as e:
         print(f"❌ DynamoDB error: {e}")
-        raise HTTPException(status_code=500, detail=f"Error fetching habits: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Error fetching habits: {str(e)}")
@@ -1,18 +1,12 @@
 from fastapi import APIRouter, HTTPException, Query
 from typing import Optional
-import boto3
-from boto3.dynamodb.conditions import Key
 import os
 import uuid
 from datetime import datetime
+from app.repositories import habits as habits_repo
 
 router = APIRouter()
 
-# Initialize DynamoDB resource
-
-dynamodb = boto3.resource("dynamodb", region_name="us-east-1")
-habit_table = dynamodb.Table("hb-habits-table")
-
 @router.put("/update_habit")
 async def update_habit(
     user_id: str = Query(..., description="User ID"),
@@ -32,27 +26,19 @@ async def update_habit(
             raise HTTPException(status_code=400, detail="Cadence must be a number between 1 and 7")
         
         # Check if the habit exists
-        response = habit_table.query(
-            KeyConditionExpression=Key('user_id').eq(user_id) & Key('habit_id').eq(habit_id)
-        )
+        habit = await habits_repo.get_habit(user_id, habit_id)
         
-        if not response['Items']:
+        if habit is None:
             raise HTTPException(status_code=404, detail=f"Habit with ID {habit_id} not found for user {user_id}")
         
         # Update the habit
-        update_response = habit_table.update_item(
-            Key={
-                'user_id': user_id,
-                'habit_id': habit_id
-            },
-            UpdateExpression="set habit_name = :name, cadence = :cadence, color = :color, updated_at = :updated_at",
-            ExpressionAttributeValues={
-                ':name': habit_name,
-                ':cadence': cadence_int,
-                ':color': color,
-                ':updated_at': datetime.utcnow().isoformat()
-            },
-            ReturnValues="UPDATED_NEW"
+        await habits_repo.update_habit(
+            user_id,
+            habit_id,
+            habit_name,
+            cadence_int,
+            color,
+            datetime.utcnow().isoformat()
         )
         
         return {
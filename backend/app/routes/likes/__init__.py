@@ -1,9 +1,11 @@
 from app.routes.likes.like_post import router as like_post_router
 from app.routes.likes.get_post_likes import router as get_post_likes_router
 from app.routes.likes.check_user_like import router as check_user_like_router
+from app.routes.likes.batch_likes import router as batch_likes_router
 
 __all__ = [
     'like_post_router',
     'get_post_likes_router',
-    'check_user_like_router'
+    'check_user_like_router',
+    'batch_likes_router'
 ] 
\ No newline at end of file
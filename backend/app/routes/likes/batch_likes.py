@@ -0,0 +1,54 @@
+import asyncio
+from fastapi import APIRouter, HTTPException, Query
+from typing import Dict, List
+from app.repositories import likes as likes_repo, posts as posts_repo
+
+router = APIRouter()
+
+# One feed page worth of posts
+MAX_BATCH_POSTS = 100
+
+def parse_post_refs(posts):
+    """Split author_id:post_id references, keeping the caller's order and dropping repeats"""
+    refs = {}
+    for ref in posts:
+        author_id, sep, post_id = ref.partition(":")
+        if not sep or not author_id or not post_id:
+            raise HTTPException(status_code=400, detail=f"Posts must be given as author_id:post_id, got {ref!r}")
+        refs.setdefault(post_id, author_id)
+    return [(author_id, post_id) for post_id, author_id in refs.items()]
+
+@router.get("/batch_post_likes")
+async def batch_post_likes(
+    user_id: str = Query(..., description="Viewer whose liked flags are returned"),
+    posts: List[str] = Query(..., description="Posts to look up as author_id:post_id, repeat the parameter for each post")
+) -> Dict:
+    """Like counts and the viewer's liked flag for a page of posts in one request"""
+    try:
+        refs = parse_post_refs(posts)
+        if len(refs) > MAX_BATCH_POSTS:
+            raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_POSTS} posts per request")
+        post_ids = [post_id for _, post_id in refs]
+
+        # Two BatchGetItems: the viewer's likes and the posts' like_count counters
+        liked, counts = await asyncio.gather(
+            likes_repo.batch_get_likes(post_ids, user_id),
+            posts_repo.batch_get_like_counts(refs)
+        )
+
+        # Only posts that predate the counter (see backfill_like_counts) are counted
+        uncounted = [post_id for post_id in post_ids if post_id not in counts]
+        if uncounted:
+            fallback = await asyncio.gather(*(likes_repo.count_post_likes(post_id) for post_id in uncounted))
+            counts.update(zip(uncounted, fallback))
+
+        return {
+            "likes": {
+                post_id: {"count": counts[post_id], "liked": post_id in liked}
+                for post_id in post_ids
+            }
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
@@ -1,20 +1,44 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 from typing import Dict
-import boto3
+from app.repositories import likes as likes_repo, posts as posts_repo
+from app.utils.pagination import encode_cursor, decode_cursor
 
 router = APIRouter()
-dynamodb = boto3.resource('dynamodb')
-likes_table = dynamodb.Table('hb-likes-table')
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
 
 @router.get("/get_post_likes/{post_id}")
-async def get_post_likes(post_id: str) -> Dict:
+async def get_post_likes(
+    post_id: str,
+    author_id: str = Query(None, description="Post owner; when given, like_count is read from the post instead of counted"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Maximum number of likes to return"),
+    cursor: str = Query(None, description="Opaque cursor returned as next_cursor by the previous page")
+) -> Dict:
     try:
-        response = likes_table.query(
-            KeyConditionExpression='post_id = :post_id',
-            ExpressionAttributeValues={
-                ':post_id': post_id
-            }
+        exclusive_start_key = decode_cursor(cursor, required_keys=("post_id", "user_id"))
+        if exclusive_start_key and exclusive_start_key["post_id"] != post_id:
+            raise HTTPException(status_code=400, detail="Cursor does not belong to this post")
+
+        likes, last_evaluated_key = await likes_repo.query_post_likes(
+            post_id, limit, exclusive_start_key=exclusive_start_key
         )
-        return {"likes": response.get('Items', [])}
+        response = {"likes": likes, "next_cursor": encode_cursor(last_evaluated_key)}
+
+        # The count lives on the post, so it doesn't need the whole likes partition
+        if author_id:
+            post = await posts_repo.get_post(author_id, post_id)
+            if post is None:
+                raise HTTPException(status_code=404, detail=f"Post {post_id} not found")
+            response["like_count"] = int(post.get("like_count", 0))
+        elif last_evaluated_key is None and not cursor:
+            # The whole partition fit in this page
+            response["like_count"] = len(likes)
+        else:
+            response["like_count"] = await likes_repo.count_post_likes(post_id)
+
+        return response
+    except HTTPException:
+        raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e)) 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
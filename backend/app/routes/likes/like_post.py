@@ -1,43 +1,34 @@
 from fastapi import APIRouter, HTTPException
-from typing import Dict
-import boto3
+from typing import Dict, Optional
 from datetime import datetime
 import uuid
+from app.repositories import likes as likes_repo
 
 router = APIRouter()
-dynamodb = boto3.resource('dynamodb')
-likes_table = dynamodb.Table('hb-likes-table')
 
 @router.post("/like_post")
-async def like_post(post_id: str, user_id: str) -> Dict:
+async def like_post(post_id: str, user_id: str, author_id: str, liked: Optional[bool] = None) -> Dict:
+    """Toggle a like, or set it with liked=true/false. author_id is the post owner, whose post holds like_count"""
     try:
-        # Check if like already exists
-        response = likes_table.get_item(
-            Key={
-                'post_id': post_id,
-                'user_id': user_id
-            }
-        )
-        
-        # If like exists, remove it (unlike)
-        if 'Item' in response:
-            likes_table.delete_item(
-                Key={
-                    'post_id': post_id,
-                    'user_id': user_id
-                }
-            )
-            return {"message": "Post unliked successfully"}
-        
-        # If like doesn't exist, add it
-        likes_table.put_item(
-            Item={
+        # Liking is tried first: one conditional transaction that fails if the like already exists
+        if liked is not False:
+            added = await likes_repo.add_like({
                 'post_id': post_id,
                 'user_id': user_id,
                 'timestamp': str(datetime.utcnow()),
                 'like_id': str(uuid.uuid4())
-            }
-        )
-        return {"message": "Post liked successfully"}
+            }, author_id)
+            if added:
+                return {"message": "Post liked successfully", "liked": True}
+            if liked:
+                return {"message": "Post already liked", "liked": True}
+
+        # Already liked (toggle) or an explicit unlike
+        removed = await likes_repo.remove_like(post_id, user_id, author_id)
+        if removed or liked is None:
+            return {"message": "Post unliked successfully", "liked": False}
+        return {"message": "Post not liked", "liked": False}
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e)) 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
@@ -6,6 +6,7 @@ from .get_posts import router as get_posts_router
 from .upload import router as upload_router
 from .delete_post import router as delete_post_router
 from .comments import router as comments_router
+from .presigned_upload import router as presigned_upload_router
 
 router = APIRouter()
 
@@ -14,11 +15,13 @@ router.include_router(get_posts_router, prefix="/get", tags=["posts"])
 router.include_router(upload_router, prefix="/upload", tags=["posts"])
 router.include_router(delete_post_router, prefix="/delete_post", tags=["posts"])
 router.include_router(comments_router, prefix="/comments", tags=["posts"])
+router.include_router(presigned_upload_router, prefix="/presigned_upload", tags=["posts"])
 
 __all__ = [
     'create_post_router',
     'get_posts_router',
     'upload_router',
     'delete_post_router',
-    'comments_router'
+    'comments_router',
+    'presigned_upload_router'
 ]
\ No newline at end of file
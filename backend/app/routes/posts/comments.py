@@ -1,21 +1,27 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request
 from pydantic import BaseModel
 from typing import Optional
-import boto3
 from datetime import datetime
+import asyncio
 import uuid
+from app.repositories import comments as comments_repo
+from app.utils.pagination import encode_cursor, decode_cursor
+from app.utils.responses import etag_response
 
 router = APIRouter()
 
-# Initialize DynamoDB
-dynamodb = boto3.resource('dynamodb')
-comments_table = dynamodb.Table('hb-comments-table')
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+# Replies shown under each comment before "view more replies"
+DEFAULT_REPLY_PREVIEW = 3
 
 class CommentCreate(BaseModel):
     post_id: str
     user_id: str
     text: str
     parent_id: Optional[str] = None
+    # sort_key of the parent comment (returned with every comment), required for replies
+    parent_sort_key: Optional[str] = None
 
 @router.post("/create_comment")
 async def create_comment(comment: CommentCreate):
@@ -38,59 +44,105 @@ async def create_comment(comment: CommentCreate):
         
         if comment.parent_id:
             item["parent_id"] = comment.parent_id
-            
-        comments_table.put_item(Item=item)
+            parent_sort_key = comment.parent_sort_key or ""
+            if not parent_sort_key.startswith(comments_repo.COMMENT_PREFIX):
+                raise HTTPException(status_code=400, detail="Replies need the parent comment's sort_key")
+            # The parent keeps its reply_count, so reading a thread never has to count replies
+            await comments_repo.put_reply(item, parent_sort_key)
+        else:
+            await comments_repo.put_comment(item)
         
         return {
             "message": "Comment created successfully",
             "comment_id": comment_id
         }
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+def format_comment(item):
+    """Shape a comment or reply item for the client"""
+    return {
+        "id": item["comment_id"],
+        "sort_key": item["sort_key"],
+        "user_id": item["user_id"],
+        "text": item["text"],
+        "timestamp": item["timestamp"],
+        "likes": item.get("likes", 0),
+        "replies": []
+    }
+
+def decode_comments_cursor(cursor, post_id, prefix):
+    """Decode a cursor and check it points into this post's comments under prefix"""
+    exclusive_start_key = decode_cursor(cursor, required_keys=("post_id", "sort_key"))
+    if exclusive_start_key and (
+        exclusive_start_key["post_id"] != post_id or not exclusive_start_key["sort_key"].startswith(prefix)
+    ):
+        raise HTTPException(status_code=400, detail="Cursor does not belong to this thread")
+    return exclusive_start_key
+
+async def expand_comment(post_id, item, reply_limit):
+    """Attach the reply count and the first page of replies to a top-level comment"""
+    comment = format_comment(item)
+    # Kept on the comment by put_reply (and backfill_reply_counts for older comments)
+    comment["reply_count"] = int(item.get("reply_count", 0))
+    comment["replies_next_cursor"] = None
+    # Comments that have a counter and no replies need no query
+    if not reply_limit or item.get("reply_count") == 0:
+        return comment
+
+    replies, last_evaluated_key = await comments_repo.query_replies(post_id, item["comment_id"], reply_limit)
+    comment["replies"] = [format_comment(reply) for reply in replies]
+    comment["replies_next_cursor"] = encode_cursor(last_evaluated_key)
+    return comment
+
 @router.get("/get_comments/{post_id}")
-async def get_comments(post_id: str):
+async def get_comments(
+    request: Request,
+    post_id: str,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Maximum number of comments to return"),
+    reply_limit: int = Query(DEFAULT_REPLY_PREVIEW, ge=0, le=MAX_PAGE_SIZE, description="Replies to include inline per comment"),
+    cursor: str = Query(None, description="Opaque cursor returned as next_cursor by the previous page")
+):
+    """Fetch a page of top-level comments, newest first, each with its reply count and first replies"""
     try:
-        response = comments_table.query(
-            KeyConditionExpression="post_id = :pid",
-            ExpressionAttributeValues={
-                ":pid": post_id
-            }
+        exclusive_start_key = decode_comments_cursor(cursor, post_id, comments_repo.COMMENT_PREFIX)
+        items, last_evaluated_key = await comments_repo.query_comments(
+            post_id, limit, exclusive_start_key=exclusive_start_key
+        )
+
+        comments = await asyncio.gather(*(expand_comment(post_id, item, reply_limit) for item in items))
+
+        return etag_response(request, {
+            "comments": list(comments),
+            "next_cursor": encode_cursor(last_evaluated_key)
+        })
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/get_replies/{post_id}/{parent_id}")
+async def get_replies(
+    post_id: str,
+    parent_id: str,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Maximum number of replies to return"),
+    cursor: str = Query(None, description="Opaque cursor returned as replies_next_cursor or next_cursor")
+):
+    """Fetch the next page of replies to a comment, oldest first"""
+    try:
+        exclusive_start_key = decode_comments_cursor(cursor, post_id, comments_repo.reply_prefix(parent_id))
+        replies, last_evaluated_key = await comments_repo.query_replies(
+            post_id, parent_id, limit, exclusive_start_key=exclusive_start_key
         )
-        
-        # Organize comments and replies
-        comments = []
-        replies_map = {}
-        
-        for item in response.get('Items', []):
-            comment = {
-                "id": item["comment_id"],
-                "user_id": item["user_id"],
-                "text": item["text"],
-                "timestamp": item["timestamp"],
-                "likes": item.get("likes", 0),
-                "replies": []
-            }
-            
-            if "parent_id" in item:
-                # This is a reply
-                if item["parent_id"] not in replies_map:
-                    replies_map[item["parent_id"]] = []
-                replies_map[item["parent_id"]].append(comment)
-            else:
-                # This is a top-level comment
-                comments.append(comment)
-        
-        # Attach replies to their parent comments
-        for comment in comments:
-            if comment["id"] in replies_map:
-                comment["replies"] = sorted(
-                    replies_map[comment["id"]], 
-                    key=lambda x: x["timestamp"]
-                )
-        
         return {
-            "comments": sorted(comments, key=lambda x: x["timestamp"], reverse=True)
+            "replies": [format_comment(reply) for reply in replies],
+            "next_cursor": encode_cursor(last_evaluated_key)
         }
+    except HTTPException:
+        raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e)) 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
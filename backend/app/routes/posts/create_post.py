@@ -1,26 +1,22 @@
-from fastapi import APIRouter, HTTPException, Query, File, UploadFile
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Query, File, UploadFile
+from fastapi.concurrency import run_in_threadpool
 from typing import Optional
-import boto3
-from boto3.dynamodb.conditions import Key
+import asyncio
 import os
 import uuid
+from app.repositories import posts as posts_repo, storage
 from app.utils.streak_manager import increment_habit_streak
+from app.utils.post_keys import make_post_id, make_post_key
+from app.utils.async_tasks import dispatch
 from datetime import datetime, timezone
-import re  # ✅ Added for filename sanitization
 
 router = APIRouter()
 
-# Initialize DynamoDB resource
-dynamodb = boto3.resource("dynamodb", region_name="us-east-1")
-posts_table = dynamodb.Table("hb-posts-table")
-habit_table = dynamodb.Table("hb-habits-table")
-
-# Initialize S3 client
-s3_client = boto3.client("s3")
-BUCKET_NAME = "hb-user-posts"
+BUCKET_NAME = storage.POSTS_BUCKET
 
 @router.post("/create_post")
 async def create_post(
+    background_tasks: BackgroundTasks,
     user_id: str = Query(..., description="User ID"),
     habit_id: str = Query(..., description="Habit ID to link the post to"),
     comments: str = Query("", description="User comments for the post"),
@@ -30,35 +26,15 @@ async def create_post(
     try:
         # Generate timestamp in ISO format
         timestamp = datetime.now(timezone.utc)
-        timestamp_str = timestamp.strftime("%Y%m%dT%H%M%S")
         timestamp_iso = timestamp.isoformat()
         
         # Generate post_id
-        post_id = f"post-{habit_id}-{timestamp_str}"
-        
-        # Create the S3 path structure
-        date_folder = timestamp.strftime("%Y-%m-%d")
-        habit_folder_key = f"{user_id}/{habit_id}/"
-        date_folder_key = f"{user_id}/{habit_id}/{date_folder}/"
+        post_id = make_post_id(habit_id, timestamp)
         
-        # Sanitize filename to avoid URL-breaking characters
-        safe_filename = re.sub(r"[^\w.\-]", "_", file.filename)
-
-        # Full key path for S3
-        file_key = f"{date_folder_key}{post_id}_{safe_filename}"
+        # Full key path for S3. S3 has no real folders, so the key prefix is
+        # enough and no folder marker objects are needed.
+        file_key = make_post_key(user_id, habit_id, post_id, file.filename, timestamp)
         print(f"📂 Uploading to S3 with key: {file_key}")
-
-        # Create folders if they don't exist
-        for folder_key in [habit_folder_key, date_folder_key]:
-            try:
-                s3_client.head_object(Bucket=BUCKET_NAME, Key=folder_key)
-            except Exception as e:
-                if hasattr(e, 'response') and e.response.get('Error', {}).get('Code') == '404':
-                    s3_client.put_object(Bucket=BUCKET_NAME, Key=folder_key)
-                    print(f"✅ Created folder: {folder_key}")
-        
-        # Upload the image
-        s3_client.upload_fileobj(file.file, BUCKET_NAME, file_key)
         
         # Create the post item
         post_item = {
@@ -70,11 +46,31 @@ async def create_post(
             's3Key': f"{BUCKET_NAME}/{file_key}",
         }
         
-        # Save post to DynamoDB
-        posts_table.put_item(Item=post_item)
+        # Stream the image to S3 and save the post to DynamoDB at the same time
+        upload_result, save_result = await asyncio.gather(
+            storage.upload_fileobj(file, BUCKET_NAME, file_key, content_type=file.content_type),
+            posts_repo.put_post(post_item),
+            return_exceptions=True
+        )
+        
+        # Undo whichever half succeeded so we never keep a post without an image
+        # (or an image without a post)
+        if isinstance(upload_result, Exception) or isinstance(save_result, Exception):
+            try:
+                if not isinstance(upload_result, Exception):
+                    await storage.delete_object(BUCKET_NAME, file_key)
+                if not isinstance(save_result, Exception):
+                    await posts_repo.delete_post(user_id, post_id)
+            except Exception as cleanup_error:
+                print(f"❌ Error cleaning up failed post {post_id}: {cleanup_error}")
+            raise upload_result if isinstance(upload_result, Exception) else save_result
+        
+        # Update the habit streak (shared with the weekly reset Lambda, so it stays
+        # on sync boto3 and runs off the event loop)
+        await run_in_threadpool(increment_habit_streak, user_id, habit_id, posted_at=timestamp)
         
-        # Update the habit streak
-        increment_habit_streak(user_id, habit_id)
+        # Build feed-sized variants, then copy the post into followers' timelines, off the request path
+        await dispatch(background_tasks, "publish_post", user_id, post_id, BUCKET_NAME, file_key)
         
         return {
             "message": "Post created successfully",
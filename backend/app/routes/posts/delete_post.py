@@ -1,57 +1,38 @@
-import boto3
-import os
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, BackgroundTasks, HTTPException
 from pydantic import BaseModel
-from typing import Optional
+from app.repositories import posts as posts_repo
+from app.utils.post_cleanup import delete_post_data
+from app.utils.async_tasks import dispatch
 
 router = APIRouter()
 
-# Initialize AWS clients
-dynamodb = boto3.resource('dynamodb')
-s3 = boto3.client('s3')
-
 class DeletePostRequest(BaseModel):
     post_id: str
     user_id: str
+    # Clean up likes, comments and images in an async task (see app/utils/async_tasks.py);
+    # set to false to wait for it and get the totals
+    background: bool = True
 
 @router.delete("/delete_post")
-async def delete_post(request: DeletePostRequest):
+async def delete_post(request: DeletePostRequest, background_tasks: BackgroundTasks):
     try:
-        # Get the post from DynamoDB to get the S3 key
-        posts_table = dynamodb.Table('hb-posts-table')
-        response = posts_table.get_item(
-            Key={
-                'post_id': request.post_id,
-                'user_id': request.user_id
-            }
-        )
+        # Get the post from DynamoDB to find its images
+        post = await posts_repo.get_post(request.user_id, request.post_id)
         
-        if 'Item' not in response:
+        if post is None:
             raise HTTPException(status_code=404, detail="Post not found")
-            
-        post = response['Item']
         
-        # Delete the image from S3 if it exists
-        if 's3Key' in post:
-            try:
-                # Delete the object from S3 using the key directly
-                s3.delete_object(
-                    Bucket='hb-user-posts',
-                    Key=post['s3Key']
-                )
-            except Exception as e:
-                print(f"Error deleting from S3: {str(e)}")
-                # Continue with DynamoDB deletion even if S3 deletion fails
+        # Delete the post itself first so it disappears from reads straight away
+        await posts_repo.delete_post(request.user_id, request.post_id)
         
-        # Delete the post from DynamoDB
-        posts_table.delete_item(
-            Key={
-                'post_id': request.post_id,
-                'user_id': request.user_id
-            }
-        )
+        if request.background:
+            await dispatch(background_tasks, "cleanup_deleted_post", post)
+            return {"message": "Post deleted successfully"}
         
-        return {"message": "Post deleted successfully"}
+        cleanup = await delete_post_data(post)
+        return {"message": "Post deleted successfully", **cleanup}
         
+    except HTTPException:
+        raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e)) 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
@@ -1,41 +1,47 @@
-from fastapi import APIRouter, Query, HTTPException
-import boto3
-from boto3.dynamodb.conditions import Key
-from datetime import datetime
+from fastapi import APIRouter, Query, HTTPException, Request
+from app.repositories import posts as posts_repo
+from app.utils.pagination import encode_cursor, decode_cursor
+from app.utils.responses import etag_response
+from app.utils.projection import parse_fields
 
 router = APIRouter()
 
-# Initialize DynamoDB resource
-dynamodb = boto3.resource("dynamodb", region_name="us-east-1")
-posts_table = dynamodb.Table("hb-posts-table")
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+# Attributes a client may ask for with fields=
+POST_FIELDS = {"post_id", "habitId", "caption", "timestamp", "s3Key", "variants", "like_count"}
+# The table keys are always read so the cursor and post identity survive any projection
+POST_KEY_FIELDS = ("user_id", "post_id")
 
 @router.get("/get_posts")
 async def get_user_posts(
+    request: Request,
     user_id: str = Query(..., description="User's unique ID"),
-    habit_id: str = Query(None, description="Optional habit ID to filter posts")
+    habit_id: str = Query(None, description="Optional habit ID to filter posts"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Maximum number of posts to return"),
+    cursor: str = Query(None, description="Opaque cursor returned as next_cursor by the previous page"),
+    fields: str = Query(None, description="Comma-separated attributes to return, e.g. post_id,timestamp,variants")
 ):
-    """Fetch all posts for a specific user, optionally filtered by habit_id"""
+    """Fetch a page of posts for a specific user, optionally filtered by habit_id"""
     try:
-        # Base query expression for userId (new primary key)
-        key_condition = Key("user_id").eq(user_id)
-        
-        # Query the posts table
-        response = posts_table.query(
-            KeyConditionExpression=key_condition,
-            ScanIndexForward=False  # Sort by most recent first based on post_id (sort key)
+        attributes = parse_fields(fields, POST_FIELDS, always=POST_KEY_FIELDS)
+        exclusive_start_key = decode_cursor(cursor, required_keys=("user_id", "post_id"))
+        if exclusive_start_key and exclusive_start_key["user_id"] != user_id:
+            raise HTTPException(status_code=400, detail="Cursor does not belong to this user")
+
+        posts, last_evaluated_key = await posts_repo.query_user_posts(
+            user_id, limit, exclusive_start_key=exclusive_start_key, habit_id=habit_id, attributes=attributes
         )
-        
-        posts = response.get("Items", [])
-        
-        # If habit_id is provided, filter the results using habitId field
-        if habit_id and posts:
-            posts = [post for post in posts if post.get('habitId') == habit_id]
-        
+        next_cursor = encode_cursor(last_evaluated_key)
+
         if not posts:
-            return {"message": "No posts found", "posts": []}
-        
-        return {"posts": posts}
-        
+            return etag_response(request, {"message": "No posts found", "posts": [], "next_cursor": next_cursor})
+
+        return etag_response(request, {"posts": posts, "next_cursor": next_cursor})
+
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"❌ DynamoDB error: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Error fetching posts: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Error fetching posts: {str(e)}")
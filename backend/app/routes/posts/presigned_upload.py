@@ -0,0 +1,116 @@
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from datetime import datetime, timezone
+import os
+from app.repositories import posts as posts_repo, storage
+from app.utils.streak_manager import increment_habit_streak
+from app.utils.post_keys import make_post_id, make_post_key, parse_post_timestamp, is_post_key
+from app.utils.async_tasks import dispatch
+
+router = APIRouter()
+
+BUCKET_NAME = storage.POSTS_BUCKET
+
+# Limits for direct-to-S3 uploads
+UPLOAD_URL_EXPIRES_IN = int(os.environ.get("UPLOAD_URL_EXPIRES_IN", "900"))
+MAX_UPLOAD_BYTES = int(os.environ.get("MAX_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+# Only formats Pillow can decode, so every post gets its variants
+ALLOWED_CONTENT_TYPES = {"image/jpeg", "image/png", "image/webp"}
+
+@router.post("/create_upload_url")
+async def create_upload_url(
+    user_id: str = Query(..., description="User ID"),
+    habit_id: str = Query(..., description="Habit ID the post will be linked to"),
+    filename: str = Query(..., description="Original filename of the image"),
+    content_type: str = Query("image/jpeg", description="MIME type of the image"),
+    method: str = Query("post", description="Upload method: 'post' (form upload) or 'put'")
+):
+    """Issue a presigned URL so the client can upload a proof image straight to S3"""
+    try:
+        if content_type not in ALLOWED_CONTENT_TYPES:
+            raise HTTPException(status_code=400, detail=f"Unsupported content type: {content_type}")
+        if method not in ("post", "put"):
+            raise HTTPException(status_code=400, detail="Method must be 'post' or 'put'")
+
+        timestamp = datetime.now(timezone.utc)
+        post_id = make_post_id(habit_id, timestamp)
+        file_key = make_post_key(user_id, habit_id, post_id, filename, timestamp)
+
+        if method == "post":
+            # The policy pins the key, content type and size range
+            presigned = await storage.create_presigned_post(
+                BUCKET_NAME, file_key, content_type, MAX_UPLOAD_BYTES, UPLOAD_URL_EXPIRES_IN
+            )
+            upload = {"method": "POST", "url": presigned["url"], "fields": presigned["fields"]}
+        else:
+            url = await storage.create_presigned_put(
+                BUCKET_NAME, file_key, content_type, UPLOAD_URL_EXPIRES_IN
+            )
+            upload = {"method": "PUT", "url": url, "headers": {"Content-Type": content_type}}
+
+        return {
+            "post_id": post_id,
+            "s3_key": file_key,
+            "upload": upload,
+            "max_bytes": MAX_UPLOAD_BYTES,
+            "expires_in": UPLOAD_URL_EXPIRES_IN
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"❌ Error creating upload URL: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error creating upload URL: {str(e)}")
+
+@router.post("/finalize_post")
+async def finalize_post(
+    background_tasks: BackgroundTasks,
+    user_id: str = Query(..., description="User ID"),
+    habit_id: str = Query(..., description="Habit ID to link the post to"),
+    post_id: str = Query(..., description="post_id returned by /create_upload_url"),
+    s3_key: str = Query(..., description="s3_key returned by /create_upload_url"),
+    comments: str = Query("", description="User comments for the post")
+):
+    """Record a post once its image has been uploaded directly to S3"""
+    try:
+        if not is_post_key(s3_key, user_id, habit_id, post_id):
+            raise HTTPException(status_code=400, detail="s3_key was not issued for this post")
+
+        # Make sure the upload actually landed before recording the post
+        metadata = await storage.get_object_metadata(BUCKET_NAME, s3_key)
+        if metadata is None:
+            raise HTTPException(status_code=409, detail="Image has not been uploaded yet")
+        if metadata.get("ContentLength", 0) > MAX_UPLOAD_BYTES:
+            await storage.delete_object(BUCKET_NAME, s3_key)
+            raise HTTPException(status_code=413, detail="Image is too large")
+
+        timestamp = parse_post_timestamp(post_id) or datetime.now(timezone.utc)
+        post_item = {
+            'user_id': user_id,
+            'post_id': post_id,
+            'habitId': habit_id,
+            'caption': comments,
+            'timestamp': timestamp.isoformat(),
+            's3Key': f"{BUCKET_NAME}/{s3_key}",
+        }
+
+        # Finalizing twice (e.g. a client retry) must not count the post twice
+        created = await posts_repo.put_post(post_item, only_if_new=True)
+        if not created:
+            return {"message": "Post already finalized", "post_id": post_id}
+
+        await run_in_threadpool(increment_habit_streak, user_id, habit_id, posted_at=timestamp)
+
+        # Build feed-sized variants, then copy the post into followers' timelines, off the request path
+        await dispatch(background_tasks, "publish_post", user_id, post_id, BUCKET_NAME, s3_key)
+
+        return {
+            "message": "Post created successfully",
+            "post_id": post_id,
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"❌ Error finalizing post: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error finalizing post: {str(e)}")
@@ -1,16 +1,17 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException, Query
-import boto3
+from fastapi import APIRouter, BackgroundTasks, UploadFile, File, HTTPException, Query
 import uuid
 from datetime import datetime
+from app.repositories import storage
+from app.utils.image_variants import VARIANTS, variant_key
+from app.utils.async_tasks import dispatch
 
 router = APIRouter()
 
-# Initialize S3 client
-s3 = boto3.client('s3', region_name='us-east-1')
-BUCKET_NAME = 'hb-uploads-bucket'  # Replace with your actual bucket name
+BUCKET_NAME = storage.UPLOADS_BUCKET
 
 @router.post("/upload")
 async def upload_file(
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     user_id: str = Query(..., description="User's unique ID")
 ):
@@ -20,23 +21,28 @@ async def upload_file(
         file_extension = file.filename.split('.')[-1] if '.' in file.filename else ''
         unique_filename = f"{user_id}/{uuid.uuid4()}.{file_extension}"
         
-        # Read file content
-        file_content = await file.read()
-        
-        # Upload to S3
-        s3.put_object(
-            Bucket=BUCKET_NAME,
-            Key=unique_filename,
-            Body=file_content,
-            ContentType=file.content_type
+        # Stream to S3 in chunks rather than reading the whole file into memory
+        await storage.upload_fileobj(
+            file,
+            BUCKET_NAME,
+            unique_filename,
+            content_type=file.content_type
         )
         
         # Generate the URL for the uploaded file
         file_url = f"https://{BUCKET_NAME}.s3.amazonaws.com/{unique_filename}"
         
+        # Build resized variants off the request path; their URLs are known up front
+        await dispatch(background_tasks, "process_upload_image", BUCKET_NAME, unique_filename)
+        variant_urls = {
+            name: f"https://{BUCKET_NAME}.s3.amazonaws.com/{variant_key(unique_filename, name)}"
+            for name in VARIANTS
+        }
+        
         return {
             "message": "File uploaded successfully",
             "file_url": file_url,
+            "variant_urls": variant_urls,
             "uploaded_at": datetime.utcnow().isoformat()
         }
         
@@ -2,8 +2,10 @@
 
 from app.routes.users.create_user import router as create_user_router
 from app.routes.users.get_user import router as get_user_router
+from app.routes.users.bootstrap import router as bootstrap_router
 
 __all__ = [
     'create_user_router',
-    'get_user_router'
+    'get_user_router',
+    'bootstrap_router'
 ]
\ No newline at end of file
@@ -0,0 +1,65 @@
+import asyncio
+from fastapi import APIRouter, Query, HTTPException
+from app.repositories import users as users_repo, habits as habits_repo, posts as posts_repo, timeline as timeline_repo
+from app.utils.pagination import encode_cursor
+from app.routes.users.get_user import format_user
+from app.routes.habits.get_habit import visible_habits
+from app.routes.feed.get_feed import format_entry
+
+router = APIRouter()
+
+SECTIONS = ("user", "habits", "posts", "feed")
+DEFAULT_SECTIONS = "user,habits,posts"
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+async def load_user(user_id, limit):
+    """The user profile, as /get_user returns it"""
+    user_data = await users_repo.get_user(user_id)
+    if user_data is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    return format_user(user_data)
+
+async def load_habits(user_id, limit):
+    """The user's habits, as /get_habit returns them"""
+    return visible_habits(await habits_repo.query_user_habits(user_id))
+
+async def load_posts(user_id, limit):
+    """The first page of the user's own posts"""
+    posts, last_evaluated_key = await posts_repo.query_user_posts(user_id, limit)
+    return {"posts": posts, "next_cursor": encode_cursor(last_evaluated_key)}
+
+async def load_feed(user_id, limit):
+    """The first page of the user's home feed"""
+    entries, last_evaluated_key = await timeline_repo.query_timeline(user_id, limit)
+    return {"posts": [format_entry(entry) for entry in entries], "next_cursor": encode_cursor(last_evaluated_key)}
+
+LOADERS = {
+    "user": load_user,
+    "habits": load_habits,
+    "posts": load_posts,
+    "feed": load_feed
+}
+
+@router.get("/bootstrap")
+async def bootstrap(
+    user_id: str = Query(..., description="User's unique Cognito ID"),
+    include: str = Query(DEFAULT_SECTIONS, description=f"Comma-separated sections to return: {', '.join(SECTIONS)}"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Page size for the posts and feed sections")
+):
+    """Everything the app needs on launch in one call, with each section read concurrently"""
+    try:
+        sections = list(dict.fromkeys(section.strip() for section in include.split(",") if section.strip()))
+        unknown = [section for section in sections if section not in LOADERS]
+        if unknown or not sections:
+            raise HTTPException(status_code=400, detail=f"Unknown sections: {', '.join(unknown)}; choose from {', '.join(SECTIONS)}")
+
+        # The call takes as long as the slowest read rather than the sum of them
+        results = await asyncio.gather(*(LOADERS[section](user_id, limit) for section in sections))
+        return dict(zip(sections, results))
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"❌ Error bootstrapping user {user_id}: {e}")
+        raise HTTPException(status_code=500, detail=f"Error loading app data: {str(e)}")
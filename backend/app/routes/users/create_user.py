@@ -1,20 +1,14 @@
 from fastapi import APIRouter, Query, HTTPException
-import boto3
 from datetime import datetime
 import botocore
+from app.repositories import users as users_repo, storage
 
 router = APIRouter()
 
-# Initialize DynamoDB
-dynamodb = boto3.resource("dynamodb", region_name="us-east-1")
-table = dynamodb.Table("hb-user-table")
-
-# Initialize S3 client
-s3_client = boto3.client("s3")
-BUCKET_NAME = "hb-user-posts"
+BUCKET_NAME = storage.POSTS_BUCKET
 
 @router.post("/create_user")
-def create_user(
+async def create_user(
     user_id: str = Query(..., description="User's unique Cognito ID"),
     phone_number: str = Query(..., description="User's phone number (email used temporarily)")
 ):
@@ -22,30 +16,28 @@ def create_user(
         print(f"🔍 Checking for user: {user_id}, {phone_number}")
 
         # Check if the user already exists
-        response = table.get_item(Key={"user_id": user_id})
+        existing_user = await users_repo.get_user(user_id)
         
         # Create user folder in S3 if it doesn't exist
         try:
             # Check if the user folder exists in S3
-            s3_client.head_object(Bucket=BUCKET_NAME, Key=f"{user_id}/")
-            print(f"✅ User folder already exists in S3 for user: {user_id}")
-        except botocore.exceptions.ClientError as e:
-            if e.response['Error']['Code'] == '404':
+            if await storage.object_exists(BUCKET_NAME, f"{user_id}/"):
+                print(f"✅ User folder already exists in S3 for user: {user_id}")
+            else:
                 # Create an empty object with a trailing slash to create a folder
-                s3_client.put_object(Bucket=BUCKET_NAME, Key=f"{user_id}/")
+                await storage.put_object(BUCKET_NAME, f"{user_id}/")
                 print(f"✅ Created user folder in S3 for user: {user_id}")
-            else:
-                print(f"❌ S3 error: {e}")
+        except botocore.exceptions.ClientError as e:
+            print(f"❌ S3 error: {e}")
 
-        if "Item" in response:
-            return {"message": "User already exists", "user": response["Item"]}
+        if existing_user is not None:
+            return {"message": "User already exists", "user": existing_user}
 
         # Create a new user entry
-        table.put_item(Item={
+        await users_repo.put_user({
             "user_id": user_id,
             "phone_number": phone_number,
             "created_at": datetime.utcnow().isoformat(),
-            "habits": [],
             "display_name": "Adi",
             "color_preference": "green"
         })
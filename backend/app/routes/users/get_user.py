@@ -1,39 +1,41 @@
-from fastapi import APIRouter, Query, HTTPException
-import boto3
+from fastapi import APIRouter, Query, HTTPException, Request
 from datetime import datetime
+from app.repositories import users as users_repo
+from app.utils.responses import etag_response
 
 router = APIRouter()
 
-# Initialize DynamoDB
-dynamodb = boto3.resource("dynamodb", region_name="us-east-1")
-table = dynamodb.Table("hb-user-table")
+def format_user(user_data):
+    """Shape a user item for the client"""
+    return {
+        "user_id": user_data["user_id"],
+        "phone_number": user_data["phone_number"],
+        "created_at": user_data["created_at"],
+        "habits": users_repo.get_habit_ids(user_data),
+        "display_name": user_data.get("display_name", "User"),
+        "color_preference": user_data.get("color_preference", "green"),
+        "error": None
+    }
 
 @router.get("/get_user")
-def get_user(
+async def get_user(
+    request: Request,
     user_id: str = Query(..., description="User's unique Cognito ID")
 ):
     try:
         print(f"🔍 Getting user data for: {user_id}")
         
         # Get the user from DynamoDB
-        response = table.get_item(Key={"user_id": user_id})
+        user_data = await users_repo.get_user(user_id)
         
         # Check if user exists
-        if "Item" not in response:
+        if user_data is None:
             raise HTTPException(status_code=404, detail="User not found")
-            
-        user_data = response["Item"]
         
-        return {
-            "user_id": user_data["user_id"],
-            "phone_number": user_data["phone_number"],
-            "created_at": user_data["created_at"],
-            "habits": user_data.get("habits", []),
-            "display_name": user_data.get("display_name", "User"),
-            "color_preference": user_data.get("color_preference", "green"),
-            "error": None
-        }
+        return etag_response(request, format_user(user_data))
 
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"❌ Error getting user: {e}")
         raise HTTPException(status_code=500, detail=f"Error getting user: {str(e)}") 
\ No newline at end of file
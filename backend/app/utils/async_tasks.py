@@ -0,0 +1,67 @@
+import asyncio
+import importlib
+import json
+import os
+from app.utils.responses import dumps
+
+# Work that must not hold up the response. Under Mangum, FastAPI BackgroundTasks finish
+# before the Lambda returns, so on Lambda these run in a separate async invocation instead.
+TASKS = {
+    "publish_post": "app.utils.fanout:publish_post",
+    "backfill_timeline": "app.utils.fanout:backfill_timeline",
+    "purge_author": "app.utils.fanout:purge_author",
+    "process_upload_image": "app.utils.image_variants:process_upload_image",
+    "export_habits": "app.utils.habits_export:export_habits",
+    "cleanup_deleted_post": "app.utils.post_cleanup:cleanup_deleted_post",
+}
+
+# Function that runs the tasks; on Lambda it defaults to this function, whose handler
+# recognises task events (it needs lambda:InvokeFunction on itself)
+ASYNC_TASK_FUNCTION = os.environ.get("ASYNC_TASK_FUNCTION") or os.environ.get("AWS_LAMBDA_FUNCTION_NAME")
+
+TASK_EVENT_KEY = "async_task"
+
+def resolve_task(name):
+    """Import the coroutine function registered under name"""
+    module_name, function_name = TASKS[name].split(":")
+    return getattr(importlib.import_module(module_name), function_name)
+
+def task_event(name, args):
+    """The Lambda payload for a task; arguments go through dumps so Decimals and sets survive"""
+    return {TASK_EVENT_KEY: name, "args": json.loads(dumps(list(args)))}
+
+def is_task_event(event):
+    return isinstance(event, dict) and TASK_EVENT_KEY in event
+
+async def invoke_task(function_name, name, args):
+    """Queue a task as an asynchronous (InvocationType=Event) Lambda invoke"""
+    from app.repositories.base import get_lambda_client
+    client = await get_lambda_client()
+    await client.invoke(
+        FunctionName=function_name,
+        InvocationType="Event",
+        Payload=dumps(task_event(name, args))
+    )
+
+async def dispatch(background_tasks, name, *args):
+    """Run a task off the request path: an async Lambda invoke when deployed, a BackgroundTask otherwise"""
+    if ASYNC_TASK_FUNCTION:
+        try:
+            await invoke_task(ASYNC_TASK_FUNCTION, name, args)
+            return
+        except Exception as e:
+            # Better late than lost: run it in-process after the response
+            print(f"❌ Error queueing {name}, running it in-process: {e}")
+    background_tasks.add_task(resolve_task(name), *args)
+
+async def run_task(event):
+    """Run the task described by a task event"""
+    name = event[TASK_EVENT_KEY]
+    if name not in TASKS:
+        raise ValueError(f"Unknown async task: {name}")
+    await resolve_task(name)(*event.get("args", []))
+    return {"task": name, "status": "done"}
+
+def handle_task_event(event):
+    """Lambda entry point for task events, on the same event loop Mangum uses"""
+    return asyncio.get_event_loop().run_until_complete(run_task(event))
@@ -0,0 +1,62 @@
+import os
+import threading
+from functools import lru_cache
+
+REGION = os.environ.get("AWS_REGION", "us-east-1")
+
+# Connection pooling, retry and timeout tuning shared by the sync and async clients
+MAX_POOL_CONNECTIONS = int(os.environ.get("AWS_MAX_POOL_CONNECTIONS", "50"))
+MAX_ATTEMPTS = int(os.environ.get("AWS_MAX_ATTEMPTS", "5"))
+CONNECT_TIMEOUT = float(os.environ.get("AWS_CONNECT_TIMEOUT", "2"))
+READ_TIMEOUT = float(os.environ.get("AWS_READ_TIMEOUT", "10"))
+KEEPALIVE_TIMEOUT = float(os.environ.get("AWS_KEEPALIVE_TIMEOUT", "60"))
+
+def client_config_kwargs():
+    """Keyword arguments for botocore Config shared by every AWS client"""
+    return {
+        "region_name": REGION,
+        "max_pool_connections": MAX_POOL_CONNECTIONS,
+        "retries": {"mode": "adaptive", "max_attempts": MAX_ATTEMPTS},
+        "connect_timeout": CONNECT_TIMEOUT,
+        "read_timeout": READ_TIMEOUT,
+    }
+
+@lru_cache(maxsize=None)
+def get_session():
+    """Get the process-wide boto3 session"""
+    # Imported here so that importing the app doesn't pay for boto3 on cold start
+    import boto3
+    return boto3.session.Session()
+
+@lru_cache(maxsize=None)
+def get_client_config():
+    """Get the tuned botocore Config for sync clients"""
+    from botocore.config import Config
+    return Config(tcp_keepalive=True, **client_config_kwargs())
+
+# The session itself is not thread safe, so clients and resources are created under a lock
+_session_lock = threading.Lock()
+
+@lru_cache(maxsize=None)
+def get_s3_client():
+    """Get the shared S3 client (clients are thread safe)"""
+    with _session_lock:
+        return get_session().client("s3", config=get_client_config())
+
+# boto3 resources are not thread safe, so each thread gets its own
+_thread_local = threading.local()
+
+def get_dynamodb():
+    """Get the DynamoDB resource for the current thread"""
+    if not hasattr(_thread_local, "dynamodb"):
+        with _session_lock:
+            _thread_local.dynamodb = get_session().resource("dynamodb", config=get_client_config())
+        _thread_local.tables = {}
+    return _thread_local.dynamodb
+
+def get_table(table_name):
+    """Get a DynamoDB Table handle for the current thread"""
+    dynamodb = get_dynamodb()
+    if table_name not in _thread_local.tables:
+        _thread_local.tables[table_name] = dynamodb.Table(table_name)
+    return _thread_local.tables[table_name]
@@ -0,0 +1,192 @@
+import copy
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+# The local tier lives as long as the warm Lambda container or uvicorn worker
+CACHE_ENABLED = os.environ.get("CACHE_ENABLED", "true").lower() != "false"
+CACHE_MAX_ENTRIES = int(os.environ.get("CACHE_MAX_ENTRIES", "1024"))
+# Kept short because other containers can't invalidate this one's local tier
+CACHE_TTL_SECONDS = float(os.environ.get("CACHE_TTL_SECONDS", "30"))
+# Optional shared tier (e.g. ElastiCache), invalidated by every writer
+CACHE_REDIS_URL = os.environ.get("CACHE_REDIS_URL")
+CACHE_SHARED_TTL_SECONDS = int(os.environ.get("CACHE_SHARED_TTL_SECONDS", "300"))
+
+def user_key(user_id):
+    """Cache key for a user item"""
+    return f"user:{user_id}"
+
+def habits_key(user_id):
+    """Cache key for a user's list of habits"""
+    return f"habits:{user_id}"
+
+class LRUCache:
+    """Bounded, thread-safe LRU cache whose entries expire after a TTL"""
+    def __init__(self, max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL_SECONDS, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.clock = clock
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, key):
+        """Return (True, value) for a live entry, else (False, None)"""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return False, None
+            expires_at, value = entry
+            if expires_at <= self.clock():
+                del self.entries[key]
+                return False, None
+            self.entries.move_to_end(key)
+            return True, value
+
+    def set(self, key, value):
+        with self.lock:
+            self.entries[key] = (self.clock() + self.ttl, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key):
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def __len__(self):
+        return len(self.entries)
+
+class InMemorySharedBackend:
+    """Process-local stand-in for the shared tier, for tests and local runs"""
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.values.get(key)
+            if entry is None or entry[0] <= self.clock():
+                return False, None
+            return True, pickle.loads(entry[1])
+
+    def set(self, key, value, ttl):
+        with self.lock:
+            self.values[key] = (self.clock() + ttl, pickle.dumps(value))
+
+    def delete(self, key):
+        with self.lock:
+            self.values.pop(key, None)
+
+class RedisSharedBackend:
+    """Shared tier on Redis; values are pickled since items hold Decimals and sets"""
+    def __init__(self, url):
+        # Only needed when a shared cache is configured
+        import redis
+        self.client = redis.Redis.from_url(url, socket_timeout=0.2, socket_connect_timeout=0.2)
+
+    def get(self, key):
+        raw = self.client.get(key)
+        if raw is None:
+            return False, None
+        return True, pickle.loads(raw)
+
+    def set(self, key, value, ttl):
+        self.client.set(key, pickle.dumps(value), ex=ttl)
+
+    def delete(self, key):
+        self.client.delete(key)
+
+class ReadThroughCache:
+    """Local LRU+TTL tier in front of an optional shared tier, with hit/miss counters"""
+    def __init__(self, local=None, shared=None, shared_ttl=CACHE_SHARED_TTL_SECONDS, enabled=CACHE_ENABLED):
+        self.local = local or LRUCache()
+        self.shared = shared
+        self.shared_ttl = shared_ttl
+        self.enabled = enabled
+        self.counters = {"hits": 0, "shared_hits": 0, "misses": 0, "invalidations": 0, "errors": 0}
+        # Bumped on every invalidation so a load that raced a write isn't cached
+        self.generations = {}
+
+    def _count(self, name):
+        # Races only make the counters approximate, which is fine for monitoring
+        self.counters[name] += 1
+
+    def _shared_call(self, method, *args):
+        """Call the shared tier; it is an optimisation, so failures fall back to DynamoDB"""
+        try:
+            return getattr(self.shared, method)(*args)
+        except Exception as e:
+            self._count("errors")
+            print(f"⚠️ Shared cache {method} failed: {e}")
+            return (False, None) if method == "get" else None
+
+    async def get_or_load(self, key, loader):
+        """Return the cached value for key, calling the async loader on a miss"""
+        if not self.enabled:
+            return await loader()
+
+        found, value = self.local.get(key)
+        if found:
+            self._count("hits")
+            return copy.deepcopy(value)
+
+        if self.shared is not None:
+            found, value = self._shared_call("get", key)
+            if found:
+                self._count("shared_hits")
+                self.local.set(key, value)
+                return copy.deepcopy(value)
+
+        self._count("misses")
+        generation = self.generations.get(key, 0)
+        value = await loader()
+        if self.generations.get(key, 0) == generation:
+            self.local.set(key, value)
+            if self.shared is not None:
+                self._shared_call("set", key, value, self.shared_ttl)
+        # Callers get their own copy, so mutating a result can't corrupt the cache
+        return copy.deepcopy(value)
+
+    def invalidate(self, *keys):
+        """Drop entries after a write; safe to call from worker threads"""
+        for key in keys:
+            self.generations[key] = self.generations.get(key, 0) + 1
+            self.local.delete(key)
+            if self.shared is not None:
+                self._shared_call("delete", key)
+            self._count("invalidations")
+
+    def stats(self):
+        """Counters plus the local tier's size, for the cache stats endpoint"""
+        lookups = self.counters["hits"] + self.counters["shared_hits"] + self.counters["misses"]
+        return {
+            **self.counters,
+            "evictions": self.local.evictions,
+            "entries": len(self.local),
+            "max_entries": self.local.max_entries,
+            "hit_rate": round((lookups - self.counters["misses"]) / lookups, 3) if lookups else None,
+            "shared_backend": type(self.shared).__name__ if self.shared is not None else None
+        }
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_cache():
+    """Get the process-wide read-through cache, built from the environment on first use"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                shared = RedisSharedBackend(CACHE_REDIS_URL) if CACHE_REDIS_URL else None
+                _cache = ReadThroughCache(shared=shared)
+    return _cache
+
+def set_cache(cache):
+    """Replace the process-wide cache (e.g. with an InMemorySharedBackend for local runs)"""
+    global _cache
+    _cache = cache
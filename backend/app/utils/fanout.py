@@ -0,0 +1,78 @@
+import os
+import time
+from app.repositories import posts as posts_repo, follows as follows_repo, timeline as timeline_repo
+from app.utils.image_variants import process_post_image
+
+# Timeline entries expire through the table's TTL on expires_at
+TIMELINE_TTL_DAYS = int(os.environ.get("TIMELINE_TTL_DAYS", "90"))
+# Recent posts copied into a new follower's timeline
+BACKFILL_POSTS = int(os.environ.get("TIMELINE_BACKFILL_POSTS", "20"))
+
+def timeline_entry_id(post):
+    """Time-ordered sort key for a post's timeline entries: {timestamp}#{author}#{post_id}"""
+    return f"{post['timestamp']}#{post['user_id']}#{post['post_id']}"
+
+def make_timeline_entry(recipient_id, post):
+    """Copy the fields the feed renders from a post into a recipient's timeline entry"""
+    entry = {
+        "user_id": recipient_id,
+        "entry_id": timeline_entry_id(post),
+        "author_id": post["user_id"],
+        "post_id": post["post_id"],
+        "habitId": post.get("habitId"),
+        "caption": post.get("caption", ""),
+        "timestamp": post["timestamp"],
+        "s3Key": post.get("s3Key"),
+        "expires_at": int(time.time()) + TIMELINE_TTL_DAYS * 24 * 60 * 60
+    }
+    if "variants" in post:
+        entry["variants"] = post["variants"]
+    return entry
+
+async def fan_out_post(user_id, post_id):
+    """Stage for new posts: write an entry into the author's and every follower's timeline"""
+    try:
+        # Re-read the post so the variants publish_post just made are included
+        post = await posts_repo.get_post(user_id, post_id)
+        if post is None:
+            return
+
+        followers = await follows_repo.query_followers(user_id)
+        recipients = [user_id] + followers
+        await timeline_repo.put_entries(make_timeline_entry(recipient, post) for recipient in recipients)
+        print(f"✅ Fanned out post {post_id} to {len(recipients)} timelines")
+    except Exception as e:
+        print(f"❌ Error fanning out post {post_id}: {e}")
+
+async def publish_post(user_id, post_id, bucket, original_key):
+    """Async stage for new posts: build the image variants, then fan the post out with them"""
+    await process_post_image(user_id, post_id, bucket, original_key)
+    await fan_out_post(user_id, post_id)
+
+async def retract_post(post):
+    """Background stage for deleted posts: remove the post from every timeline it was copied to"""
+    try:
+        followers = await follows_repo.query_followers(post["user_id"])
+        entry_id = timeline_entry_id(post)
+        await timeline_repo.delete_entries(
+            {"user_id": recipient, "entry_id": entry_id}
+            for recipient in [post["user_id"]] + followers
+        )
+    except Exception as e:
+        print(f"❌ Error retracting post {post['post_id']} from timelines: {e}")
+
+async def backfill_timeline(follower_id, followee_id):
+    """Async stage for new follows: copy the followee's recent posts into the follower's timeline"""
+    try:
+        posts, _ = await posts_repo.query_user_posts(followee_id, BACKFILL_POSTS)
+        await timeline_repo.put_entries(make_timeline_entry(follower_id, post) for post in posts)
+    except Exception as e:
+        print(f"❌ Error backfilling timeline for {follower_id}: {e}")
+
+async def purge_author(follower_id, author_id):
+    """Async stage for unfollows: drop an author's posts from the follower's timeline"""
+    try:
+        keys = await timeline_repo.query_entry_keys_by_author(follower_id, author_id)
+        await timeline_repo.delete_entries(keys)
+    except Exception as e:
+        print(f"❌ Error purging {author_id} from timeline of {follower_id}: {e}")
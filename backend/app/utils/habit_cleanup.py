@@ -0,0 +1,78 @@
+import asyncio
+import os
+import time
+from app.repositories import posts as posts_repo, likes as likes_repo, comments as comments_repo, habits as habits_repo, storage
+from app.utils.fanout import retract_post
+
+# Each call works for at most this long, then reports progress so the client can call again
+TIME_BUDGET_SECONDS = float(os.environ.get("HABIT_DELETE_TIME_BUDGET", "20"))
+# Posts deleted per page (batch_writer sends them as 25-item BatchWriteItem calls)
+POST_PAGE_SIZE = 100
+
+async def delete_post_children(post):
+    """Delete a post's likes, comments and timeline entries; its images go with the habit's S3 prefix"""
+    await asyncio.gather(
+        likes_repo.delete_post_likes(post["post_id"]),
+        comments_repo.delete_post_comments(post["post_id"]),
+        retract_post(post)
+    )
+
+async def delete_habit_posts_page(user_id, habit_id, exclusive_start_key=None):
+    """Delete one page of a habit's posts and everything hanging off them.
+
+    Returns (posts_deleted, last_evaluated_key).
+    """
+    # A key-range query on the habit's post_id prefix, so the cost follows this habit's posts
+    posts, last_evaluated_key = await posts_repo.query_habit_posts(
+        user_id, habit_id, POST_PAGE_SIZE, exclusive_start_key=exclusive_start_key
+    )
+    await asyncio.gather(*(delete_post_children(post) for post in posts))
+    await posts_repo.delete_posts({"user_id": post["user_id"], "post_id": post["post_id"]} for post in posts)
+    return len(posts), last_evaluated_key
+
+async def delete_habit_objects_batch(user_id, habit_id):
+    """Delete up to 1000 objects under the habit's image prefix, returning how many went"""
+    keys = await storage.list_object_keys(storage.POSTS_BUCKET, f"{user_id}/{habit_id}/")
+    if not keys:
+        return 0
+    failed = await storage.delete_objects(storage.POSTS_BUCKET, keys)
+    if len(failed) == len(keys):
+        # Nothing was deleted, so listing again would return the same keys forever
+        raise RuntimeError(f"Could not delete objects under {user_id}/{habit_id}/: {failed[:5]}")
+    return len(keys) - len(failed)
+
+async def delete_habit_data(user_id, habit_id, time_budget=TIME_BUDGET_SECONDS):
+    """Delete a habit's posts, images and finally the habit itself, within a time budget.
+
+    Safe to call repeatedly: every step only removes what is still there. Returns
+    {"done", "posts_deleted", "objects_deleted"} for this call.
+    """
+    deadline = time.monotonic() + time_budget
+    progress = {"done": False, "posts_deleted": 0, "objects_deleted": 0}
+
+    async def record(posts_deleted, objects_deleted):
+        progress["posts_deleted"] += posts_deleted
+        progress["objects_deleted"] += objects_deleted
+        if posts_deleted or objects_deleted:
+            await habits_repo.add_deletion_progress(user_id, habit_id, posts_deleted, objects_deleted)
+
+    # Posts first, so nothing points at the images once they are gone
+    last_evaluated_key = None
+    while True:
+        posts_deleted, last_evaluated_key = await delete_habit_posts_page(user_id, habit_id, last_evaluated_key)
+        await record(posts_deleted, 0)
+        if not last_evaluated_key:
+            break
+        if time.monotonic() >= deadline:
+            return progress
+
+    while time.monotonic() < deadline:
+        objects_deleted = await delete_habit_objects_batch(user_id, habit_id)
+        if not objects_deleted:
+            # Everything is gone; the habit item (with its streak counters) goes last
+            await habits_repo.delete_habit(user_id, habit_id)
+            progress["done"] = True
+            return progress
+        await record(0, objects_deleted)
+
+    return progress
@@ -0,0 +1,21 @@
+from app.repositories import habits as habits_repo, storage
+from app.utils.responses import dumps
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+async def ndjson_pages(total_segments):
+    """Yield every habit as one JSON line, a scan page at a time"""
+    async for page in habits_repo.scan_habit_pages(total_segments):
+        if page:
+            yield b"".join(dumps(habit) + b"\n" for habit in page)
+
+async def export_habits(key, total_segments):
+    """Async stage for /habits?format=ndjson on Lambda: write the export to S3 one part at a time"""
+    try:
+        size = await storage.upload_chunks(
+            ndjson_pages(total_segments), storage.EXPORTS_BUCKET, key, content_type=NDJSON_MEDIA_TYPE
+        )
+        print(f"✅ Exported habits to {storage.EXPORTS_BUCKET}/{key} ({size} bytes)")
+    except Exception as e:
+        # The upload was aborted, so the presigned URL keeps returning 404
+        print(f"❌ Error exporting habits to {key}: {e}")
@@ -0,0 +1,37 @@
+from datetime import datetime, timedelta, timezone
+from app.utils.post_keys import make_post_id, parse_post_timestamp
+
+def day_range_utc(start_date, end_date, utc_offset_minutes=0):
+    """UTC instants bounding local days start_date..end_date (end exclusive)"""
+    offset = timedelta(minutes=utc_offset_minutes)
+    start = datetime(start_date.year, start_date.month, start_date.day, tzinfo=timezone.utc) - offset
+    end = datetime(end_date.year, end_date.month, end_date.day, tzinfo=timezone.utc) + timedelta(days=1) - offset
+    return start, end
+
+def post_id_range(habit_id, start, end):
+    """Sort key bounds covering a habit's posts made in [start, end)"""
+    # post_ids have one-second resolution, so the last second before `end` is the upper bound
+    return make_post_id(habit_id, start), make_post_id(habit_id, end - timedelta(seconds=1))
+
+def bucket_post_ids(post_ids_by_habit, start, days):
+    """Count posts per local day for each habit in one pass over the post_ids.
+
+    `start` is the UTC instant the first local day begins. Returns {habit_id: [count per day]}.
+    """
+    counts = {}
+    start_seconds = start.timestamp()
+    for habit_id, post_ids in post_ids_by_habit.items():
+        row = [0] * days
+        for post_id in post_ids:
+            posted_at = parse_post_timestamp(post_id)
+            if posted_at is None:
+                continue
+            day = int((posted_at.timestamp() - start_seconds) // 86400)
+            if 0 <= day < days:
+                row[day] += 1
+        counts[habit_id] = row
+    return counts
+
+def total_per_day(counts, days):
+    """Sum the per-habit rows into one row for the all-habits heatmap"""
+    return [sum(column) for column in zip(*counts.values())] if counts else [0] * days
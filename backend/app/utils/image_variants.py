@@ -0,0 +1,123 @@
+import io
+import os
+import posixpath
+from fastapi.concurrency import run_in_threadpool
+from app.repositories import posts as posts_repo, storage
+
+# Fixed-size derivatives served to the feed instead of the original upload.
+# Thumbnails are center-cropped squares for grid tiles; medium keeps the aspect ratio.
+VARIANTS = {
+    "thumb": {"size": (320, 320), "crop": True},
+    "medium": {"size": (1080, 1080), "crop": False},
+}
+VARIANT_FORMAT = "WEBP"
+VARIANT_EXTENSION = "webp"
+VARIANT_CONTENT_TYPE = "image/webp"
+VARIANT_QUALITY = int(os.environ.get("IMAGE_VARIANT_QUALITY", "80"))
+
+class S3ObjectStore:
+    """Object store backed by an S3 bucket through the async storage repository"""
+    def __init__(self, bucket):
+        self.bucket = bucket
+
+    async def get(self, key):
+        return await storage.get_object_bytes(self.bucket, key)
+
+    async def put(self, key, body, content_type):
+        await storage.put_object(self.bucket, key, body=body, content_type=content_type)
+
+class InMemoryObjectStore:
+    """Dict-backed object store for tests and local runs"""
+    def __init__(self, objects=None):
+        self.objects = dict(objects or {})
+        self.content_types = {}
+
+    async def get(self, key):
+        return self.objects[key]
+
+    async def put(self, key, body, content_type):
+        self.objects[key] = body
+        self.content_types[key] = content_type
+
+class FileSystemObjectStore:
+    """Object store rooted at a local directory, keys map to relative paths"""
+    def __init__(self, root):
+        self.root = root
+
+    def _path(self, key):
+        path = os.path.abspath(os.path.join(self.root, key))
+        if not path.startswith(os.path.abspath(self.root) + os.sep):
+            raise ValueError(f"Key escapes the store root: {key}")
+        return path
+
+    async def get(self, key):
+        with open(self._path(key), "rb") as f:
+            return f.read()
+
+    async def put(self, key, body, content_type):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(body)
+
+def variant_key(original_key, name):
+    """Key for a derivative, next to the original: {dir}/variants/{stem}_{name}.webp"""
+    directory, filename = posixpath.split(original_key)
+    stem = posixpath.splitext(filename)[0]
+    return posixpath.join(directory, "variants", f"{stem}_{name}.{VARIANT_EXTENSION}")
+
+def render_variants(image_bytes):
+    """Resize an image into every variant, returning {name: encoded bytes}"""
+    # Pillow is only needed by the processing stage, not on the request path
+    from PIL import Image, ImageOps
+
+    with Image.open(io.BytesIO(image_bytes)) as original:
+        # Respect camera orientation, then normalise palette/CMYK/etc. modes before encoding
+        image = ImageOps.exif_transpose(original)
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGB")
+
+        rendered = {}
+        for name, spec in VARIANTS.items():
+            if spec["crop"]:
+                variant = ImageOps.fit(image, spec["size"], Image.LANCZOS)
+            else:
+                variant = image.copy()
+                variant.thumbnail(spec["size"], Image.LANCZOS)
+            buffer = io.BytesIO()
+            variant.save(buffer, VARIANT_FORMAT, quality=VARIANT_QUALITY, method=4)
+            rendered[name] = buffer.getvalue()
+        return rendered
+
+async def create_variants(store, original_key):
+    """Generate and store all variants of an image, returning {name: key}"""
+    image_bytes = await store.get(original_key)
+    # Resizing is CPU bound, so keep it off the event loop
+    rendered = await run_in_threadpool(render_variants, image_bytes)
+
+    keys = {}
+    for name, body in rendered.items():
+        key = variant_key(original_key, name)
+        await store.put(key, body, VARIANT_CONTENT_TYPE)
+        keys[name] = key
+    return keys
+
+async def process_post_image(user_id, post_id, bucket, original_key):
+    """First stage of publish_post: build the variants and record them on the post"""
+    try:
+        keys = await create_variants(S3ObjectStore(bucket), original_key)
+        # Stored like s3Key, as bucket-prefixed keys
+        await posts_repo.set_post_variants(
+            user_id, post_id, {name: f"{bucket}/{key}" for name, key in keys.items()}
+        )
+        print(f"✅ Created image variants for post {post_id}")
+    except Exception as e:
+        # The post keeps working with its original image
+        print(f"❌ Error creating image variants for post {post_id}: {e}")
+
+async def process_upload_image(bucket, original_key):
+    """Async stage for /upload: build the variants next to the uploaded file"""
+    try:
+        await create_variants(S3ObjectStore(bucket), original_key)
+    except Exception as e:
+        print(f"❌ Error creating image variants for {original_key}: {e}")
@@ -0,0 +1,48 @@
+import asyncio
+from app.repositories import likes as likes_repo, comments as comments_repo, storage
+from app.utils.fanout import retract_post
+from app.utils.post_keys import split_stored_key
+
+def post_object_keys(post):
+    """Every S3 object belonging to a post (original and variants), grouped as {bucket: [keys]}"""
+    stored_keys = []
+    if post.get("s3Key"):
+        stored_keys.append(post["s3Key"])
+    stored_keys.extend(post.get("variants", {}).values())
+
+    objects = {}
+    for stored_key in stored_keys:
+        bucket, key = split_stored_key(stored_key)
+        objects.setdefault(bucket, []).append(key)
+    return objects
+
+async def delete_post_objects(objects):
+    """Delete a post's objects, one multi-object delete per bucket, returning the keys that failed"""
+    results = await asyncio.gather(*(storage.delete_objects(bucket, keys) for bucket, keys in objects.items()))
+    return [key for failed in results for key in failed]
+
+async def delete_post_data(post):
+    """Remove everything hanging off a deleted post: likes, comments, images and timeline entries"""
+    objects = post_object_keys(post)
+    likes_deleted, comments_deleted, failed_keys, _ = await asyncio.gather(
+        likes_repo.delete_post_likes(post["post_id"]),
+        comments_repo.delete_post_comments(post["post_id"]),
+        delete_post_objects(objects),
+        retract_post(post)
+    )
+
+    summary = {
+        "likes_deleted": likes_deleted,
+        "comments_deleted": comments_deleted,
+        "objects_deleted": sum(len(keys) for keys in objects.values()) - len(failed_keys),
+        "objects_failed": failed_keys
+    }
+    print(f"✅ Cleaned up post {post['post_id']}: {summary}")
+    return summary
+
+async def cleanup_deleted_post(post):
+    """Async stage for delete_post"""
+    try:
+        await delete_post_data(post)
+    except Exception as e:
+        print(f"❌ Error cleaning up post {post['post_id']}: {e}")
@@ -0,0 +1,37 @@
+import re
+from datetime import datetime, timezone
+
+POST_ID_TIME_FORMAT = "%Y%m%dT%H%M%S"
+
+def make_post_id(habit_id, timestamp):
+    """Build the post_id (sort key) for a post made at `timestamp`"""
+    return f"post-{habit_id}-{timestamp.strftime(POST_ID_TIME_FORMAT)}"
+
+def post_id_prefix(habit_id):
+    """Sort key prefix shared by every post of a habit"""
+    return f"post-{habit_id}-"
+
+def parse_post_timestamp(post_id):
+    """Recover the UTC creation time encoded in a post_id, or None if it has none"""
+    try:
+        return datetime.strptime(post_id.rsplit("-", 1)[-1], POST_ID_TIME_FORMAT).replace(tzinfo=timezone.utc)
+    except ValueError:
+        return None
+
+def make_post_key(user_id, habit_id, post_id, filename, timestamp):
+    """Build the S3 key for a post image: {user_id}/{habit_id}/{date}/{post_id}_{filename}"""
+    date_folder = timestamp.strftime("%Y-%m-%d")
+    # Sanitize filename to avoid URL-breaking characters
+    safe_filename = re.sub(r"[^\w.\-]", "_", filename)
+    return f"{user_id}/{habit_id}/{date_folder}/{post_id}_{safe_filename}"
+
+def is_post_key(key, user_id, habit_id, post_id):
+    """Check that an S3 key was issued for this user, habit and post"""
+    if ".." in key or not key.startswith(f"{user_id}/{habit_id}/"):
+        return False
+    return key.rsplit("/", 1)[-1].startswith(f"{post_id}_")
+
+def split_stored_key(stored_key):
+    """Split a post's stored s3Key ("{bucket}/{key}") into (bucket, key)"""
+    bucket, _, key = stored_key.partition("/")
+    return bucket, key
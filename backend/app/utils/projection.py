@@ -0,0 +1,27 @@
+from fastapi import HTTPException
+
+def parse_fields(fields, allowed, always=()):
+    """Turn a comma-separated fields= value into the attribute list to read, or None for full items.
+
+    Unknown attributes are rejected; `always` (keys and the like) is added to every projection.
+    """
+    if not fields:
+        return None
+    requested = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = [field for field in requested if field not in allowed]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(unknown)}; choose from {', '.join(sorted(allowed))}"
+        )
+    return list(dict.fromkeys([*always, *requested]))
+
+def projection_kwargs(attributes):
+    """ProjectionExpression for a query/scan, with placeholders since names like `timestamp` are reserved"""
+    if not attributes:
+        return {}
+    names = {f"#p{i}": attribute for i, attribute in enumerate(attributes)}
+    return {
+        "ProjectionExpression": ", ".join(names),
+        "ExpressionAttributeNames": names
+    }
@@ -0,0 +1,124 @@
+import gzip
+import json
+import os
+from datetime import date, datetime
+from decimal import Decimal
+from fastapi import Request, Response
+from app.utils.etag import compute_etag, etag_matches
+
+# Optional accelerators; each falls back to the standard library or is simply not offered
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+try:
+    import msgpack
+except ImportError:  # pragma: no cover
+    msgpack = None
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPES = ("application/msgpack", "application/x-msgpack")
+
+# Bodies smaller than this aren't worth the CPU to compress
+COMPRESSION_MIN_BYTES = int(os.environ.get("RESPONSE_COMPRESSION_MIN_BYTES", "1024"))
+GZIP_LEVEL = int(os.environ.get("RESPONSE_GZIP_LEVEL", "5"))
+BROTLI_QUALITY = int(os.environ.get("RESPONSE_BROTLI_QUALITY", "4"))
+
+def encode_value(value):
+    """Convert values DynamoDB hands back (Decimal, sets) the same way jsonable_encoder does"""
+    if isinstance(value, Decimal):
+        return int(value) if value.as_tuple().exponent >= 0 else float(value)
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def dumps(payload):
+    """Serialize a payload to compact JSON bytes, with orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(payload, default=encode_value)
+    return json.dumps(
+        payload, default=encode_value, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+
+class FastJSONResponse(Response):
+    """JSONResponse drop-in that renders with dumps()"""
+    media_type = JSON_MEDIA_TYPE
+
+    def render(self, content):
+        return dumps(content)
+
+def _accepted(header):
+    """Parse an Accept/Accept-Encoding header into the set of tokens with a non-zero q"""
+    accepted = set()
+    for part in (header or "").split(","):
+        token, *params = part.split(";")
+        quality = 1.0
+        for param in params:
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if token.strip() and quality > 0:
+            accepted.add(token.strip().lower())
+    return accepted
+
+def choose_media_type(request: Request):
+    """MessagePack for clients that ask for it, JSON otherwise"""
+    if msgpack is not None and _accepted(request.headers.get("accept")) & set(MSGPACK_MEDIA_TYPES):
+        return MSGPACK_MEDIA_TYPES[0]
+    return JSON_MEDIA_TYPE
+
+def choose_encoding(request: Request, size):
+    """Pick br or gzip from Accept-Encoding for bodies above the threshold, else None"""
+    if size < COMPRESSION_MIN_BYTES:
+        return None
+    accepted = _accepted(request.headers.get("accept-encoding"))
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+def render(payload, media_type):
+    """Serialize a payload in the negotiated media type"""
+    if media_type == JSON_MEDIA_TYPE:
+        return dumps(payload)
+    return msgpack.packb(payload, default=encode_value, use_bin_type=True)
+
+def compress(body, encoding):
+    """Compress a body with the negotiated content coding"""
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL)
+
+def negotiated_response(request: Request, payload, status_code=200, headers=None, etag=False):
+    """Serialize, optionally ETag, and compress a payload according to the request's Accept headers"""
+    media_type = choose_media_type(request)
+    body = render(payload, media_type)
+    encoding = choose_encoding(request, len(body))
+    headers = {"Vary": "Accept, Accept-Encoding", **(headers or {})}
+
+    if etag:
+        # Each representation gets its own tag, so a gzip body is never confused with a br one
+        headers["ETag"] = compute_etag(body, encoding)
+        # Clients may keep the body but must revalidate before reusing it
+        headers["Cache-Control"] = "private, no-cache"
+        if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+            return Response(status_code=304, headers=headers)
+
+    if encoding:
+        body = compress(body, encoding)
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, status_code=status_code, media_type=media_type, headers=headers)
+
+def etag_response(request: Request, payload):
+    """Negotiated response with an ETag, or an empty 304 when the client already has this version"""
+    return negotiated_response(request, payload, etag=True)
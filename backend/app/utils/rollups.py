@@ -0,0 +1,61 @@
+# Weekly habit rollups: one compact record per habit per week, written by the weekly reset
+# and read by the analytics endpoint. Shared by the reset Lambda, so it only uses the stdlib.
+
+from datetime import date, timedelta
+
+ROLLUP_TABLE = "hb-habit-rollups-table"
+
+def rollup_key(habit_id, week_start):
+    """Sort key of a rollup in the user's partition: {habit_id}#{week_start}, so a habit's weeks are one key range"""
+    return f"{habit_id}#{week_start}"
+
+def completed_week_range(weeks, today=None):
+    """(from_week, to_week) Mondays of the last `weeks` completed weeks.
+
+    The current week's rollup is only written when it is reset, so the range ends on the previous Monday.
+    """
+    if today is None:
+        today = date.today()
+    to_week = today - timedelta(days=today.weekday(), weeks=1)
+    from_week = to_week - timedelta(weeks=weeks - 1)
+    return from_week.isoformat(), to_week.isoformat()
+
+def make_weekly_rollup(habit, week_start, weekly_posts, streak_after, recorded_at):
+    """Build the rollup for a habit's week from what the reset saw"""
+    cadence = int(habit.get("cadence", 0))
+    in_grace_period = bool(habit.get("is_in_grace_period", True))
+    return {
+        "user_id": habit["user_id"],
+        "rollup_key": rollup_key(habit["habit_id"], week_start),
+        "habit_id": habit["habit_id"],
+        "week_start": week_start,
+        "posts": int(weekly_posts),
+        "cadence": cadence,
+        "met": int(weekly_posts) >= cadence,
+        "in_grace_period": in_grace_period,
+        # The streak the week ended on, before any reset, and what it became
+        "streak": int(habit.get("streak", 0)),
+        "streak_after": int(streak_after),
+        "recorded_at": recorded_at
+    }
+
+def summarize_rollups(rollups):
+    """Trend stats over a habit's rollups (oldest first): completion rate, average posts, best streak"""
+    counted = [rollup for rollup in rollups if not rollup.get("in_grace_period")]
+    posts = [int(rollup["posts"]) for rollup in rollups]
+    return {
+        "weeks_recorded": len(rollups),
+        "completion_rate": round(sum(1 for rollup in counted if rollup["met"]) / len(counted), 3) if counted else None,
+        "avg_posts_per_week": round(sum(posts) / len(posts), 2) if posts else None,
+        "best_streak": max((int(rollup["streak"]) for rollup in rollups), default=0),
+        "weeks": [
+            {
+                "week_start": rollup["week_start"],
+                "posts": int(rollup["posts"]),
+                "cadence": int(rollup["cadence"]),
+                "met": rollup["met"],
+                "streak": int(rollup["streak"])
+            }
+            for rollup in rollups
+        ]
+    }
@@ -1,11 +1,10 @@
 from datetime import datetime, timedelta
-import boto3
-from boto3.dynamodb.conditions import Key
+from botocore.exceptions import ClientError
+from app.utils.aws_clients import get_table
+from app.utils.cache import get_cache, habits_key
 
-# Initialize DynamoDB
-dynamodb = boto3.resource("dynamodb", region_name="us-east-1")
-habit_table = dynamodb.Table("hb-habits-table")
-posts_table = dynamodb.Table("hb-posts-table")
+HABIT_TABLE = "hb-habits-table"
+POSTS_TABLE = "hb-posts-table"
 
 def get_week_start_date(date=None):
     """Get the start date of the week (Monday) for a given date"""
@@ -13,6 +12,19 @@ def get_week_start_date(date=None):
         date = datetime.utcnow()
     return (date - timedelta(days=date.weekday())).replace(hour=0, minute=0, second=0, microsecond=0)
 
+def get_week_key(date=None):
+    """Get the week key (ISO date of the Monday) used for a habit's weekly post counter"""
+    return get_week_start_date(date).date().isoformat()
+
+def get_counted_weekly_posts(habit, week_start):
+    """Read a habit's weekly post count from its counter, or None if it has no counter yet"""
+    if "week_start" not in habit:
+        return None
+    if habit["week_start"] != week_start.date().isoformat():
+        # The counter belongs to an earlier week, so nothing was posted this week
+        return 0
+    return int(habit.get("week_posts", 0))
+
 def is_in_grace_period(habit):
     """Check if a habit is in its grace period"""
     created_at = datetime.fromisoformat(habit.get("created_at"))
@@ -20,17 +32,18 @@ def is_in_grace_period(habit):
     next_week_start = week_start + timedelta(days=7)
     return datetime.utcnow() < next_week_start
 
-def get_weekly_post_count(user_id, habit_id, week_start):
+def get_weekly_post_count(user_id, habit_id, week_start, table=None):
     """Get the number of posts for a habit in a given week"""
     week_end = week_start + timedelta(days=7)
     
-    response = posts_table.query(
-        KeyConditionExpression=Key("user_id").eq(user_id),
+    response = (table or get_table(POSTS_TABLE)).query(
+        KeyConditionExpression="user_id = :uid",
         FilterExpression="habitId = :habit_id AND #ts BETWEEN :week_start AND :week_end",
         ExpressionAttributeNames={
             "#ts": "timestamp"
         },
         ExpressionAttributeValues={
+            ":uid": user_id,
             ":habit_id": habit_id,
             ":week_start": week_start.isoformat(),
             ":week_end": week_end.isoformat()
@@ -39,24 +52,113 @@ def get_weekly_post_count(user_id, habit_id, week_start):
     
     return len(response.get("Items", []))
 
-def increment_habit_streak(user_id, habit_id):
+def get_weekly_post_counts(user_id, week_start, table=None):
+    """Get the number of posts per habitId for all of a user's habits in a given week"""
+    week_end = week_start + timedelta(days=7)
+    query_kwargs = {
+        "KeyConditionExpression": "user_id = :uid",
+        "FilterExpression": "#ts BETWEEN :week_start AND :week_end",
+        "ProjectionExpression": "habitId",
+        "ExpressionAttributeNames": {
+            "#ts": "timestamp"
+        },
+        "ExpressionAttributeValues": {
+            ":uid": user_id,
+            ":week_start": week_start.isoformat(),
+            ":week_end": week_end.isoformat()
+        }
+    }
+
+    counts = {}
+    while True:
+        response = (table or get_table(POSTS_TABLE)).query(**query_kwargs)
+        for post in response.get("Items", []):
+            habit_id = post.get("habitId")
+            counts[habit_id] = counts.get(habit_id, 0) + 1
+        if "LastEvaluatedKey" not in response:
+            return counts
+        query_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+def record_weekly_post(user_id, habit_id, posted_at=None):
+    """Atomically count a post against the habit's counter for the week it was made in.
+
+    Returns the updated habit item, or None if the habit does not exist.
+    """
+    key = {
+        "user_id": user_id,
+        "habit_id": habit_id
+    }
+    week_key = get_week_key(posted_at)
+
+    for _ in range(3):
+        try:
+            # Same week: bump the existing counter
+            response = get_table(HABIT_TABLE).update_item(
+                Key=key,
+                UpdateExpression="ADD week_posts :one",
+                ConditionExpression="week_start = :week_start",
+                ExpressionAttributeValues={
+                    ":one": 1,
+                    ":week_start": week_key
+                },
+                ReturnValues="ALL_NEW",
+                ReturnValuesOnConditionCheckFailure="ALL_OLD"
+            )
+            return response["Attributes"]
+        except ClientError as e:
+            if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                raise
+            habit = e.response.get("Item")
+
+        if habit is None:
+            return None
+
+        # New week, or a habit created before counters existed: start the counter.
+        # Legacy habits are seeded once from the posts table (including this post).
+        old_week_key = habit.get("week_start", {}).get("S")
+        if old_week_key is None:
+            week_posts = get_weekly_post_count(user_id, habit_id, get_week_start_date(posted_at))
+            condition = "attribute_not_exists(week_start)"
+            values = {}
+        elif old_week_key < week_key:
+            week_posts = 1
+            condition = "week_start = :old_week_start"
+            values = {":old_week_start": old_week_key}
+        else:
+            # Post belongs to a week before the one being counted
+            return None
+
+        try:
+            response = get_table(HABIT_TABLE).update_item(
+                Key=key,
+                UpdateExpression="SET week_start = :week_start, week_posts = :posts",
+                ConditionExpression=condition,
+                ExpressionAttributeValues={
+                    ":week_start": week_key,
+                    ":posts": max(week_posts, 1),
+                    **values
+                },
+                ReturnValues="ALL_NEW"
+            )
+            return response["Attributes"]
+        except ClientError as e:
+            # Another post rolled the week over first; retry the ADD
+            if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                raise
+
+    return None
+
+def increment_habit_streak(user_id, habit_id, posted_at=None):
     """Update the streak for a habit based on weekly post count"""
     try:
-        # Get the habit
-        habit_response = habit_table.get_item(
-            Key={
-                "user_id": user_id,
-                "habit_id": habit_id
-            }
-        )
-        
-        if "Item" not in habit_response:
+        # Count the post and get the habit back in the same round trip
+        habit = record_weekly_post(user_id, habit_id, posted_at)
+        get_cache().invalidate(habits_key(user_id))
+
+        if habit is None:
             return False
-            
-        habit = habit_response["Item"]
-            
-        current_week_start = get_week_start_date()
-        weekly_posts = get_weekly_post_count(user_id, habit_id, current_week_start)
+
+        weekly_posts = int(habit.get("week_posts", 0))
         cadence = habit.get("cadence", 0)
         
         # Only update streak if reminder is false (not already incremented)
@@ -64,7 +166,7 @@ def increment_habit_streak(user_id, habit_id):
             new_streak = habit.get("streak", 0) + 1
             
             # Update the habit
-            habit_table.update_item(
+            get_table(HABIT_TABLE).update_item(
                 Key={
                     "user_id": user_id,
                     "habit_id": habit_id
@@ -75,6 +177,7 @@ def increment_habit_streak(user_id, habit_id):
                     ":posts": weekly_posts,
                     ":updated": datetime.utcnow().isoformat()
                 })
+            get_cache().invalidate(habits_key(user_id))
             return True
         else:
             return False
@@ -0,0 +1,109 @@
+"""Cold-start benchmark for the Lambda handler.
+
+Each run starts a fresh interpreter (like a new Lambda container), then measures
+how long `import main` takes and how long the first `handler(event, context)`
+call takes against the recorded API Gateway event in tests/fixtures/.
+
+    python benchmarks/cold_start.py --runs 10
+    python benchmarks/cold_start.py --path /habits --max-import-ms 800
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+EVENT_PATH = os.path.join(BACKEND_DIR, "tests", "fixtures", "api_gateway_event.json")
+
+# Runs inside the fresh interpreter and prints one JSON line of timings
+RUN_ONCE = """
+import json, sys, time
+
+class LambdaContext:
+    function_name = "cold-start-benchmark"
+    function_version = "1"
+    invoked_function_arn = "arn:aws:lambda:us-east-1:123456789012:function:cold-start-benchmark"
+    memory_limit_in_mb = 128
+    aws_request_id = "benchmark-request-id"
+    log_group_name = "/aws/lambda/cold-start-benchmark"
+    log_stream_name = "benchmark"
+
+event = json.loads(sys.argv[1])
+
+start = time.perf_counter()
+from main import handler
+imported = time.perf_counter()
+sdk_loaded = [name for name in ("boto3", "aioboto3") if name in sys.modules]
+response = handler(event, LambdaContext())
+invoked = time.perf_counter()
+
+print(json.dumps({
+    "import_ms": (imported - start) * 1000,
+    "first_invoke_ms": (invoked - imported) * 1000,
+    "status_code": response["statusCode"],
+    "sdk_loaded_at_import": sdk_loaded,
+}))
+"""
+
+def load_event(path, query_string):
+    """Load the recorded API Gateway event, optionally retargeted at another route"""
+    with open(EVENT_PATH) as f:
+        event = json.load(f)
+
+    if path:
+        event["rawPath"] = path
+        event["routeKey"] = f"GET {path}"
+        event["requestContext"]["http"]["path"] = path
+        event["requestContext"]["routeKey"] = f"GET {path}"
+    if query_string is not None:
+        event["rawQueryString"] = query_string
+    return event
+
+def run_once(event):
+    """Run one cold start in a fresh interpreter and return its timings"""
+    result = subprocess.run(
+        [sys.executable, "-c", RUN_ONCE, json.dumps(event)],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    # The app prints its own logs; the timings are the last line
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def summarize(values):
+    return {
+        "median": round(statistics.median(values), 1),
+        "min": round(min(values), 1),
+        "max": round(max(values), 1)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure Lambda cold-start import and first-invocation latency")
+    parser.add_argument("--runs", type=int, default=5, help="Number of fresh interpreters to start")
+    parser.add_argument("--path", default="/", help="Route to invoke (default: / which needs no AWS access)")
+    parser.add_argument("--query", default=None, help="Raw query string for the invoked route")
+    parser.add_argument("--max-import-ms", type=float, default=None, help="Fail if the median import time exceeds this")
+    args = parser.parse_args()
+
+    event = load_event(args.path, args.query)
+    runs = [run_once(event) for _ in range(args.runs)]
+
+    report = {
+        "path": args.path,
+        "runs": args.runs,
+        "status_codes": sorted({run["status_code"] for run in runs}),
+        "sdk_loaded_at_import": sorted({name for run in runs for name in run["sdk_loaded_at_import"]}),
+        "import_ms": summarize([run["import_ms"] for run in runs]),
+        "first_invoke_ms": summarize([run["first_invoke_ms"] for run in runs])
+    }
+    print(json.dumps(report, indent=2))
+
+    if args.max_import_ms is not None and report["import_ms"]["median"] > args.max_import_ms:
+        print(f"❌ Median import time {report['import_ms']['median']}ms exceeds {args.max_import_ms}ms")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,21 @@
 from fastapi import FastAPI
 from mangum import Mangum
+from app.utils.responses import FastJSONResponse
+from app.utils.async_tasks import is_task_event, handle_task_event
 
 # Import routers from organized subdirectories
-from app.routes.habits import habits_router, add_habit_router, get_habit_router, delete_habit_router, update_habit_router
+from app.routes.habits import habits_router, add_habit_router, get_habit_router, delete_habit_router, update_habit_router, habit_calendar_router, habit_analytics_router
 from app.routes.users import create_user_router
 from app.routes.users.get_user import router as get_user_router
-from app.routes.posts import create_post_router, get_posts_router, upload_router, delete_post_router
+from app.routes.users import bootstrap_router
+from app.routes.posts import create_post_router, get_posts_router, upload_router, delete_post_router, presigned_upload_router
 from app.routes.posts.comments import router as comments_router
-from app.routes.likes import like_post_router, get_post_likes_router, check_user_like_router
+from app.routes.likes import like_post_router, get_post_likes_router, check_user_like_router, batch_likes_router
+from app.routes.feed import follow_router, get_feed_router
+from app.routes.admin import cache_stats_router
 
-app = FastAPI()
+# Default responses render with orjson; the large list endpoints also skip jsonable_encoder (see app/utils/responses.py)
+app = FastAPI(default_response_class=FastJSONResponse)
 
 @app.get("/")
 def root():
@@ -19,18 +25,32 @@ def root():
 app.include_router(habits_router)
 app.include_router(create_user_router)
 app.include_router(get_user_router)
+app.include_router(bootstrap_router)
 app.include_router(add_habit_router)
 app.include_router(get_habit_router)
 app.include_router(delete_habit_router)
 app.include_router(update_habit_router)
+app.include_router(habit_calendar_router)
+app.include_router(habit_analytics_router)
 app.include_router(create_post_router)
 app.include_router(get_posts_router)
 app.include_router(upload_router)
 app.include_router(delete_post_router)
 app.include_router(comments_router)
+app.include_router(presigned_upload_router)
 app.include_router(like_post_router)
 app.include_router(get_post_likes_router)
 app.include_router(check_user_like_router)
+app.include_router(batch_likes_router)
+app.include_router(follow_router)
+app.include_router(get_feed_router)
+app.include_router(cache_stats_router)
 
 # AWS Lambda handler
-handler = Mangum(app)
+asgi_handler = Mangum(app)
+
+def handler(event, context):
+    """API Gateway events go to FastAPI; async task events (see app/utils/async_tasks.py) run their task"""
+    if is_task_event(event):
+        return handle_task_event(event)
+    return asgi_handler(event, context)
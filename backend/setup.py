@@ -13,7 +13,11 @@ setup(
         "pydantic-core>=2.0.0",
         "aws-lambda-powertools>=2.0.0",
         "aioboto3>=12.0.0",
-        "python-multipart>=0.0.6"
+        "python-multipart>=0.0.6",
+        "Pillow>=10.0.0",
+        "orjson>=3.8.0",
+        "brotli>=1.0.9",
+        "msgpack>=1.0.0"
     ],
     extras_require={
         "dev": [
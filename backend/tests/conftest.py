@@ -30,44 +30,13 @@ def lambda_context():
 
     return LambdaContext()
 
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
 @pytest.fixture
 def lambda_event() -> Dict[Any, Any]:
-    """Mock API Gateway Lambda event"""
-    return {
-        "version": "2.0",
-        "routeKey": "GET /habits",
-        "rawPath": "/habits",
-        "rawQueryString": "",
-        "headers": {
-            "accept": "*/*",
-            "content-length": "0",
-            "host": "api.example.com",
-            "user-agent": "curl/7.64.1",
-            "x-amzn-trace-id": "Root=1-123456789-123456789",
-            "x-forwarded-for": "127.0.0.1",
-            "x-forwarded-port": "443",
-            "x-forwarded-proto": "https"
-        },
-        "requestContext": {
-            "accountId": "123456789012",
-            "apiId": "api-id",
-            "domainName": "api.example.com",
-            "domainPrefix": "api",
-            "http": {
-                "method": "GET",
-                "path": "/habits",
-                "protocol": "HTTP/1.1",
-                "sourceIp": "127.0.0.1",
-                "userAgent": "curl/7.64.1"
-            },
-            "requestId": "request-id",
-            "routeKey": "GET /habits",
-            "stage": "$default",
-            "time": "14/Mar/2023:05:31:23 +0000",
-            "timeEpoch": 1678774283
-        },
-        "isBase64Encoded": False
-    }
+    """Mock API Gateway Lambda event (recorded in fixtures/, shared with benchmarks/)"""
+    with open(os.path.join(FIXTURES_DIR, "api_gateway_event.json")) as f:
+        return json.load(f)
 
 @pytest.fixture
 def mock_aws_credentials():
@@ -33,4 +33,48 @@ def test_invalid_routes(api_client: TestClient, http_method, endpoint):
     """Test invalid routes and methods"""
     method = getattr(api_client, http_method)
     response = method(endpoint)
-    assert response.status_code in [404, 405]  # Either not found or method not allowed
\ No newline at end of file
+    assert response.status_code in [404, 405]  # Either not found or method not allowed
+
+
+def test_create_upload_url_rejects_heic(api_client: TestClient):
+    """Test that uploads Pillow can't decode (and so can't get variants) are refused"""
+    response = api_client.post("/create_upload_url?user_id=123&habit_id=h1&filename=a.heic&content_type=image/heic")
+    assert response.status_code == 400
+
+def test_like_post_requires_author_id(api_client: TestClient):
+    """Test that /like_post rejects likes that couldn't update the post's like_count"""
+    response = api_client.post("/like_post?post_id=post-1&user_id=123")
+    assert response.status_code == 422
+
+def test_batch_post_likes_requires_posts(api_client: TestClient):
+    """Test the /batch_post_likes endpoint when posts is missing"""
+    response = api_client.get("/batch_post_likes?user_id=123")
+    assert response.status_code == 422
+
+def test_batch_post_likes_needs_author_with_each_post(api_client: TestClient):
+    """Test that posts without their author (whose post holds like_count) are rejected"""
+    response = api_client.get("/batch_post_likes?user_id=123&posts=post-1")
+    assert response.status_code == 400
+
+def test_batch_post_likes_rejects_oversized_batch(api_client: TestClient):
+    """Test that /batch_post_likes caps the number of posts per request"""
+    query = "&".join(f"posts=author:post-{i}" for i in range(101))
+    response = api_client.get(f"/batch_post_likes?user_id=123&{query}")
+    assert response.status_code == 400
+
+def test_create_reply_requires_parent_sort_key(api_client: TestClient):
+    """Test that replies must name their parent's key instead of making the server search for it"""
+    response = api_client.post("/create_comment", json={"post_id": "post-1", "user_id": "123", "text": "hi", "parent_id": "c1"})
+    assert response.status_code == 400
+
+def test_get_replies_rejects_cursor_from_another_thread(api_client: TestClient):
+    """Test that a reply cursor can't be replayed against a different comment"""
+    from app.utils.pagination import encode_cursor
+    cursor = encode_cursor({"post_id": "post-1", "sort_key": "REPLY#other#2025-01-01T00:00:00"})
+    response = api_client.get(f"/get_replies/post-1/parent?cursor={cursor}")
+    assert response.status_code == 400
+
+def test_bootstrap_rejects_unknown_sections(api_client: TestClient):
+    """Test that /bootstrap validates the requested sections"""
+    response = api_client.get("/bootstrap?user_id=123&include=user,settings")
+    assert response.status_code == 400
@@ -0,0 +1,139 @@
+from decimal import Decimal
+from fastapi.testclient import TestClient
+import main
+from app.repositories import follows as follows_repo, posts as posts_repo, storage
+from app.routes.posts import create_post as create_post_module
+from app.utils import async_tasks, fanout
+
+def record_invokes(monkeypatch, function_name="habit-api"):
+    """Pretend to be deployed: tasks are queued as async invokes, recorded here"""
+    invokes = []
+    async def invoke_task(function, name, args):
+        invokes.append((function, name, list(args)))
+    monkeypatch.setattr(async_tasks, "ASYNC_TASK_FUNCTION", function_name)
+    monkeypatch.setattr(async_tasks, "invoke_task", invoke_task)
+    return invokes
+
+def record_task(monkeypatch, name):
+    """Replace a task's coroutine with one that records its calls"""
+    calls = []
+    async def task(*args):
+        calls.append(list(args))
+    monkeypatch.setattr(fanout, name, task)
+    return calls
+
+def stub_follow(monkeypatch):
+    async def follow(user_id, followee_id, followed_at):
+        return None
+    async def unfollow(user_id, followee_id):
+        return None
+    monkeypatch.setattr(follows_repo, "follow", follow)
+    monkeypatch.setattr(follows_repo, "unfollow", unfollow)
+
+def test_follow_queues_backfill_instead_of_running_it(monkeypatch):
+    """Test that on Lambda /follow returns without running the timeline backfill itself"""
+    stub_follow(monkeypatch)
+    invokes = record_invokes(monkeypatch)
+    backfills = record_task(monkeypatch, "backfill_timeline")
+
+    response = TestClient(main.app).post("/follow?user_id=u1&followee_id=u2")
+
+    assert response.status_code == 200
+    assert invokes == [("habit-api", "backfill_timeline", ["u1", "u2"])]
+    assert backfills == []
+
+def test_follow_runs_backfill_after_response_locally(monkeypatch):
+    """Test that without a task function (uvicorn) the backfill is a BackgroundTask"""
+    stub_follow(monkeypatch)
+    monkeypatch.setattr(async_tasks, "ASYNC_TASK_FUNCTION", None)
+    backfills = record_task(monkeypatch, "backfill_timeline")
+
+    response = TestClient(main.app).post("/follow?user_id=u1&followee_id=u2")
+
+    assert response.status_code == 200
+    assert backfills == [["u1", "u2"]]
+
+def test_create_post_queues_publish(monkeypatch):
+    """Test that /create_post hands variants and fan-out to the task worker"""
+    async def upload_fileobj(file, bucket, key, content_type=None):
+        return None
+    async def put_post(item, only_if_new=False):
+        return True
+    monkeypatch.setattr(storage, "upload_fileobj", upload_fileobj)
+    monkeypatch.setattr(posts_repo, "put_post", put_post)
+    monkeypatch.setattr(create_post_module, "increment_habit_streak", lambda *args, **kwargs: True)
+    invokes = record_invokes(monkeypatch)
+    published = record_task(monkeypatch, "publish_post")
+
+    response = TestClient(main.app).post(
+        "/create_post?user_id=u1&habit_id=h1",
+        files={"file": ("proof.jpg", b"jpeg-bytes", "image/jpeg")}
+    )
+
+    assert response.status_code == 200
+    (function, name, args), = invokes
+    assert name == "publish_post"
+    assert args[:3] == ["u1", response.json()["post_id"], storage.POSTS_BUCKET]
+    assert published == []
+
+def test_queue_failure_falls_back_to_in_process(monkeypatch):
+    """Test that a failed invoke still gets the work done after the response"""
+    stub_follow(monkeypatch)
+    async def invoke_task(function, name, args):
+        raise RuntimeError("throttled")
+    monkeypatch.setattr(async_tasks, "ASYNC_TASK_FUNCTION", "habit-api")
+    monkeypatch.setattr(async_tasks, "invoke_task", invoke_task)
+    purges = record_task(monkeypatch, "purge_author")
+
+    response = TestClient(main.app).delete("/unfollow?user_id=u1&followee_id=u2")
+
+    assert response.status_code == 200
+    assert purges == [["u1", "u2"]]
+
+def test_handler_runs_task_events(monkeypatch):
+    """Test that the Lambda handler runs task events instead of passing them to Mangum"""
+    purges = record_task(monkeypatch, "purge_author")
+    event = async_tasks.task_event("purge_author", ["u1", "u2"])
+
+    assert main.handler(event, None) == {"task": "purge_author", "status": "done"}
+    assert purges == [["u1", "u2"]]
+
+def test_task_event_arguments_are_json():
+    """Test that DynamoDB values in task arguments are converted for the invoke payload"""
+    event = async_tasks.task_event("publish_post", [{"like_count": Decimal(3)}])
+
+    assert event == {"async_task": "publish_post", "args": [{"like_count": 3}]}
+
+def test_delete_post_queues_cleanup(monkeypatch):
+    """Test that /delete_post returns once the post is gone and queues the rest of the cleanup"""
+    post = {"user_id": "u1", "post_id": "post-h1-20250101T090000", "s3Key": "b/k.jpg", "like_count": Decimal(2)}
+    deleted = []
+    async def get_post(user_id, post_id):
+        return post
+    async def delete_post(user_id, post_id):
+        deleted.append(post_id)
+    monkeypatch.setattr(posts_repo, "get_post", get_post)
+    monkeypatch.setattr(posts_repo, "delete_post", delete_post)
+    invokes = record_invokes(monkeypatch)
+
+    response = TestClient(main.app).request(
+        "DELETE", "/delete_post", json={"user_id": "u1", "post_id": post["post_id"]}
+    )
+
+    assert response.status_code == 200
+    assert deleted == [post["post_id"]]
+    assert [(name, args[0]["post_id"]) for _, name, args in invokes] == [("cleanup_deleted_post", post["post_id"])]
+
+def test_upload_queues_variants(monkeypatch):
+    """Test that /upload returns the variant URLs without resizing the image itself"""
+    async def upload_fileobj(file, bucket, key, content_type=None):
+        return None
+    monkeypatch.setattr(storage, "upload_fileobj", upload_fileobj)
+    invokes = record_invokes(monkeypatch)
+
+    response = TestClient(main.app).post("/upload?user_id=u1", files={"file": ("a.png", b"png-bytes", "image/png")})
+
+    assert response.status_code == 200
+    (_, name, args), = invokes
+    assert name == "process_upload_image"
+    assert args == [storage.UPLOADS_BUCKET, response.json()["file_url"].split(".amazonaws.com/")[1]]
@@ -0,0 +1,74 @@
+import os
+import subprocess
+import sys
+import threading
+import pytest
+from app.utils import aws_clients
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+class FakeResource:
+    def Table(self, name):
+        return (self, name)
+
+class FakeSession:
+    """boto3 session stand-in that counts the resources it creates"""
+    def __init__(self):
+        self.resources = 0
+
+    def resource(self, service, config=None):
+        self.resources += 1
+        return FakeResource()
+
+@pytest.fixture
+def session(monkeypatch):
+    """Give each test a fresh session and no per-thread resources"""
+    session = FakeSession()
+    monkeypatch.setattr(aws_clients, "get_session", lambda: session)
+    monkeypatch.setattr(aws_clients, "_thread_local", threading.local())
+    return session
+
+def test_resource_is_reused_on_the_same_thread(session):
+    """Test that a thread keeps one DynamoDB resource and one handle per table"""
+    assert aws_clients.get_dynamodb() is aws_clients.get_dynamodb()
+    assert aws_clients.get_table("hb-posts-table") is aws_clients.get_table("hb-posts-table")
+    assert session.resources == 1
+
+def test_each_thread_gets_its_own_resource(session):
+    """Test that resources, which are not thread safe, are never shared between threads"""
+    main_resource = aws_clients.get_dynamodb()
+    resources = []
+    threads = [threading.Thread(target=lambda: resources.append(aws_clients.get_dynamodb())) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert session.resources == 3
+    assert len({id(resource) for resource in resources + [main_resource]}) == 3
+
+def test_client_config_reads_environment():
+    """Test that pooling, retry and timeout settings come from the environment"""
+    env = dict(
+        os.environ,
+        AWS_REGION="eu-west-1",
+        AWS_MAX_POOL_CONNECTIONS="20",
+        AWS_MAX_ATTEMPTS="3",
+        AWS_CONNECT_TIMEOUT="1.5",
+        AWS_READ_TIMEOUT="4"
+    )
+    script = (
+        "from app.utils.aws_clients import get_client_config; c = get_client_config(); "
+        "print(c.region_name, c.max_pool_connections, c.retries, c.connect_timeout, c.read_timeout, c.tcp_keepalive)"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    assert result.stdout.strip().splitlines()[-1] == (
+        "eu-west-1 20 {'mode': 'adaptive', 'max_attempts': 3} 1.5 4.0 True"
+    )
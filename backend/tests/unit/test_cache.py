@@ -0,0 +1,82 @@
+import asyncio
+from app.utils.cache import LRUCache, InMemorySharedBackend, ReadThroughCache
+
+def run(coro):
+    """Run a coroutine on a private loop (asyncio.run would unset the main thread's loop)"""
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def make_loader(value):
+    calls = []
+    async def loader():
+        calls.append(1)
+        return value
+    return loader, calls
+
+def test_lru_evicts_least_recently_used_and_expires():
+    """Test that the local tier is bounded and honours its TTL"""
+    clock = FakeClock()
+    cache = LRUCache(max_entries=2, ttl=10, clock=clock)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") == (False, None)
+    assert cache.get("a") == (True, 1)
+    assert cache.evictions == 1
+
+    clock.now = 11
+    assert cache.get("a") == (False, None)
+
+def test_read_through_counts_hits_and_invalidates():
+    """Test that a miss loads once, later reads hit, and invalidation forces a reload"""
+    cache = ReadThroughCache(local=LRUCache(max_entries=10, ttl=30), enabled=True)
+    loader, calls = make_loader({"user_id": "u1", "habits": ["h1"]})
+
+    first = run(cache.get_or_load("user:u1", loader))
+    first["habits"].append("mutated")
+    second = run(cache.get_or_load("user:u1", loader))
+    cache.invalidate("user:u1")
+    run(cache.get_or_load("user:u1", loader))
+
+    assert second == {"user_id": "u1", "habits": ["h1"]}
+    assert len(calls) == 2
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 2
+
+def test_shared_tier_serves_other_containers():
+    """Test that a second container fills its local tier from the shared stand-in"""
+    shared = InMemorySharedBackend()
+    writer = ReadThroughCache(local=LRUCache(), shared=shared, enabled=True)
+    reader = ReadThroughCache(local=LRUCache(), shared=shared, enabled=True)
+    loader, calls = make_loader([{"habit_id": "h1"}])
+
+    run(writer.get_or_load("habits:u1", loader))
+    assert run(reader.get_or_load("habits:u1", loader)) == [{"habit_id": "h1"}]
+    assert len(calls) == 1
+    assert reader.stats()["shared_hits"] == 1
+
+    writer.invalidate("habits:u1")
+    assert shared.get("habits:u1") == (False, None)
+
+def test_load_racing_a_write_is_not_cached():
+    """Test that a value read before an invalidation isn't stored afterwards"""
+    cache = ReadThroughCache(local=LRUCache(), enabled=True)
+
+    async def stale_loader():
+        cache.invalidate("user:u1")  # a write lands while the read is in flight
+        return {"version": "old"}
+
+    run(cache.get_or_load("user:u1", stale_loader))
+    assert cache.local.get("user:u1") == (False, None)
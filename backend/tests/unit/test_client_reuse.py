@@ -0,0 +1,76 @@
+import asyncio
+import contextlib
+import pytest
+from app.repositories import base
+
+def run(coro, loop=None):
+    """Run a coroutine on a private loop (asyncio.run would unset the main thread's loop)"""
+    if loop is not None:
+        return loop.run_until_complete(coro)
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+@pytest.fixture
+def opened(monkeypatch):
+    """Start each test with no cached clients"""
+    monkeypatch.setattr(base, "_opened", {})
+    return base._opened
+
+def fake_factory():
+    """A factory of client stand-ins that records how many were opened and closed"""
+    counts = {"opened": 0, "closed": 0}
+
+    @contextlib.asynccontextmanager
+    async def factory():
+        counts["opened"] += 1
+        try:
+            yield object()
+        finally:
+            counts["closed"] += 1
+
+    return factory, counts
+
+def test_client_is_reused_on_the_same_loop(opened):
+    """Test that repeated and concurrent opens on one loop share a single client"""
+    factory, counts = fake_factory()
+
+    async def open_many():
+        first = await base._open("dynamodb", factory)
+        rest = await asyncio.gather(*(base._open("dynamodb", factory) for _ in range(3)))
+        return first, rest
+
+    first, rest = run(open_many())
+
+    assert all(client is first for client in rest)
+    assert counts["opened"] == 1
+
+def test_new_loop_gets_its_own_client(opened):
+    """Test that a client is never handed to a loop other than the one it was opened on"""
+    factory, counts = fake_factory()
+    loop = asyncio.new_event_loop()
+    try:
+        first = run(base._open("dynamodb", factory), loop)
+        second = run(base._open("dynamodb", factory))
+        assert second is not first
+        assert run(base._open("dynamodb", factory), loop) is first
+        assert counts["opened"] == 2
+    finally:
+        loop.close()
+
+def test_clients_of_closed_loops_are_evicted(opened):
+    """Test that opening a client drops the ones left behind by loops that have closed"""
+    factory, counts = fake_factory()
+    run(base._open("dynamodb", factory))
+    stale = next(iter(opened))
+    assert stale.is_closed()
+
+    loop = asyncio.new_event_loop()
+    try:
+        run(base._open("dynamodb", factory), loop)
+        assert list(opened) == [loop]
+        assert stale not in opened
+    finally:
+        loop.close()
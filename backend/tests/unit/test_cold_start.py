@@ -0,0 +1,16 @@
+import os
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+def test_importing_app_defers_aws_sdks():
+    """Test that importing main doesn't load boto3/aioboto3 before the first AWS call"""
+    result = subprocess.run(
+        [sys.executable, "-c", "import sys, main; print(sorted(m for m in ('boto3', 'aioboto3') if m in sys.modules))"],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    assert result.stdout.strip().splitlines()[-1] == "[]"
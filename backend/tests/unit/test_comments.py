@@ -0,0 +1,65 @@
+import asyncio
+from decimal import Decimal
+from app.repositories import comments as comments_repo
+from app.routes.posts.comments import expand_comment
+
+def run(coro):
+    """Run a coroutine on a private loop (asyncio.run would unset the main thread's loop)"""
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+def comment_item(**extra):
+    return {
+        "post_id": "post-1",
+        "sort_key": "COMMENT#2025-03-10T12:00:00",
+        "comment_id": "c1",
+        "user_id": "u1",
+        "text": "Nice",
+        "timestamp": "2025-03-10T12:00:00",
+        **extra
+    }
+
+def record_reply_queries(monkeypatch):
+    calls = []
+    async def query_replies(post_id, parent_id, limit, exclusive_start_key=None):
+        calls.append((post_id, parent_id, limit))
+        return [comment_item(comment_id="r1", sort_key="REPLY#c1#2025-03-10T13:00:00")], {"post_id": "post-1"}
+    monkeypatch.setattr(comments_repo, "query_replies", query_replies)
+    return calls
+
+def test_reply_count_is_read_from_the_comment(monkeypatch):
+    """Test that the stored reply_count is returned and only the reply preview is queried"""
+    calls = record_reply_queries(monkeypatch)
+
+    comment = run(expand_comment("post-1", comment_item(reply_count=Decimal(7)), 3))
+
+    assert comment["reply_count"] == 7
+    assert [reply["id"] for reply in comment["replies"]] == ["r1"]
+    assert comment["replies_next_cursor"] is not None
+    assert calls == [("post-1", "c1", 3)]
+
+def test_comments_without_replies_need_no_query(monkeypatch):
+    """Test that a zero reply_count, or no preview, skips the replies query"""
+    calls = record_reply_queries(monkeypatch)
+
+    assert run(expand_comment("post-1", comment_item(reply_count=Decimal(0)), 3))["replies"] == []
+    assert run(expand_comment("post-1", comment_item(reply_count=Decimal(2)), 0))["reply_count"] == 2
+    assert calls == []
+
+def test_reply_and_parent_count_are_one_transaction(monkeypatch):
+    """Test that a reply is written straight to its parent's key, checked against the parent's id"""
+    calls = []
+    async def transact_write(transact_items):
+        calls.append(transact_items)
+    monkeypatch.setattr(comments_repo, "transact_write", transact_write)
+
+    reply = comment_item(comment_id="r1", sort_key="REPLY#c1#2025-03-10T13:00:00", parent_id="c1")
+    run(comments_repo.put_reply(reply, "COMMENT#2025-03-10T12:00:00"))
+
+    put, update = calls[0]
+    assert put["Put"]["Item"]["sort_key"] == {"S": "REPLY#c1#2025-03-10T13:00:00"}
+    assert update["Update"]["Key"] == {"post_id": {"S": "post-1"}, "sort_key": {"S": "COMMENT#2025-03-10T12:00:00"}}
+    assert update["Update"]["ExpressionAttributeValues"] == {":one": {"N": "1"}, ":parent_id": {"S": "c1"}}
@@ -0,0 +1,39 @@
+from decimal import Decimal
+from fastapi import Request
+from app.utils.etag import compute_etag, etag_matches
+from app.utils.responses import dumps, etag_response
+
+def make_request(if_none_match=None):
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+def test_etag_is_stable_for_equal_content():
+    """Test that equal payloads get equal ETags, including DynamoDB Decimals"""
+    first = dumps({"habits": [{"streak": Decimal("3")}]})
+    second = dumps({"habits": [{"streak": Decimal("3")}]})
+    changed = dumps({"habits": [{"streak": Decimal("4")}]})
+
+    assert compute_etag(first) == compute_etag(second)
+    assert compute_etag(first) != compute_etag(changed)
+    assert compute_etag(first, "gzip") != compute_etag(first)
+
+def test_if_none_match_parsing():
+    """Test list, weak and wildcard forms of If-None-Match"""
+    assert etag_matches('"abc"', '"abc"')
+    assert etag_matches('"x", W/"abc"', '"abc"')
+    assert etag_matches("*", '"abc"')
+    assert not etag_matches('"other"', '"abc"')
+    assert not etag_matches(None, '"abc"')
+
+def test_matching_etag_returns_empty_304():
+    """Test that a client holding the current version gets a 304 with no body"""
+    payload = {"habits": []}
+    fresh = etag_response(make_request(), payload)
+    etag = fresh.headers["etag"]
+
+    cached = etag_response(make_request(etag), payload)
+
+    assert fresh.status_code == 200
+    assert cached.status_code == 304
+    assert cached.body == b""
+    assert cached.headers["etag"] == etag
@@ -0,0 +1,23 @@
+from app.utils.fanout import make_timeline_entry, timeline_entry_id
+
+def make_post(user_id, post_id, timestamp, **extra):
+    return {"user_id": user_id, "post_id": post_id, "habitId": "h1", "timestamp": timestamp, "s3Key": "b/k.jpg", **extra}
+
+def test_timeline_entries_sort_by_time_across_authors():
+    """Test that entry ids order a follower's timeline by post time, whoever posted"""
+    older = make_post("zoe", "post-h1-20250101T090000", "2025-01-01T09:00:00+00:00")
+    newer = make_post("adam", "post-h1-20250101T100000", "2025-01-01T10:00:00+00:00")
+
+    assert timeline_entry_id(newer) > timeline_entry_id(older)
+
+def test_timeline_entry_is_keyed_by_recipient():
+    """Test that entries live in the recipient's partition and keep the author and variants"""
+    post = make_post("author", "post-h1-20250101T090000", "2025-01-01T09:00:00+00:00", variants={"thumb": "b/t.webp"})
+
+    entry = make_timeline_entry("follower", post)
+
+    assert entry["user_id"] == "follower"
+    assert entry["author_id"] == "author"
+    assert entry["entry_id"] == timeline_entry_id(post)
+    assert entry["variants"] == {"thumb": "b/t.webp"}
+    assert entry["expires_at"] > 0
@@ -0,0 +1,57 @@
+import asyncio
+from app.repositories import posts as posts_repo
+from app.utils import habit_cleanup
+
+def run(coro):
+    """Run a coroutine on a private loop (asyncio.run would unset the main thread's loop)"""
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+class FakePostsTable:
+    """Posts table stand-in that records queries and returns one habit's posts"""
+    def __init__(self, items):
+        self.items = items
+        self.calls = []
+
+    async def query(self, **kwargs):
+        self.calls.append(kwargs)
+        return {"Items": self.items}
+
+def test_habit_posts_are_read_by_post_id_prefix(monkeypatch):
+    """Test that the cascade reads only the habit's key range, not the user's whole partition"""
+    table = FakePostsTable([{"user_id": "u1", "post_id": "post-h1-20250310T120000", "habitId": "h1"}])
+    async def get_table(name):
+        return table
+    monkeypatch.setattr(posts_repo, "get_table", get_table)
+
+    posts, last_evaluated_key = run(posts_repo.query_habit_posts("u1", "h1", 100))
+
+    query = table.calls[0]
+    assert query["KeyConditionExpression"] == "user_id = :uid AND begins_with(post_id, :prefix)"
+    assert query["ExpressionAttributeValues"][":prefix"] == "post-h1-"
+    assert query["ExpressionAttributeValues"][":hid"] == "h1"
+    assert [post["post_id"] for post in posts] == ["post-h1-20250310T120000"]
+    assert last_evaluated_key is None
+
+def test_delete_habit_posts_page_uses_habit_query(monkeypatch):
+    """Test that a cascade page deletes what the habit query returned"""
+    post = {"user_id": "u1", "post_id": "post-h1-20250310T120000", "habitId": "h1"}
+    deleted = []
+    async def query_habit_posts(user_id, habit_id, limit, exclusive_start_key=None):
+        return [post], {"user_id": "u1", "post_id": post["post_id"]}
+    async def delete_post_children(item):
+        return None
+    async def delete_posts(keys):
+        deleted.extend(keys)
+    monkeypatch.setattr(posts_repo, "query_habit_posts", query_habit_posts)
+    monkeypatch.setattr(posts_repo, "delete_posts", delete_posts)
+    monkeypatch.setattr(habit_cleanup, "delete_post_children", delete_post_children)
+
+    posts_deleted, last_evaluated_key = run(habit_cleanup.delete_habit_posts_page("u1", "h1"))
+
+    assert posts_deleted == 1
+    assert deleted == [{"user_id": "u1", "post_id": post["post_id"]}]
+    assert last_evaluated_key == {"user_id": "u1", "post_id": post["post_id"]}
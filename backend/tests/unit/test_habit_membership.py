@@ -0,0 +1,16 @@
+from app.repositories.users import get_habit_ids, habit_membership_update
+
+def test_habit_ids_merge_set_and_legacy_list():
+    """Test that users part-way through the migration report every habit once"""
+    user = {"user_id": "u1", "habit_ids": {"h2", "h3"}, "habits": ["h1", "h2"]}
+
+    assert get_habit_ids(user) == ["h1", "h2", "h3"]
+    assert get_habit_ids({"user_id": "u2"}) == []
+
+def test_membership_update_is_an_atomic_set_change():
+    """Test that membership changes are set ADD/DELETE guarded against legacy users"""
+    update = habit_membership_update("u1", "h1", "DELETE")["Update"]
+
+    assert update["UpdateExpression"] == "DELETE #habits :habit_ids"
+    assert update["ExpressionAttributeValues"] == {":habit_ids": {"SS": ["h1"]}}
+    assert "attribute_not_exists(#legacy)" in update["ConditionExpression"]
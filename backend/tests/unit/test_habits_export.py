@@ -0,0 +1,145 @@
+import asyncio
+import json
+import pytest
+from decimal import Decimal
+from fastapi.testclient import TestClient
+import main
+from app.repositories import habits as habits_repo, storage
+from app.routes.habits import habits as habits_route
+from app.routes.habits.habits import stream_habits_ndjson
+from app.utils import async_tasks
+from app.utils.habits_export import export_habits
+
+def run(coro):
+    """Run a coroutine on a private loop (asyncio.run would unset the main thread's loop)"""
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+class FakeHabitsTable:
+    """Habits table stand-in serving two pages per scan segment"""
+    async def scan(self, **kwargs):
+        segment = kwargs.get("Segment", 0)
+        page = 1 if "ExclusiveStartKey" in kwargs else 0
+        response = {"Items": [{"habit_id": f"s{segment}-p{page}", "streak": Decimal(page)}]}
+        if page == 0:
+            response["LastEvaluatedKey"] = {"habit_id": f"s{segment}-p0"}
+        return response
+
+def use_fake_table(monkeypatch):
+    async def get_table(name):
+        return FakeHabitsTable()
+    monkeypatch.setattr(habits_repo, "get_table", get_table)
+
+async def collect(stream):
+    return b"".join([chunk async for chunk in stream])
+
+def test_ndjson_export_follows_every_page(monkeypatch):
+    """Test that the export writes one line per habit across all pages"""
+    use_fake_table(monkeypatch)
+
+    lines = run(collect(stream_habits_ndjson(1))).splitlines()
+
+    assert [json.loads(line) for line in lines] == [
+        {"habit_id": "s0-p0", "streak": 0},
+        {"habit_id": "s0-p1", "streak": 1}
+    ]
+
+def test_parallel_segments_cover_the_table(monkeypatch):
+    """Test that a segmented scan returns every segment's pages exactly once"""
+    use_fake_table(monkeypatch)
+
+    lines = run(collect(stream_habits_ndjson(3))).splitlines()
+
+    assert sorted(json.loads(line)["habit_id"] for line in lines) == [
+        f"s{segment}-p{page}" for segment in range(3) for page in range(2)
+    ]
+
+def test_export_to_s3_writes_every_line(monkeypatch):
+    """Test that the Lambda export uploads the same lines the stream would send"""
+    use_fake_table(monkeypatch)
+    uploads = {}
+    async def upload_chunks(chunks, bucket, key, content_type=None):
+        uploads[(bucket, key)] = b"".join([chunk async for chunk in chunks])
+        return len(uploads[(bucket, key)])
+    monkeypatch.setattr(storage, "upload_chunks", upload_chunks)
+
+    run(export_habits("habits/test.ndjson", 1))
+
+    body = uploads[(storage.EXPORTS_BUCKET, "habits/test.ndjson")]
+    assert [json.loads(line)["habit_id"] for line in body.splitlines()] == ["s0-p0", "s0-p1"]
+
+def test_ndjson_on_lambda_returns_export_url(monkeypatch):
+    """Test that on Lambda the route queues the export instead of buffering it in the response"""
+    invokes = []
+    async def invoke_task(function, name, args):
+        invokes.append((name, list(args)))
+    async def create_presigned_get(bucket, key, expires_in):
+        return f"https://{bucket}.s3.amazonaws.com/{key}?signed"
+    monkeypatch.setattr(habits_route, "EXPORT_TO_S3", True)
+    monkeypatch.setattr(async_tasks, "ASYNC_TASK_FUNCTION", "habit-api")
+    monkeypatch.setattr(async_tasks, "invoke_task", invoke_task)
+    monkeypatch.setattr(storage, "create_presigned_get", create_presigned_get)
+
+    response = TestClient(main.app).get("/habits?format=ndjson&segments=4")
+
+    assert response.status_code == 202
+    body = response.json()
+    assert invokes == [("export_habits", [body["key"], 4])]
+    assert body["url"].startswith(f"https://{storage.EXPORTS_BUCKET}.s3.amazonaws.com/{body['key']}")
+
+class FakeS3:
+    """Records multipart upload calls"""
+    def __init__(self):
+        self.parts = []
+        self.completed = None
+        self.aborted = False
+
+    async def create_multipart_upload(self, **kwargs):
+        return {"UploadId": "u1"}
+
+    async def upload_part(self, **kwargs):
+        self.parts.append(kwargs["Body"])
+        return {"ETag": f"etag-{kwargs['PartNumber']}"}
+
+    async def complete_multipart_upload(self, **kwargs):
+        self.completed = kwargs["MultipartUpload"]["Parts"]
+
+    async def abort_multipart_upload(self, **kwargs):
+        self.aborted = True
+
+def use_fake_s3(monkeypatch, chunksize):
+    s3 = FakeS3()
+    async def get_s3_client():
+        return s3
+    monkeypatch.setattr(storage, "get_s3_client", get_s3_client)
+    monkeypatch.setattr(storage, "MULTIPART_CHUNKSIZE", chunksize)
+    return s3
+
+async def chunks(*items, error=None):
+    for item in items:
+        yield item
+    if error:
+        raise error
+
+def test_upload_chunks_buffers_parts(monkeypatch):
+    """Test that chunks are grouped into parts of at least the chunk size, in order"""
+    s3 = use_fake_s3(monkeypatch, 4)
+
+    size = run(storage.upload_chunks(chunks(b"ab", b"cd", b"ef", b"g"), "bucket", "key"))
+
+    assert size == 7
+    assert s3.parts == [b"abcd", b"efg"]
+    assert s3.completed == [{"ETag": "etag-1", "PartNumber": 1}, {"ETag": "etag-2", "PartNumber": 2}]
+
+def test_upload_chunks_aborts_on_error(monkeypatch):
+    """Test that a failing source aborts the upload rather than leaving a partial object"""
+    s3 = use_fake_s3(monkeypatch, 4)
+
+    with pytest.raises(RuntimeError):
+        run(storage.upload_chunks(chunks(b"ab", error=RuntimeError("scan failed")), "bucket", "key"))
+
+    assert s3.aborted is True
+    assert s3.completed is None
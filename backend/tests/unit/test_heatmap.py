@@ -0,0 +1,26 @@
+from datetime import date, datetime, timezone
+from app.utils.heatmap import day_range_utc, post_id_range, bucket_post_ids, total_per_day
+from app.utils.post_keys import make_post_id
+
+def post_at(habit_id, *args):
+    return make_post_id(habit_id, datetime(*args, tzinfo=timezone.utc))
+
+def test_key_range_covers_whole_local_days():
+    """Test that the sort key bounds span the local days, shifted by the UTC offset"""
+    start, end = day_range_utc(date(2025, 3, 1), date(2025, 3, 2), utc_offset_minutes=-300)
+
+    assert post_id_range("h1", start, end) == ("post-h1-20250301T050000", "post-h1-20250303T045959")
+
+def test_posts_are_bucketed_per_local_day():
+    """Test one-pass bucketing, including a late-evening post that is the next day in UTC"""
+    start, end = day_range_utc(date(2025, 3, 1), date(2025, 3, 3), utc_offset_minutes=-300)
+    post_ids = {
+        "h1": [post_at("h1", 2025, 3, 1, 12, 0), post_at("h1", 2025, 3, 2, 3, 30), post_at("h1", 2025, 3, 3, 9, 0)],
+        "h2": [post_at("h2", 2025, 3, 3, 23, 0), "legacy-post-without-time"]
+    }
+
+    counts = bucket_post_ids(post_ids, start, 3)
+
+    assert counts == {"h1": [2, 0, 1], "h2": [0, 0, 1]}
+    assert total_per_day(counts, 3) == [2, 0, 2]
+    assert total_per_day({}, 3) == [0, 0, 0]
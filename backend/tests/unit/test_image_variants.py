@@ -0,0 +1,58 @@
+import asyncio
+import io
+import pytest
+from app.utils.image_variants import (
+    InMemoryObjectStore,
+    FileSystemObjectStore,
+    VARIANT_CONTENT_TYPE,
+    create_variants,
+    variant_key
+)
+
+Image = pytest.importorskip("PIL.Image")
+
+ORIGINAL_KEY = "user-1/habit-1/2025-03-12/post-habit-1-20250312T083015_photo.jpg"
+
+def run(coro):
+    """Run a coroutine on a private loop (asyncio.run would unset the main thread's loop)"""
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+def make_jpeg(width, height):
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, height), (200, 80, 40)).save(buffer, "JPEG")
+    return buffer.getvalue()
+
+def test_variant_key_sits_next_to_original():
+    """Test that variants live under the original's prefix so prefix deletes catch them"""
+    assert variant_key(ORIGINAL_KEY, "thumb") == (
+        "user-1/habit-1/2025-03-12/variants/post-habit-1-20250312T083015_photo_thumb.webp"
+    )
+
+def test_create_variants_in_memory():
+    """Test that thumbnails are square crops and medium keeps the aspect ratio"""
+    store = InMemoryObjectStore({ORIGINAL_KEY: make_jpeg(3000, 2000)})
+
+    keys = run(create_variants(store, ORIGINAL_KEY))
+
+    assert set(keys) == {"thumb", "medium"}
+    with Image.open(io.BytesIO(store.objects[keys["thumb"]])) as thumb:
+        assert thumb.format == "WEBP"
+        assert thumb.size == (320, 320)
+    with Image.open(io.BytesIO(store.objects[keys["medium"]])) as medium:
+        assert medium.size == (1080, 720)
+    assert store.content_types[keys["medium"]] == VARIANT_CONTENT_TYPE
+
+def test_create_variants_on_filesystem(tmp_path):
+    """Test the pipeline against a local directory store"""
+    store = FileSystemObjectStore(str(tmp_path))
+    run(store.put(ORIGINAL_KEY, make_jpeg(400, 600), "image/jpeg"))
+
+    keys = run(create_variants(store, ORIGINAL_KEY))
+
+    assert (tmp_path / keys["thumb"]).exists()
+    with pytest.raises(ValueError):
+        run(store.get("../outside.jpg"))
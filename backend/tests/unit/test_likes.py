@@ -0,0 +1,100 @@
+import asyncio
+import pytest
+from botocore.exceptions import ClientError
+from fastapi.testclient import TestClient
+import main
+from app.repositories import likes as likes_repo, posts as posts_repo
+
+def run(coro):
+    """Run a coroutine on a private loop (asyncio.run would unset the main thread's loop)"""
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+def cancelled(*codes):
+    """A TransactionCanceledException with one cancellation reason per transaction item"""
+    return ClientError(
+        {
+            "Error": {"Code": "TransactionCanceledException", "Message": "Transaction cancelled"},
+            "CancellationReasons": [{"Code": code} for code in codes]
+        },
+        "TransactWriteItems"
+    )
+
+def fake_transact_write(monkeypatch, error=None):
+    calls = []
+    async def transact_write(transact_items):
+        calls.append(transact_items)
+        if error is not None:
+            raise error
+    monkeypatch.setattr(likes_repo, "transact_write", transact_write)
+    return calls
+
+def test_like_and_counter_are_one_transaction(monkeypatch):
+    """Test that adding a like also increments the author's post like_count"""
+    calls = fake_transact_write(monkeypatch)
+
+    assert run(likes_repo.add_like({"post_id": "post-1", "user_id": "u2"}, "author")) is True
+
+    put, update = calls[0]
+    assert put["Put"]["TableName"] == likes_repo.LIKES_TABLE
+    assert put["Put"]["ConditionExpression"] == "attribute_not_exists(post_id)"
+    assert update["Update"]["TableName"] == likes_repo.POSTS_TABLE
+    assert update["Update"]["Key"] == {"user_id": {"S": "author"}, "post_id": {"S": "post-1"}}
+    assert update["Update"]["ExpressionAttributeValues"] == {":delta": {"N": "1"}}
+
+def test_unlike_decrements_the_counter(monkeypatch):
+    """Test that removing a like moves like_count down in the same transaction"""
+    calls = fake_transact_write(monkeypatch)
+
+    assert run(likes_repo.remove_like("post-1", "u2", "author")) is True
+
+    delete, update = calls[0]
+    assert delete["Delete"]["Key"] == {"post_id": {"S": "post-1"}, "user_id": {"S": "u2"}}
+    assert update["Update"]["ExpressionAttributeValues"] == {":delta": {"N": "-1"}}
+
+def test_like_already_in_requested_state(monkeypatch):
+    """Test that a failed like condition means the like was already there"""
+    fake_transact_write(monkeypatch, cancelled("ConditionalCheckFailed", "None"))
+
+    assert run(likes_repo.add_like({"post_id": "post-1", "user_id": "u2"}, "author")) is False
+
+def test_like_on_missing_post(monkeypatch):
+    """Test that a failed post condition is reported as a missing post"""
+    fake_transact_write(monkeypatch, cancelled("None", "ConditionalCheckFailed"))
+
+    with pytest.raises(LookupError):
+        run(likes_repo.remove_like("post-1", "u2", "author"))
+
+def test_other_transaction_failures_are_raised(monkeypatch):
+    """Test that conflicts and other errors aren't mistaken for a no-op"""
+    fake_transact_write(monkeypatch, cancelled("TransactionConflict", "None"))
+
+    with pytest.raises(ClientError):
+        run(likes_repo.add_like({"post_id": "post-1", "user_id": "u2"}, "author"))
+
+def test_batch_likes_reads_counters_and_counts_only_legacy_posts(monkeypatch):
+    """Test that like counts come from the posts' counters, with COUNT only for posts without one"""
+    counted = []
+    async def batch_get_likes(post_ids, user_id):
+        return {"post-2"}
+    async def batch_get_like_counts(keys):
+        assert keys == [("a1", "post-1"), ("a2", "post-2")]
+        return {"post-1": 5}
+    async def count_post_likes(post_id):
+        counted.append(post_id)
+        return 2
+    monkeypatch.setattr(likes_repo, "batch_get_likes", batch_get_likes)
+    monkeypatch.setattr(posts_repo, "batch_get_like_counts", batch_get_like_counts)
+    monkeypatch.setattr(likes_repo, "count_post_likes", count_post_likes)
+
+    response = TestClient(main.app).get("/batch_post_likes?user_id=u1&posts=a1:post-1&posts=a2:post-2&posts=a1:post-1")
+
+    assert response.status_code == 200
+    assert response.json()["likes"] == {
+        "post-1": {"count": 5, "liked": False},
+        "post-2": {"count": 2, "liked": True}
+    }
+    assert counted == ["post-2"]
@@ -0,0 +1,25 @@
+import pytest
+from fastapi import HTTPException
+from app.utils.pagination import encode_cursor, decode_cursor
+
+def test_cursor_round_trip():
+    """Test that a LastEvaluatedKey survives encoding and decoding"""
+    key = {"user_id": "user-1", "post_id": "post-habit-1-20250101T120000"}
+    cursor = encode_cursor(key)
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor, required_keys=("user_id", "post_id")) == key
+
+def test_empty_cursor():
+    """Test that missing keys and cursors map to None"""
+    assert encode_cursor(None) is None
+    assert encode_cursor({}) is None
+    assert decode_cursor(None) is None
+    assert decode_cursor("") is None
+
+@pytest.mark.parametrize("cursor", ["not-base64!!", encode_cursor({"user_id": "user-1"}), "WzFd"])
+def test_invalid_cursor(cursor):
+    """Test that malformed or incomplete cursors are rejected with a 400"""
+    with pytest.raises(HTTPException) as exc_info:
+        decode_cursor(cursor, required_keys=("user_id", "post_id"))
+    assert exc_info.value.status_code == 400
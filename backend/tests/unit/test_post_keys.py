@@ -0,0 +1,41 @@
+from datetime import datetime, timezone
+from app.utils.post_keys import make_post_id, make_post_key, parse_post_timestamp, is_post_key, split_stored_key
+
+HABIT_ID = "0b6a2f7e-9c1d-4e5f-8a7b-123456789abc"
+
+def test_post_id_round_trips_timestamp():
+    """Test that the creation time can be recovered from a post_id"""
+    timestamp = datetime(2025, 3, 12, 8, 30, 15, tzinfo=timezone.utc)
+    post_id = make_post_id(HABIT_ID, timestamp)
+
+    assert post_id == f"post-{HABIT_ID}-20250312T083015"
+    assert parse_post_timestamp(post_id) == timestamp
+    assert parse_post_timestamp("not-a-post") is None
+
+def test_post_key_layout_and_ownership():
+    """Test that keys follow the user/habit/date layout and can't be reused across users"""
+    timestamp = datetime(2025, 3, 12, 8, 30, 15, tzinfo=timezone.utc)
+    post_id = make_post_id(HABIT_ID, timestamp)
+    key = make_post_key("user-1", HABIT_ID, post_id, "my photo (1).jpg", timestamp)
+
+    assert key == f"user-1/{HABIT_ID}/2025-03-12/{post_id}_my_photo__1_.jpg"
+    assert is_post_key(key, "user-1", HABIT_ID, post_id)
+    assert not is_post_key(key, "user-2", HABIT_ID, post_id)
+    assert not is_post_key(key, "user-1", HABIT_ID, "post-other")
+    assert not is_post_key(f"user-1/{HABIT_ID}/../user-2/{post_id}_x.jpg", "user-1", HABIT_ID, post_id)
+
+def test_post_object_keys_cover_original_and_variants():
+    """Test that cleanup finds the original image and its variants, with the bucket prefix stripped"""
+    from app.utils.post_cleanup import post_object_keys
+    post = {
+        "s3Key": "hb-user-posts/u1/h1/2025-01-01/post-h1_a.jpg",
+        "variants": {"thumb": "hb-user-posts/u1/h1/2025-01-01/variants/post-h1_a_thumb.webp"}
+    }
+
+    assert split_stored_key(post["s3Key"]) == ("hb-user-posts", "u1/h1/2025-01-01/post-h1_a.jpg")
+    assert post_object_keys(post) == {
+        "hb-user-posts": [
+            "u1/h1/2025-01-01/post-h1_a.jpg",
+            "u1/h1/2025-01-01/variants/post-h1_a_thumb.webp"
+        ]
+    }
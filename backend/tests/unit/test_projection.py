@@ -0,0 +1,27 @@
+import pytest
+from fastapi import HTTPException
+from app.utils.projection import parse_fields, projection_kwargs
+
+ALLOWED = {"habit_id", "habit_name", "streak"}
+
+def test_fields_always_include_keys_once():
+    """Test that key attributes are added and duplicates dropped"""
+    assert parse_fields("habit_name, streak,habit_id", ALLOWED, always=("user_id", "habit_id")) == [
+        "user_id", "habit_id", "habit_name", "streak"
+    ]
+    assert parse_fields(None, ALLOWED) is None
+    assert parse_fields("", ALLOWED) is None
+
+def test_unknown_fields_are_rejected():
+    """Test that only allow-listed attributes can be projected"""
+    with pytest.raises(HTTPException) as exc_info:
+        parse_fields("habit_name,phone_number", ALLOWED)
+    assert exc_info.value.status_code == 400
+
+def test_projection_uses_placeholders_for_reserved_words():
+    """Test that reserved names like timestamp are projected through placeholders"""
+    assert projection_kwargs(["post_id", "timestamp"]) == {
+        "ProjectionExpression": "#p0, #p1",
+        "ExpressionAttributeNames": {"#p0": "post_id", "#p1": "timestamp"}
+    }
+    assert projection_kwargs(None) == {}
@@ -0,0 +1,45 @@
+import gzip
+import json
+import pytest
+from decimal import Decimal
+from fastapi import Request
+from app.utils import responses
+from app.utils.responses import dumps, negotiated_response
+
+def make_request(**headers):
+    raw = [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": raw})
+
+def large_payload():
+    return {"habits": [{"habit_id": f"habit-{i}", "streak": Decimal(i), "rate": Decimal("0.5")} for i in range(200)]}
+
+def test_dumps_matches_jsonable_encoder_for_dynamodb_types():
+    """Test that Decimals become ints or floats and sets become sorted lists"""
+    body = dumps({"streak": Decimal("3"), "rate": Decimal("0.25"), "habit_ids": {"b", "a"}})
+    assert json.loads(body) == {"streak": 3, "rate": 0.25, "habit_ids": ["a", "b"]}
+
+def test_small_bodies_are_not_compressed():
+    """Test that payloads under the threshold go out as plain JSON"""
+    response = negotiated_response(make_request(accept_encoding="gzip"), {"habits": []})
+    assert "content-encoding" not in response.headers
+    assert response.headers["content-type"] == "application/json"
+
+def test_large_bodies_are_gzipped_when_accepted():
+    """Test gzip negotiation, including q=0 refusals"""
+    payload = large_payload()
+
+    gzipped = negotiated_response(make_request(accept_encoding="gzip, deflate"), payload)
+    refused = negotiated_response(make_request(accept_encoding="gzip;q=0"), payload)
+
+    assert gzipped.headers["content-encoding"] == "gzip"
+    assert json.loads(gzip.decompress(gzipped.body)) == json.loads(dumps(payload))
+    assert "content-encoding" not in refused.headers
+    assert "Accept-Encoding" in gzipped.headers["vary"]
+
+def test_msgpack_is_served_when_asked_for():
+    """Test that the mobile client can ask for MessagePack"""
+    if responses.msgpack is None:
+        pytest.skip("msgpack is not installed")
+    response = negotiated_response(make_request(accept="application/msgpack"), {"streak": Decimal("2")})
+    assert response.headers["content-type"] == "application/msgpack"
+    assert responses.msgpack.unpackb(response.body) == {"streak": 2}
@@ -0,0 +1,66 @@
+from app.lambdas.weekly_reset import process_habit
+from datetime import date, timedelta
+from app.utils.rollups import completed_week_range, make_weekly_rollup, rollup_key, summarize_rollups
+
+def rollup(week_start, posts, cadence=3, streak=0, in_grace_period=False):
+    habit = {
+        "user_id": "u1",
+        "habit_id": "h1",
+        "cadence": cadence,
+        "streak": streak,
+        "is_in_grace_period": in_grace_period
+    }
+    return make_weekly_rollup(habit, week_start, posts, streak, "2025-03-16T23:59:00")
+
+def test_weekly_rollup_record():
+    """Test that a rollup is keyed by habit and week and records whether the cadence was met"""
+    item = rollup("2025-03-10", 4, streak=5)
+
+    assert item["rollup_key"] == rollup_key("h1", "2025-03-10") == "h1#2025-03-10"
+    assert item["posts"] == 4
+    assert item["met"] is True
+    assert item["streak"] == 5
+    assert rollup("2025-03-10", 2)["met"] is False
+
+def test_completed_week_range_covers_n_rollups():
+    """Test that weeks=N spans exactly the N most recent reset weeks, never the current one"""
+    today = date(2025, 3, 13)
+    # Rollups for the current week and the ten before it, as the reset writes them
+    week_starts = [(date(2025, 3, 10) - timedelta(weeks=n)).isoformat() for n in range(11)]
+
+    from_week, to_week = completed_week_range(4, today)
+    covered = [week for week in week_starts if rollup_key("h1", from_week) <= rollup_key("h1", week) <= rollup_key("h1", to_week)]
+
+    assert (from_week, to_week) == ("2025-02-10", "2025-03-03")
+    assert sorted(covered) == ["2025-02-10", "2025-02-17", "2025-02-24", "2025-03-03"]
+    # On a Monday the week that just ended is the latest one
+    assert completed_week_range(1, date(2025, 3, 10)) == ("2025-03-03", "2025-03-03")
+
+def test_summarize_rollups():
+    """Test that trends skip grace-period weeks for completion but count them for posts"""
+    summary = summarize_rollups([
+        rollup("2025-02-24", 1, in_grace_period=True),
+        rollup("2025-03-03", 3, streak=4),
+        rollup("2025-03-10", 2, streak=7),
+    ])
+
+    assert summary["weeks_recorded"] == 3
+    assert summary["completion_rate"] == 0.5
+    assert summary["avg_posts_per_week"] == 2.0
+    assert summary["best_streak"] == 7
+    assert [week["week_start"] for week in summary["weeks"]] == ["2025-02-24", "2025-03-03", "2025-03-10"]
+
+def test_summarize_without_rollups():
+    """Test that a habit with no recorded weeks has empty stats rather than dividing by zero"""
+    summary = summarize_rollups([])
+
+    assert summary["completion_rate"] is None
+    assert summary["avg_posts_per_week"] is None
+    assert summary["best_streak"] == 0
+
+def test_habits_being_deleted_get_no_rollup():
+    """Test that the reset records nothing for a habit that is being deleted"""
+    rollups = []
+
+    assert process_habit({"user_id": "u1", "habit_id": "h1", "deleting": True}, rollups=rollups) is False
+    assert rollups == []
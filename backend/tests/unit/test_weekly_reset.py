@@ -0,0 +1,85 @@
+from datetime import datetime
+from app.lambdas import weekly_reset
+from app.lambdas.weekly_reset import group_habits_by_user, needs_post_query, process_habit
+from app.utils.cache import InMemorySharedBackend, ReadThroughCache, get_cache, habits_key, set_cache
+from app.utils.streak_manager import get_weekly_post_counts, get_counted_weekly_posts, get_week_key
+
+class FakePostsTable:
+    """Posts table stand-in that serves pre-built query pages"""
+    def __init__(self, pages):
+        self.pages = pages
+        self.calls = []
+
+    def query(self, **kwargs):
+        self.calls.append(kwargs)
+        return self.pages[len(self.calls) - 1]
+
+class FakeHabitsTable:
+    """Habits table stand-in that records updates"""
+    def __init__(self):
+        self.updates = []
+
+    def update_item(self, **kwargs):
+        self.updates.append(kwargs)
+
+def test_weekly_post_counts_follow_pagination():
+    """Test that posts are counted per habit across every query page"""
+    table = FakePostsTable([
+        {"Items": [{"habitId": "h1"}, {"habitId": "h2"}], "LastEvaluatedKey": {"user_id": "u1", "post_id": "p2"}},
+        {"Items": [{"habitId": "h1"}]},
+    ])
+
+    counts = get_weekly_post_counts("u1", datetime(2025, 3, 10), table=table)
+
+    assert counts == {"h1": 2, "h2": 1}
+    assert len(table.calls) == 2
+    assert table.calls[1]["ExclusiveStartKey"] == {"user_id": "u1", "post_id": "p2"}
+
+def test_group_habits_by_user():
+    """Test that habits are grouped so each user is queried once"""
+    habits = [
+        {"user_id": "u1", "habit_id": "h1"},
+        {"user_id": "u2", "habit_id": "h2"},
+        {"user_id": "u1", "habit_id": "h3"},
+    ]
+
+    groups = group_habits_by_user(habits)
+
+    assert [h["habit_id"] for h in groups["u1"]] == ["h1", "h3"]
+    assert [h["habit_id"] for h in groups["u2"]] == ["h2"]
+
+def test_counted_weekly_posts():
+    """Test that the weekly counter is only trusted for the week it belongs to"""
+    week_start = datetime(2025, 3, 10)
+
+    assert get_week_key(datetime(2025, 3, 13, 18, 30)) == "2025-03-10"
+    assert get_counted_weekly_posts({"week_start": "2025-03-10", "week_posts": 3}, week_start) == 3
+    assert get_counted_weekly_posts({"week_start": "2025-03-03", "week_posts": 5}, week_start) == 0
+    assert get_counted_weekly_posts({"streak": 2}, week_start) is None
+
+def test_habits_being_deleted_are_skipped():
+    """Test that the reset leaves habits alone while their deletion is in progress"""
+    habit = {"user_id": "u1", "habit_id": "h1", "deleting": True, "is_in_grace_period": False}
+
+    assert needs_post_query(habit) is False
+    assert process_habit(habit) is False
+
+def test_reset_invalidates_cached_habits(monkeypatch):
+    """Test that streak resets and ended grace periods drop the user's cached habit list"""
+    table = FakeHabitsTable()
+    monkeypatch.setattr(weekly_reset, "get_table", lambda name: table)
+    shared = InMemorySharedBackend()
+    previous = get_cache()
+    set_cache(ReadThroughCache(shared=shared))
+    try:
+        shared.set(habits_key("u1"), ["stale"], 300)
+        assert weekly_reset.reset_habit_streak({"user_id": "u1", "habit_id": "h1", "cadence": 3}, weekly_posts=1)
+        assert shared.get(habits_key("u1")) == (False, None)
+
+        shared.set(habits_key("u1"), ["stale"], 300)
+        habit = {"user_id": "u1", "habit_id": "h2", "created_at": "2025-01-01T00:00:00"}
+        assert weekly_reset.update_grace_period(habit)
+        assert shared.get(habits_key("u1")) == (False, None)
+        assert len(table.updates) == 2
+    finally:
+        set_cache(previous)
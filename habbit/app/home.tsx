@@ -15,7 +15,7 @@ import { SafeAreaView } from "react-native-safe-area-context";
 import { Ionicons } from "@expo/vector-icons";
 import { useRouter, useFocusEffect } from "expo-router";
 import { getCurrentUser } from "aws-amplify/auth";
-import { fetchUserPosts, fetchUserHabits, deletePost, createComment, getComments, likePost, getPostLikes, checkUserLike } from "../utils/api";
+import { fetchUserPosts, fetchUserHabits, deletePost, createComment, getComments, getReplies, likePost, getPostLikes, checkUserLike } from "../utils/api";
 import SwipeableNavigation from "../components/SwipeableNavigation";
 import PostModal from "../components/PostModal";
 import Comments from '../components/Comments';
@@ -63,6 +63,7 @@ type Post = {
   habitId: string;
   habitName: string;
   comments: PostComment[];
+  commentsCursor?: string | null;
   liked: boolean;
   likesCount: number;
 };
@@ -135,6 +136,29 @@ export default function HomeScreen() {
     };
   };
 
+  // Shape an API comment or reply for the comment components, with its author's profile
+  const transformComment = async (comment: any): Promise<PostComment> => {
+    const commentUserData = await getUserData(comment.user_id);
+    return {
+      id: comment.id || String(Math.random()),
+      sort_key: comment.sort_key,
+      user_id: comment.user_id,
+      username: commentUserData.display_name,
+      profile_picture: commentUserData.profile_picture,
+      text: comment.text,
+      timestamp: comment.timestamp || new Date().toISOString(),
+      reply_count: comment.reply_count || 0,
+      replies_next_cursor: comment.replies_next_cursor || null,
+      replies: await Promise.all((comment.replies || []).map(transformComment)),
+    };
+  };
+
+  // Apply the same change to a post in the feed and, if it is open, in the modal
+  const updatePost = (postId: string, update: (post: Post) => Post) => {
+    setPosts(currentPosts => currentPosts.map(post => (post.id === postId ? update(post) : post)));
+    setSelectedPost(prevPost => (prevPost && prevPost.id === postId ? update(prevPost) : prevPost));
+  };
+
   // Fetch user posts and habits
   const fetchData = async () => {
     try {
@@ -168,11 +192,11 @@ export default function HomeScreen() {
             let isLiked = false;
             
             try {
-              const likesResponse = await getPostLikes(post.post_id);
+              const likesResponse = await getPostLikes(post.post_id, post.user_id || userId);
               const userLikeResponse = await checkUserLike(post.post_id, userId);
               
-              // Safely access likes array with fallback to empty array
-              likesCount = (likesResponse?.likes || []).length;
+              // likes is only the first page, so use the total count
+              likesCount = likesResponse?.like_count || 0;
               isLiked = userLikeResponse?.liked || false;
             } catch (error) {
               console.error(`Error fetching likes for post ${post.post_id}:`, error);
@@ -229,35 +253,10 @@ export default function HomeScreen() {
           transformedPosts.map(async (post: Post) => {
             try {
               const commentsData = await getComments(post.post_id);
-              const commentsWithUserData = await Promise.all(
-                (commentsData.comments || []).map(async (comment: any) => {
-                  const commentUserData = await getUserData(comment.user_id);
-                  return {
-                    id: comment.id || String(Math.random()),
-                    user_id: comment.user_id,
-                    username: commentUserData.display_name,
-                    profile_picture: commentUserData.profile_picture,
-                    text: comment.text,
-                    timestamp: comment.timestamp || Date.now(),
-                    replies: await Promise.all(
-                      (comment.replies || []).map(async (reply: any) => {
-                        const replyUserData = await getUserData(reply.user_id);
-                        return {
-                          id: reply.id || String(Math.random()),
-                          user_id: reply.user_id,
-                          username: replyUserData.display_name,
-                          profile_picture: replyUserData.profile_picture,
-                          text: reply.text,
-                          timestamp: reply.timestamp || Date.now(),
-                        };
-                      })
-                    ),
-                  };
-                })
-              );
               return {
                 ...post,
-                comments: commentsWithUserData,
+                comments: await Promise.all((commentsData.comments || []).map(transformComment)),
+                commentsCursor: commentsData.next_cursor || null,
               };
             } catch (error) {
               console.error('Error fetching comments for post:', post.post_id, error);
@@ -337,56 +336,18 @@ export default function HomeScreen() {
     setSelectedPost(null);
   };
 
-  const handleComment = async (postId: string, text: string, parentId?: string) => {
+  const handleComment = async (postId: string, text: string, parentId?: string, parentSortKey?: string) => {
     try {
-      await createComment(postId, currentUserId, text, parentId);
+      await createComment(postId, currentUserId, text, parentId, parentSortKey);
       
-      // Fetch updated comments for this specific post
+      // Reload the first page so the new comment shows at the top
       const updatedCommentsData = await getComments(postId);
-      
-      // Transform the new comments with user data
-      const updatedCommentsWithUserData = await Promise.all(
-        (updatedCommentsData.comments || []).map(async (comment: any) => {
-          const commentUserData = await getUserData(comment.user_id);
-          return {
-            id: comment.id || String(Math.random()),
-            user_id: comment.user_id,
-            username: commentUserData.display_name,
-            profile_picture: commentUserData.profile_picture,
-            text: comment.text,
-            timestamp: comment.timestamp || Date.now(),
-            replies: await Promise.all(
-              (comment.replies || []).map(async (reply: any) => {
-                const replyUserData = await getUserData(reply.user_id);
-                return {
-                  id: reply.id || String(Math.random()),
-                  user_id: reply.user_id,
-                  username: replyUserData.display_name,
-                  profile_picture: replyUserData.profile_picture,
-                  text: reply.text,
-                  timestamp: reply.timestamp || Date.now(),
-                };
-              })
-            ),
-          };
-        })
-      );
-
-      // Update both the posts state and the selectedPost state
-      setPosts(currentPosts => 
-        currentPosts.map(post => 
-          post.id === postId 
-            ? { ...post, comments: updatedCommentsWithUserData }
-            : post
-        )
-      );
-
-      // Update the selectedPost state to reflect the new comments
-      if (selectedPost && selectedPost.id === postId) {
-        setSelectedPost(prevPost => 
-          prevPost ? { ...prevPost, comments: updatedCommentsWithUserData } : null
-        );
-      }
+      const updatedComments = await Promise.all((updatedCommentsData.comments || []).map(transformComment));
+      updatePost(postId, post => ({
+        ...post,
+        comments: updatedComments,
+        commentsCursor: updatedCommentsData.next_cursor || null,
+      }));
 
     } catch (error) {
       console.error('Error posting comment:', error);
@@ -394,9 +355,44 @@ export default function HomeScreen() {
     }
   };
 
-  const handleLikePost = async (postId: string) => {
+  const handleLoadMoreComments = async (postId: string) => {
+    const post = posts.find(p => p.id === postId);
+    if (!post?.commentsCursor) return;
+    try {
+      const page = await getComments(postId, post.commentsCursor);
+      const moreComments = await Promise.all((page.comments || []).map(transformComment));
+      updatePost(postId, current => ({
+        ...current,
+        comments: [...current.comments, ...moreComments],
+        commentsCursor: page.next_cursor || null,
+      }));
+    } catch (error) {
+      console.error('Error loading more comments:', error);
+    }
+  };
+
+  const handleLoadMoreReplies = async (postId: string, commentId: string) => {
+    const comment = posts.find(p => p.id === postId)?.comments.find(c => c.id === commentId);
+    if (!comment?.replies_next_cursor) return;
+    try {
+      const page = await getReplies(postId, commentId, comment.replies_next_cursor);
+      const moreReplies = await Promise.all((page.replies || []).map(transformComment));
+      updatePost(postId, current => ({
+        ...current,
+        comments: current.comments.map(c =>
+          c.id === commentId
+            ? { ...c, replies: [...(c.replies || []), ...moreReplies], replies_next_cursor: page.next_cursor || null }
+            : c
+        ),
+      }));
+    } catch (error) {
+      console.error('Error loading more replies:', error);
+    }
+  };
+
+  const handleLikePost = async (postId: string, authorId: string) => {
     try {
-      await likePost(postId, currentUserId);
+      await likePost(postId, currentUserId, authorId);
       console.log('Liked post:', postId);
       
       // Update posts state to reflect the new like status
@@ -485,7 +481,7 @@ export default function HomeScreen() {
           <View style={styles.footerActions}>
             <TouchableOpacity 
               style={styles.actionButton}
-              onPress={() => handleLikePost(item.id)}
+              onPress={() => handleLikePost(item.id, item.user_id)}
             >
               <Ionicons
                 name={item.liked ? "heart" : "heart-outline"}
@@ -588,7 +584,10 @@ export default function HomeScreen() {
             onClose={handleCloseModal}
             post={selectedPost}
             currentUserId={currentUserId}
-            onComment={(text, parentId) => handleComment(selectedPost.id, text, parentId)}
+            onComment={(text, parentId, parentSortKey) => handleComment(selectedPost.id, text, parentId, parentSortKey)}
+            hasMoreComments={!!selectedPost.commentsCursor}
+            onLoadMoreComments={() => handleLoadMoreComments(selectedPost.id)}
+            onLoadMoreReplies={(commentId) => handleLoadMoreReplies(selectedPost.id, commentId)}
           />
         )}
 
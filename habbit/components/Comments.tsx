@@ -13,24 +13,27 @@ import { formatTimestamp } from '../utils/dateUtils';
 // Define our custom Comment type with a different name to avoid conflicts
 export type PostComment = {
   id: string;
+  sort_key?: string;
   user_id: string;
   username: string;
   profile_picture?: string;
   text: string;
   timestamp: string;
   replies?: PostComment[];
+  reply_count?: number;
+  replies_next_cursor?: string | null;
 };
 
 type CommentsProps = {
   postId: string;
   userId: string;
   comments: PostComment[];
-  onComment: (text: string, parentId?: string) => void;
+  onComment: (text: string, parentId?: string, parentSortKey?: string) => void;
 };
 
 export default function Comments({ postId, userId, comments, onComment }: CommentsProps) {
   const [newComment, setNewComment] = useState('');
-  const [replyingTo, setReplyingTo] = useState<string | null>(null);
+  const [replyingTo, setReplyingTo] = useState<PostComment | null>(null);
 
   const renderReply = ({ item }: { item: PostComment }) => (
     <View style={[styles.commentContainer, styles.replyContainer]}>
@@ -55,7 +58,7 @@ export default function Comments({ postId, userId, comments, onComment }: Commen
           <Text style={styles.timestamp}>{formatTimestamp(item.timestamp)}</Text>
           <TouchableOpacity 
             style={styles.replyButton}
-            onPress={() => setReplyingTo(item.id)}
+            onPress={() => setReplyingTo(item)}
           >
             <Text style={styles.replyButtonText}>Reply</Text>
           </TouchableOpacity>
@@ -78,7 +81,7 @@ export default function Comments({ postId, userId, comments, onComment }: Commen
 
   const handleSubmit = () => {
     if (newComment.trim()) {
-      onComment(newComment.trim(), replyingTo || undefined);
+      onComment(newComment.trim(), replyingTo?.id, replyingTo?.sort_key);
       setNewComment('');
       setReplyingTo(null);
     }
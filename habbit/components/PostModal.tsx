@@ -31,7 +31,10 @@ type PostModalProps = {
     habitColor?: string;
   };
   currentUserId: string;
-  onComment: (text: string, parentId?: string) => Promise<void>;
+  onComment: (text: string, parentId?: string, parentSortKey?: string) => Promise<void>;
+  hasMoreComments?: boolean;
+  onLoadMoreComments?: () => Promise<void>;
+  onLoadMoreReplies?: (commentId: string) => Promise<void>;
 };
 
 // Helper function to get image source
@@ -43,7 +46,16 @@ const getImageSource = (profilePicture: string | undefined) => {
   return require('../assets/images/adi.png');
 };
 
-export default function PostModal({ visible, onClose, post, currentUserId, onComment }: PostModalProps) {
+export default function PostModal({
+  visible,
+  onClose,
+  post,
+  currentUserId,
+  onComment,
+  hasMoreComments,
+  onLoadMoreComments,
+  onLoadMoreReplies,
+}: PostModalProps) {
   const [newComment, setNewComment] = useState('');
   
   console.log('Post data:', post);
@@ -152,9 +164,19 @@ export default function PostModal({ visible, onClose, post, currentUserId, onCom
                       ))}
                     </View>
                   )}
+                  {comment.replies_next_cursor && onLoadMoreReplies && (
+                    <TouchableOpacity onPress={() => onLoadMoreReplies(comment.id)} style={styles.loadMoreButton}>
+                      <Text style={styles.loadMoreText}>View more replies</Text>
+                    </TouchableOpacity>
+                  )}
                 </View>
               ))
             )}
+            {hasMoreComments && onLoadMoreComments && (
+              <TouchableOpacity onPress={onLoadMoreComments} style={styles.loadMoreButton}>
+                <Text style={styles.loadMoreText}>Load more comments</Text>
+              </TouchableOpacity>
+            )}
           </View>
         </ScrollView>
 
@@ -309,6 +331,14 @@ const styles = StyleSheet.create({
     borderLeftColor: '#e5e5e5',
     paddingTop: 8,
   },
+  loadMoreButton: {
+    paddingVertical: 8,
+  },
+  loadMoreText: {
+    fontSize: 13,
+    color: '#6B7280',
+    fontWeight: '600',
+  },
   commentInputContainer: {
     borderTopWidth: 1,
     borderTopColor: '#e5e5e5',
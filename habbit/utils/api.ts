@@ -214,7 +214,8 @@ export const createComment = async (
   postId: string,
   userId: string,
   text: string,
-  parentId?: string
+  parentId?: string,
+  parentSortKey?: string
 ) => {
   try {
     const response = await fetch(`${API_BASE_URL}/create_comment`, {
@@ -227,6 +228,8 @@ export const createComment = async (
         user_id: userId,
         text,
         parent_id: parentId,
+        // Lets the server update the parent's reply count without looking it up
+        parent_sort_key: parentSortKey,
       }),
     });
 
@@ -241,9 +244,12 @@ export const createComment = async (
   }
 };
 
-export const getComments = async (postId: string) => {
+// One page of top-level comments (newest first), each with its first replies;
+// pass the previous page's next_cursor to get the next one
+export const getComments = async (postId: string, cursor?: string) => {
   try {
-    const response = await fetch(`${API_BASE_URL}/get_comments/${postId}`);
+    const query = cursor ? `?cursor=${encodeURIComponent(cursor)}` : '';
+    const response = await fetch(`${API_BASE_URL}/get_comments/${postId}${query}`);
 
     if (!response.ok) {
       throw new Error('Failed to fetch comments');
@@ -256,11 +262,30 @@ export const getComments = async (postId: string) => {
   }
 };
 
-export const likePost = async (postId: string, userId: string) => {
+// The next page of replies to a comment, from its replies_next_cursor
+export const getReplies = async (postId: string, parentId: string, cursor?: string) => {
   try {
-    console.log('Attempting to like/unlike post:', { postId, userId });
+    const query = cursor ? `?cursor=${encodeURIComponent(cursor)}` : '';
+    const response = await fetch(`${API_BASE_URL}/get_replies/${postId}/${parentId}${query}`);
+
+    if (!response.ok) {
+      throw new Error('Failed to fetch replies');
+    }
+
+    return await response.json();
+  } catch (error) {
+    console.error('Error fetching replies:', error);
+    throw error;
+  }
+};
+
+export const likePost = async (postId: string, userId: string, authorId?: string) => {
+  try {
+    console.log('Attempting to like/unlike post:', { postId, userId, authorId });
+    // The author owns the post that holds like_count
+    const authorParam = authorId ? `&author_id=${authorId}` : '';
     const response = await fetch(
-      `${API_BASE_URL}/like_post?post_id=${postId}&user_id=${userId}`,
+      `${API_BASE_URL}/like_post?post_id=${postId}&user_id=${userId}${authorParam}`,
       {
         method: 'POST',
         headers: {
@@ -284,10 +309,12 @@ export const likePost = async (postId: string, userId: string) => {
   }
 };
 
-export const getPostLikes = async (postId: string) => {
+export const getPostLikes = async (postId: string, authorId?: string) => {
   try {
+    // With the author, like_count is read from the post rather than counted
+    const authorParam = authorId ? `?author_id=${authorId}` : '';
     const response = await fetch(
-      `${API_BASE_URL}/get_post_likes/${postId}`
+      `${API_BASE_URL}/get_post_likes/${postId}${authorParam}`
     );
     return await response.json();
   } catch (error) {